@@ -0,0 +1,166 @@
+"""
+Match CBP error report PDFs against an import record file without the web server
+
+PDFs may be given as files, directories (every *.pdf inside, in name order)
+or glob patterns. The result is written straight to the output path, in the
+format given by its extension (.xlsx, .csv, .jsonl or .parquet). Progress and
+stage timings are reported on stderr.
+
+Usage:
+    python backend/cli.py PDF [PDF ...] --import IMPORT_FILE --output OUTPUT_FILE [--workers N]
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+from typing import List, TextIO
+
+from config import PDF_PARSE_WORKERS
+from modules.pipeline import Pipeline
+from modules.exporter import Exporter
+from modules.file_handler import FileHandler
+from modules.log_utils import configure_logging
+
+OUTPUT_FORMATS = ['xlsx'] + list(Exporter.FORMATS)
+
+class ProgressReporter:
+    """Pipeline progress callback that prints stage changes and counters"""
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.started = time.perf_counter()
+        self.stage = None
+        self.stage_started = self.started
+        self.timings = []
+        self.files_total = 0
+
+    def message(self, text: str) -> None:
+        print(f"[{time.perf_counter() - self.started:8.2f}s] {text}", file=self.stream, flush=True)
+
+    def __call__(self, stage: str = None, **counters) -> None:
+        if stage is not None:
+            self.finish_stage()
+            self.stage = stage
+            self.stage_started = time.perf_counter()
+            self.message(stage)
+        self.files_total = counters.get('files_total', self.files_total)
+        for name, value in counters.items():
+            if name == 'files_parsed':
+                self.message(f"  parsed {value}/{self.files_total} PDFs")
+            elif name != 'files_total':
+                self.message(f"  {name.replace('_', ' ')}: {value}")
+
+    def finish_stage(self) -> None:
+        """Record the time spent in the current stage"""
+        if self.stage is not None:
+            self.timings.append((self.stage, time.perf_counter() - self.stage_started))
+            self.stage = None
+
+    def summary(self) -> None:
+        """Print the time spent in each stage and in total"""
+        self.finish_stage()
+        for stage, elapsed in self.timings:
+            print(f"{stage:<14} {elapsed:9.2f}s", file=self.stream)
+        print(f"{'total':<14} {time.perf_counter() - self.started:9.2f}s", file=self.stream, flush=True)
+
+def find_pdfs(sources: List[str]) -> List[str]:
+    """
+    Expand files, directories and glob patterns into PDF paths
+
+    Args:
+        sources (List[str]): PDF files, directories of PDFs or glob patterns
+
+    Returns:
+        List[str]: PDF paths in the given order, directory and glob matches sorted
+            by name, without duplicates
+
+    Raises:
+        ValueError: If a source matches no PDF
+    """
+    pdf_paths = []
+    seen = set()
+    for source in sources:
+        if os.path.isdir(source):
+            matches = sorted(
+                os.path.join(source, name) for name in os.listdir(source)
+                if name.lower().endswith('.pdf') and os.path.isfile(os.path.join(source, name))
+            )
+        elif os.path.isfile(source):
+            matches = [source]
+        else:
+            matches = sorted(path for path in glob.glob(source) if os.path.isfile(path))
+        if not matches:
+            raise ValueError(f"No PDF files found for {source}")
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                pdf_paths.append(path)
+    return pdf_paths
+
+def write_output(df, output_path: str, fmt: str) -> int:
+    """
+    Write the formatted match result
+
+    Args:
+        df (pd.DataFrame): Formatted match result
+        output_path (str): Destination file
+        fmt (str): One of OUTPUT_FORMATS
+
+    Returns:
+        int: Bytes written
+    """
+    if fmt == 'xlsx':
+        FileHandler.generate_output_file(df, output_path)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'wb') as f:
+            for chunk in Exporter.iter_export(df, fmt):
+                f.write(chunk)
+    return os.path.getsize(output_path)
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pdfs', nargs='+', metavar='PDF', help='PDF file, directory of PDFs or glob pattern')
+    parser.add_argument('--import', dest='import_file', required=True, help='Import record Excel file')
+    parser.add_argument('--output', required=True, help='Output file')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS,
+                        help='Output format, defaults to the output file extension')
+    parser.add_argument('--workers', type=int, default=PDF_PARSE_WORKERS,
+                        help=f'Maximum PDF parsing processes (default and limit: {PDF_PARSE_WORKERS})')
+    parser.add_argument('--log-level', default='WARNING', help='Level of the application log on stderr')
+    args = parser.parse_args(argv)
+
+    if args.format is None:
+        extension = os.path.splitext(args.output)[1].lower().lstrip('.')
+        if extension not in OUTPUT_FORMATS:
+            parser.error(f"Cannot tell the output format from {args.output}; pass --format")
+        args.format = extension
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+    reporter = ProgressReporter(sys.stderr)
+
+    try:
+        pdf_paths = find_pdfs(args.pdfs)
+        if not os.path.isfile(args.import_file):
+            raise ValueError(f"Import file not found: {args.import_file}")
+        reporter.message(f"Matching {len(pdf_paths)} PDFs against {args.import_file}")
+        formatted_df = Pipeline.match(pdf_paths, args.import_file, reporter, workers=args.workers)
+
+        reporter(stage='write_output')
+        bytes_written = write_output(formatted_df, args.output, args.format)
+        reporter(bytes_written=bytes_written)
+    except (ValueError, OSError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    reporter.summary()
+    print(f"Wrote {len(formatted_df)} matched records to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
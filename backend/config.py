@@ -7,8 +7,88 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
 MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max file size
 
+# Logging. DEBUG logs page texts, records and DataFrame samples; keep it off in production.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+# Levels of individual loggers, e.g. 'modules.matcher=DEBUG,werkzeug=WARNING'
+LOG_MODULE_LEVELS = os.environ.get('LOG_MODULE_LEVELS', '')
+LOG_MAX_VALUE_CHARS = 1000  # Longer debug values (page texts, record lists) are truncated
+
+# On-demand profiling of /process-data and /upload-pdfs requests that send the
+# admin token in the X-Profile header; profiles are saved to the upload folder
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+PROFILE_ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN')
+PROFILE_SUMMARY_LINES = 40  # Functions listed in the text summary of a profile
+
+# Browser origins allowed to call the API with the session cookie, comma-separated;
+# defaults to the React development server
+FRONTEND_ORIGINS = [
+    origin.strip() for origin in os.environ.get('FRONTEND_ORIGINS', 'http://localhost:3000').split(',')
+    if origin.strip()
+]
+
+# Upload sessions, shared by all worker processes through a SQLite database
+SESSION_DB_PATH = os.path.join(BASE_DIR, 'sessions', 'sessions.db')
+SESSION_COOKIE_NAME = 'upload_session'
+SESSION_MAX_AGE = 7 * 24 * 60 * 60  # Seconds of inactivity before a session's uploads are forgotten
+# Background job status and results, shared the same way so any worker can answer a poll
+JOB_DB_PATH = os.path.join(BASE_DIR, 'sessions', 'jobs.db')
+
+# Output workbook writing ('stream' appends rows to a write-only worksheet, 'pandas' uses DataFrame.to_excel)
+OUTPUT_WRITE_MODE = 'stream'
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {
     'pdf': {'pdf'},
     'excel': {'xlsx', 'xls'}
 }
+
+# Cache configuration
+CACHE_FOLDER = os.path.join(BASE_DIR, 'cache')
+PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB of cached PDF parse results
+IMPORT_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1GB of cleaned import record tables
+MATCH_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB of matched records per error report PDF
+RESULT_MEMO_LIMIT = 50  # Output files kept for reuse when the same inputs are processed again, 0 disables reuse
+
+# Import workbook reading ('stream' iterates rows with openpyxl in read-only mode, 'pandas' loads the whole sheet)
+IMPORT_READ_MODE = 'stream'
+IMPORT_CHUNK_ROWS = 50000  # Rows per DataFrame chunk when streaming
+IMPORT_COLUMNS = None  # Excel columns to keep besides the match keys, None keeps every column
+
+# How error records are matched to import records: 'index' looks them up through a
+# cached hash index over the import keys, 'pushdown' only loads import records whose
+# keys appear in the errors, 'merge' merges against every import record
+MATCH_STRATEGY = 'index'
+
+# Reuse the matched records of PDFs already processed against the same import
+# workbook, so adding reports to a batch only parses and matches the new ones
+INCREMENTAL_MATCH = True
+
+# Entry numbers in error reports that also match the import lines of another entry
+# (test entries, re-filed or corrected numbers): error entry number -> import entry number
+ENTRY_NUMBER_ALIASES = {
+    '88888838': '60060331'
+}
+
+# PDF parsing concurrency ('process' parses several PDFs in a process pool, 'serial' parses them one by one)
+PDF_PARSE_MODE = 'process'
+PDF_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Single large PDFs are split into page ranges parsed by separate workers
+PDF_SHARD_MIN_PAGES = 200  # Only shard documents with at least this many pages
+PDF_SHARD_PAGES = 50  # Minimum number of pages per shard
+
+# Skip full text extraction for pages whose content streams contain no error markers
+PDF_PRESCAN_ENABLED = True
+
+# Text extraction engine for PDFs: 'pdfplumber' (layout-based) or 'pdfminer' (layout-free, faster)
+PDF_TEXT_BACKEND = 'pdfplumber'
+
+# How records are read from each page: 'text' matches ERROR_PATTERN against the
+# extracted page text, 'table' reads positioned words from the error table region
+PDF_EXTRACTION_MODE = 'text'
+PDF_TABLE_REGION = None  # (x0, top, x1, bottom) in PDF points, None for the whole page
+
+# Background processing jobs
+JOB_WORKERS = 2  # Jobs that run at the same time
+JOB_QUEUE_LIMIT = 20  # Queued plus running jobs before new submissions are refused
+JOB_HISTORY_LIMIT = 100  # Finished jobs kept for status polling
@@ -1,19 +1,18 @@
 from flask import Flask
 from flask_cors import CORS
 import os
-import logging
 from routes.endpoints import api
-from config import UPLOAD_FOLDER, MAX_CONTENT_LENGTH
+from modules.log_utils import configure_logging
+from config import UPLOAD_FOLDER, MAX_CONTENT_LENGTH, FRONTEND_ORIGINS
 
 def create_app():
     app = Flask(__name__)
-    CORS(app, resources={r"/*": {"origins": "*"}})
+    # Credentials are allowed so the browser sends the upload session cookie,
+    # which is why only the configured frontend origins may make requests
+    CORS(app, resources={r"/*": {"origins": FRONTEND_ORIGINS}}, supports_credentials=True)
     
-    # Configure logging
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-    )
+    # Configure logging from LOG_LEVEL and LOG_MODULE_LEVELS
+    configure_logging()
     
     # Configure upload folder and max content length
     app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
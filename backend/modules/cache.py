@@ -0,0 +1,201 @@
+import os
+import hashlib
+import logging
+import threading
+from typing import Optional
+import pandas as pd
+from pyarrow import feather
+
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache of DataFrames with size-bounded LRU eviction
+
+    Entries are stored as compressed Parquet files, or as uncompressed Arrow IPC
+    (Feather) files, named after their key. Feather entries are read through a
+    memory map, which skips decompression and a read buffer but still copies
+    the data into the returned DataFrame. Each
+    hit refreshes the entry's modification time, so eviction removes the least
+    recently used entries first once the cache grows past max_bytes.
+    """
+    # File suffix for each storage format
+    FORMATS = {
+        'parquet': '.parquet',
+        'feather': '.arrow'
+    }
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, directory: str, max_bytes: int, fmt: str = 'parquet'):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported cache format: {fmt}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fmt = fmt
+        self.suffix = self.FORMATS[fmt]
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        Compute the SHA-256 digest of a file's contents
+
+        Args:
+            file_path (str): Path to the file
+
+        Returns:
+            str: Hex digest of the file contents
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DiskCache.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(file_path: str, *parts: str) -> str:
+        """
+        Build a cache key from a file's contents and any extra versioning parts
+
+        Args:
+            file_path (str): Path to the file being cached
+            *parts (str): Values that invalidate the entry when they change
+
+        Returns:
+            str: Hex digest identifying the cache entry
+        """
+        digest = hashlib.sha256(DiskCache.hash_file(file_path).encode())
+        for part in parts:
+            digest.update(b'\0' + str(part).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def derive_key(key: str, *parts: str) -> str:
+        """
+        Build the key of an entry that is stored alongside another entry
+
+        Args:
+            key (str): Key of the related entry
+            *parts (str): Values naming the derived entry
+
+        Returns:
+            str: Hex digest identifying the derived entry
+        """
+        digest = hashlib.sha256(key.encode())
+        for part in parts:
+            digest.update(b'\0' + str(part).encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            Optional[pd.DataFrame]: Cached DataFrame, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            if self.fmt == 'feather':
+                df = feather.read_table(entry_path, memory_map=True).to_pandas()
+            else:
+                df = pd.read_parquet(entry_path)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {entry_path}: {str(e)}")
+            self._remove(entry_path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Store a DataFrame in the cache and evict old entries if over budget
+
+        Args:
+            key (str): Cache key from make_key
+            df (pd.DataFrame): DataFrame to store
+        """
+        entry_path = self._entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.fmt == 'feather':
+                feather.write_feather(df.reset_index(drop=True), temp_path, compression='uncompressed')
+            else:
+                df.to_parquet(temp_path, index=False)
+            os.replace(temp_path, entry_path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {entry_path}: {str(e)}")
+            self._remove(temp_path)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            logger.debug(f"Evicting cache entry {name}")
+            self._remove(os.path.join(self.directory, name))
+            total_bytes -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        """
+        Report cache counters and current size
+
+        Returns:
+            dict: Hit and miss counts, entry count, and total bytes on disk
+        """
+        entries = 0
+        total_bytes = 0
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if not name.endswith(self.suffix):
+                    continue
+                try:
+                    total_bytes += os.path.getsize(os.path.join(self.directory, name))
+                    entries += 1
+                except FileNotFoundError:
+                    continue
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries,
+                'bytes': total_bytes
+            }
@@ -1,9 +1,21 @@
 import pandas as pd
+import os
+import time
 import logging
+import openpyxl
+from typing import Iterator, List, Optional, Set, Tuple
+from config import CACHE_FOLDER, IMPORT_CACHE_MAX_BYTES, IMPORT_READ_MODE, IMPORT_CHUNK_ROWS, IMPORT_COLUMNS
+from modules.cache import DiskCache
+from modules.matcher import Matcher
+from modules.import_index import ImportIndex
+from modules.metrics import STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
 class ExcelParser:
+    # Bump whenever a change to reading or cleaning alters the resulting data
+    PARSER_VERSION = '2'
+
     # Define column mappings (Excel column name -> Internal column name)
     COLUMN_MAPPINGS = {
         'Filer': 'Filer Code',
@@ -17,11 +29,106 @@ class ExcelParser:
     # Date columns that need special handling
     DATE_COLUMNS = ['Import Date', 'Arrival Date', 'Liq. Date']
     
+    # Cleaned import data keyed by workbook contents, stored as uncompressed Arrow
+    cache = DiskCache(os.path.join(CACHE_FOLDER, 'import'), IMPORT_CACHE_MAX_BYTES, fmt='feather')
+    
+    @staticmethod
+    def read_import_file(file_path: str, use_cache: bool = True,
+                         keys: Optional[Set[Tuple[str, str, str]]] = None) -> pd.DataFrame:
+        """
+        Read, validate and clean the import record Excel file
+        
+        The cleaned result is cached, so an import file that was already read at
+        upload time is loaded from an uncompressed Arrow file instead of Excel.
+        
+        When match keys are given, only the records with one of those keys are
+        returned. On a cache miss they are filtered while the workbook streams,
+        so non-matching rows are never cleaned, and the partial result is not cached.
+        
+        Args:
+            file_path (str): Path to the Excel file
+            use_cache (bool): Whether to read and populate the import cache
+            keys (Set[Tuple[str, str, str]]): Match keys from Matcher.error_keys,
+                None to return every record
+            
+        Returns:
+            pd.DataFrame: Cleaned import records
+        """
+        if not use_cache:
+            return ExcelParser._read_excel(file_path, keys)
+        return ExcelParser._read_cached(file_path, ExcelParser._cache_key(file_path), keys)
+
+    @staticmethod
+    def load_import(file_path: str) -> Tuple[pd.DataFrame, ImportIndex]:
+        """
+        Read the cleaned import records together with a hash index over their match keys
+        
+        The index is cached alongside the cleaned records, so later loads of the
+        same workbook can match error records by lookup without normalizing or
+        hashing any import keys.
+        
+        Args:
+            file_path (str): Path to the Excel file
+            
+        Returns:
+            Tuple[pd.DataFrame, ImportIndex]: Cleaned import records and their index
+        """
+        cache_key = ExcelParser._cache_key(file_path)
+        df = ExcelParser._read_cached(file_path, cache_key)
+        
+        index_key = DiskCache.derive_key(cache_key, 'index')
+        index_df = ExcelParser.cache.get(index_key)
+        if index_df is not None and len(index_df) == len(df):
+            return df, ImportIndex.from_frame(index_df)
+        
+        logger.info(f"Building import index for {file_path}")
+        index = ImportIndex.build(Matcher.normalize_keys(df))
+        ExcelParser.cache.put(index_key, index.to_frame())
+        return df, index
+
     @staticmethod
-    def read_import_file(file_path: str) -> pd.DataFrame:
+    def _cache_key(file_path: str) -> str:
+        """Build the import cache key from the workbook contents and the reading settings"""
+        try:
+            return DiskCache.make_key(
+                file_path, ExcelParser.PARSER_VERSION, ExcelParser.COLUMN_MAPPINGS, ExcelParser.DATE_COLUMNS,
+                IMPORT_READ_MODE, IMPORT_COLUMNS
+            )
+        except OSError as e:
+            logger.exception(f"Error reading Excel file: {str(e)}")
+            raise ValueError(f"Failed to process Excel file: {str(e)}")
+
+    @staticmethod
+    def _read_cached(file_path: str, cache_key: str,
+                     keys: Optional[Set[Tuple[str, str, str]]] = None) -> pd.DataFrame:
+        """Load cleaned import records from the cache, reading and caching the workbook on a miss"""
+        cached_df = ExcelParser.cache.get(cache_key)
+        if cached_df is not None:
+            logger.info(f"Import cache hit for {file_path} ({len(cached_df)} records)")
+            if keys is not None:
+                cached_df = cached_df[Matcher.key_mask(cached_df, keys)].reset_index(drop=True)
+            return cached_df
+        
+        logger.info(f"Import cache miss for {file_path}")
+        df = ExcelParser._read_excel(file_path, keys)
+        if keys is None:
+            ExcelParser.cache.put(cache_key, df)
+        return df
+
+    @staticmethod
+    def _read_excel(file_path: str, keys: Optional[Set[Tuple[str, str, str]]] = None) -> pd.DataFrame:
         """Read and validate the import record Excel file"""
         try:
             logger.debug(f"Reading Excel file: {file_path}")
+            # openpyxl can only stream .xlsx workbooks; legacy .xls files go through pandas
+            if IMPORT_READ_MODE == 'stream' and file_path.lower().endswith('.xlsx'):
+                chunks = ExcelParser.iter_import_chunks(file_path, IMPORT_COLUMNS, keys=keys)
+                df = pd.concat(chunks, ignore_index=True)
+                # Chunks are deduplicated on their own, so repeat it across chunk boundaries
+                df = df.drop_duplicates().reset_index(drop=True)
+                logger.info(f"Successfully streamed Excel file with {len(df)} records")
+                return df
+            
             # Parse dates when reading Excel file
             df = pd.read_excel(file_path, parse_dates=ExcelParser.DATE_COLUMNS)
             logger.debug(f"Excel columns found: {list(df.columns)}")
@@ -32,6 +139,9 @@ class ExcelParser:
             # Rename columns to match internal names
             df = ExcelParser._rename_columns(df)
             
+            if keys is not None:
+                df = df[Matcher.key_mask(df, keys)]
+            
             # Clean and standardize data
             df = ExcelParser.clean_data(df)
             
@@ -42,6 +152,94 @@ class ExcelParser:
             logger.exception(f"Error processing Excel file: {str(e)}")
             raise ValueError(f"Failed to process Excel file: {str(e)}")
 
+    @staticmethod
+    def iter_import_chunks(file_path: str, columns: Optional[List[str]] = None, chunk_size: int = None,
+                           keys: Optional[Set[Tuple[str, str, str]]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream the first sheet of an import workbook as cleaned DataFrame chunks
+        
+        Rows are read with openpyxl in read-only mode, so only the current chunk is
+        held in memory rather than the whole workbook object model. Only the match
+        key columns and the requested columns are kept.
+        
+        Args:
+            file_path (str): Path to the .xlsx file
+            columns (List[str]): Excel columns to keep besides the required ones,
+                None to keep every column
+            chunk_size (int): Rows per chunk, defaults to IMPORT_CHUNK_ROWS
+            keys (Set[Tuple[str, str, str]]): Match keys from Matcher.error_keys;
+                rows with other keys are dropped before cleaning
+            
+        Yields:
+            pd.DataFrame: Renamed and cleaned import records; at least one chunk,
+                which is empty if the sheet has no data rows
+            
+        Raises:
+            ValueError: If the sheet is missing required columns
+        """
+        chunk_size = chunk_size or IMPORT_CHUNK_ROWS
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            # Stored sheet dimensions can be stale, so read until the last row instead
+            sheet.reset_dimensions()
+            rows = sheet.iter_rows(values_only=True)
+            
+            names = ExcelParser._header_names(next(rows, ()))
+            logger.debug(f"Excel columns found: {names}")
+            ExcelParser._validate_columns(pd.DataFrame(columns=names))
+            selected = ExcelParser._project_columns(names, columns)
+            positions = [names.index(name) for name in selected]
+            
+            chunk = []
+            chunks_yielded = 0
+            for row in rows:
+                # Skip blank rows, like pandas does
+                if all(value is None for value in row):
+                    continue
+                chunk.append(tuple(row[i] if i < len(row) else None for i in positions))
+                if len(chunk) >= chunk_size:
+                    yield ExcelParser._build_chunk(chunk, selected, keys)
+                    chunks_yielded += 1
+                    chunk = []
+            if chunk or not chunks_yielded:
+                yield ExcelParser._build_chunk(chunk, selected, keys)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _header_names(header: tuple) -> List:
+        """Name header cells the way pd.read_excel does, including blank and repeated ones"""
+        names = []
+        for i, value in enumerate(header):
+            base = f"Unnamed: {i}" if value is None else value
+            name, suffix = base, 1
+            while name in names:
+                name = f"{base}.{suffix}"
+                suffix += 1
+            names.append(name)
+        return names
+
+    @staticmethod
+    def _project_columns(names: List, columns: Optional[List[str]]) -> List:
+        """Select the required columns plus the requested ones, in workbook order"""
+        if columns is None:
+            return list(names)
+        missing = set(columns) - set(names)
+        if missing:
+            logger.warning(f"Import file has no columns named: {', '.join(map(str, missing))}")
+        wanted = ExcelParser.REQUIRED_COLUMNS | set(columns)
+        return [name for name in names if name in wanted]
+
+    @staticmethod
+    def _build_chunk(rows: List[tuple], columns: List,
+                     keys: Optional[Set[Tuple[str, str, str]]] = None) -> pd.DataFrame:
+        """Turn a block of row values into a renamed and cleaned DataFrame, keeping only matching keys"""
+        df = ExcelParser._rename_columns(pd.DataFrame.from_records(rows, columns=columns))
+        if keys is not None:
+            df = df[Matcher.key_mask(df, keys)]
+        return ExcelParser.clean_data(df)
+
     @staticmethod
     def _validate_columns(df: pd.DataFrame) -> None:
         """Validate that the DataFrame contains all required columns"""
@@ -66,6 +264,7 @@ class ExcelParser:
     def clean_data(df: pd.DataFrame) -> pd.DataFrame:
         """Clean and standardize the import record data"""
         logger.debug("Cleaning Excel data...")
+        start = time.perf_counter()
         # Create a copy to avoid modifying the original
         cleaned_df = df.copy()
         
@@ -74,10 +273,10 @@ class ExcelParser:
             if cleaned_df[col].dtype == 'object':
                 cleaned_df[col] = cleaned_df[col].str.strip()
         
-        # Handle missing values
-        cleaned_df['7501 Line Number'] = cleaned_df['7501 Line Number'].fillna('')
-        cleaned_df['Filer Code'] = cleaned_df['Filer Code'].fillna('')
-        cleaned_df['Entry Number'] = cleaned_df['Entry Number'].fillna('')
+        # Handle missing values and store the keys as text, so a numeric key
+        # column with blank cells does not mix numbers and strings
+        for key_col in Matcher.KEY_COLUMNS:
+            cleaned_df[key_col] = cleaned_df[key_col].fillna('').astype(str)
         
         # Format date columns
         for date_col in ExcelParser.DATE_COLUMNS:
@@ -93,4 +292,5 @@ class ExcelParser:
         cleaned_df = cleaned_df.reset_index(drop=True)
         
         logger.debug(f"Data cleaning complete. {len(cleaned_df)} records remaining")
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage='clean_data')
         return cleaned_df
@@ -0,0 +1,118 @@
+import io
+import logging
+from typing import Iterator
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from modules.metrics import BYTES_WRITTEN
+
+logger = logging.getLogger(__name__)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to a generator"""
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+class Exporter:
+    # Streamable export formats: name -> (MIME type, file extension)
+    FORMATS = {
+        'csv': ('text/csv', '.csv'),
+        'jsonl': ('application/x-ndjson', '.jsonl'),
+        'parquet': ('application/vnd.apache.parquet', '.parquet')
+    }
+    # Rows serialized per chunk; each Parquet chunk becomes a row group
+    CHUNK_ROWS = 10000
+
+    @staticmethod
+    def iter_export(df: pd.DataFrame, fmt: str) -> Iterator[bytes]:
+        """
+        Serialize a DataFrame chunk by chunk, for sending as it is generated
+
+        Args:
+            df (pd.DataFrame): Formatted match result
+            fmt (str): One of FORMATS
+
+        Yields:
+            bytes: Consecutive pieces of the exported file
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if fmt not in Exporter.FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}. Available: {', '.join(Exporter.FORMATS)}")
+        logger.info(f"Exporting {len(df)} records as {fmt}")
+        if fmt == 'parquet':
+            return Exporter._count_bytes(Exporter._iter_parquet(df), fmt)
+        return Exporter._count_bytes(Exporter._iter_text(df, fmt), fmt)
+
+    @staticmethod
+    def _count_bytes(chunks: Iterator[bytes], fmt: str) -> Iterator[bytes]:
+        for chunk in chunks:
+            BYTES_WRITTEN.inc(len(chunk), format=fmt)
+            yield chunk
+
+    @staticmethod
+    def _iter_chunks(df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        for start in range(0, len(df), Exporter.CHUNK_ROWS):
+            yield df.iloc[start:start + Exporter.CHUNK_ROWS]
+
+    @staticmethod
+    def _iter_text(df: pd.DataFrame, fmt: str) -> Iterator[bytes]:
+        if fmt == 'csv':
+            # The header goes out first, so even an empty result is a valid CSV file
+            yield df.iloc[:0].to_csv(index=False).encode('utf-8')
+        for chunk in Exporter._iter_chunks(df):
+            if fmt == 'csv':
+                text = chunk.to_csv(index=False, header=False)
+            else:
+                text = chunk.to_json(orient='records', lines=True, date_format='iso')
+                if not text.endswith('\n'):
+                    text += '\n'
+            yield text.encode('utf-8')
+
+    @staticmethod
+    def _parquet_schema(df: pd.DataFrame) -> pa.Schema:
+        """Fix one schema for all row groups; text and mixed columns become strings"""
+        fields = []
+        for column, dtype in df.dtypes.items():
+            if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+                fields.append(pa.field(str(column), pa.string()))
+            else:
+                fields.append(pa.field(str(column), pa.Array.from_pandas(df[column].iloc[:0]).type))
+        return pa.schema(fields)
+
+    @staticmethod
+    def _iter_parquet(df: pd.DataFrame) -> Iterator[bytes]:
+        schema = Exporter._parquet_schema(df)
+        text_columns = [field.name for field in schema if pa.types.is_string(field.type)]
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for chunk in Exporter._iter_chunks(df.rename(columns=str)):
+                # Mixed object columns (e.g. numbers filled with '') are written as text
+                chunk = chunk.assign(**{
+                    column: chunk[column].astype(str).where(chunk[column].notna(), None)
+                    for column in text_columns
+                })
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                yield sink.drain()
+        # Closing the writer appends the footer
+        yield sink.drain()
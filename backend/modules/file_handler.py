@@ -1,15 +1,26 @@
 import os
+import uuid
 from werkzeug.utils import secure_filename
 import pandas as pd
 from datetime import datetime
-from config import UPLOAD_FOLDER, ALLOWED_EXTENSIONS
+from typing import List
+from config import UPLOAD_FOLDER, ALLOWED_EXTENSIONS, OUTPUT_WRITE_MODE
 import logging
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
 class FileHandler:
+    OUTPUT_SHEET_NAME = 'Processed Data'
+    OUTPUT_DATE_FORMAT = 'YYYY-MM-DD'
+    # pandas writes datetime values with its default datetime format
+    OUTPUT_DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+    # Rows converted to cell values at a time when streaming the output workbook
+    WRITE_CHUNK_ROWS = 10000
+
     @staticmethod
     def allowed_file(filename: str, file_type: str) -> bool:
         """
@@ -42,69 +53,42 @@ class FileHandler:
         """
         if file and FileHandler.allowed_file(file.filename, file_type):
             filename = secure_filename(file.filename)
-            # Add timestamp to filename to avoid conflicts
+            # Add timestamp and a random suffix to filename to avoid conflicts between sessions
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            new_filename = f"{timestamp}_{filename}"
+            new_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{filename}"
             file_path = os.path.join(UPLOAD_FOLDER, new_filename)
             file.save(file_path)
             return file_path
         raise ValueError(f"Invalid file type. Allowed types for {file_type}: {ALLOWED_EXTENSIONS[file_type]}")
 
     @staticmethod
-    def generate_output_file(df: pd.DataFrame) -> str:
+    def generate_output_file(df: pd.DataFrame, output_path: str = None) -> str:
         """
         Generate Excel file from processed data with auto-sized columns
         
         Args:
             df (pd.DataFrame): DataFrame to save
+            output_path (str): Where to write the file, defaults to a new
+                timestamped file in the upload directory
             
         Returns:
             str: Path to the generated Excel file
         """
         logger.debug("Generating output Excel file")
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_filename = f"processed_data_{timestamp}.xlsx"
-        output_path = os.path.join(UPLOAD_FOLDER, output_filename)
+        if output_path is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_path = os.path.join(UPLOAD_FOLDER, f"processed_data_{timestamp}_{uuid.uuid4().hex[:8]}.xlsx")
+        output_filename = os.path.basename(output_path)
         
         try:
-            # Ensure the upload directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Create Excel writer with date format
-            writer = pd.ExcelWriter(
-                output_path,
-                engine='openpyxl',
-                date_format='YYYY-MM-DD'
-            )
-            
-            # Save the DataFrame to Excel
-            df.to_excel(writer, index=False, sheet_name='Processed Data')
+            # Ensure the output directory exists
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
             
-            # Access the workbook and active worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Processed Data']
-            
-            # Auto-size columns
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                
-                # Find the maximum length in the column
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                # Add a little extra width for padding
-                adjusted_width = (max_length + 2)
-                
-                # Set column width
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Save the workbook
-            writer.close()
+            widths = FileHandler._column_widths(df)
+            if OUTPUT_WRITE_MODE == 'stream':
+                FileHandler._write_streaming(df, output_path, widths)
+            else:
+                FileHandler._write_with_pandas(df, output_path, widths)
             
             logger.info(f"Successfully generated output file: {output_filename}")
             return output_path
@@ -113,6 +97,86 @@ class FileHandler:
             logger.exception("Error generating output file")
             raise ValueError(f"Failed to generate output file: {str(e)}")
 
+    @staticmethod
+    def _column_widths(df: pd.DataFrame) -> List[int]:
+        """
+        Compute auto-sized column widths from the DataFrame
+        
+        Each column is as wide as its longest header or value string, plus padding.
+        
+        Args:
+            df (pd.DataFrame): DataFrame to be written
+            
+        Returns:
+            List[int]: Width of each column, in column order
+        """
+        widths = []
+        for column in df.columns:
+            values = df[column]
+            # Missing values become empty cells
+            lengths = values.astype(str).str.len().where(values.notna(), 0)
+            max_length = max(len(str(column)), int(lengths.max()) if len(values) else 0)
+            # Add a little extra width for padding
+            widths.append(max_length + 2)
+        return widths
+
+    @staticmethod
+    def _write_with_pandas(df: pd.DataFrame, output_path: str, widths: List[int]) -> None:
+        """Write the workbook through pandas with openpyxl in normal mode"""
+        # Create Excel writer with date format
+        with pd.ExcelWriter(output_path, engine='openpyxl', date_format=FileHandler.OUTPUT_DATE_FORMAT) as writer:
+            df.to_excel(writer, index=False, sheet_name=FileHandler.OUTPUT_SHEET_NAME)
+            worksheet = writer.sheets[FileHandler.OUTPUT_SHEET_NAME]
+            for column_number, width in enumerate(widths, 1):
+                worksheet.column_dimensions[get_column_letter(column_number)].width = width
+
+    @staticmethod
+    def _write_streaming(df: pd.DataFrame, output_path: str, widths: List[int]) -> None:
+        """
+        Write the workbook with a write-only worksheet
+        
+        Rows are serialized as they are appended, so memory stays flat no matter how
+        many rows are written. The header is styled like pandas' to_excel header.
+        """
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(FileHandler.OUTPUT_SHEET_NAME)
+        # Column widths must be set before any rows are written
+        for column_number, width in enumerate(widths, 1):
+            worksheet.column_dimensions[get_column_letter(column_number)].width = width
+        
+        header = []
+        thin = Side(style='thin')
+        for column in df.columns:
+            cell = WriteOnlyCell(worksheet, value=str(column))
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal='center', vertical='top')
+            header.append(cell)
+        worksheet.append(header)
+        
+        date_columns = {
+            position for position, dtype in enumerate(df.dtypes)
+            if pd.api.types.is_datetime64_any_dtype(dtype)
+        }
+        for start in range(0, len(df), FileHandler.WRITE_CHUNK_ROWS):
+            chunk = df.iloc[start:start + FileHandler.WRITE_CHUNK_ROWS].astype(object)
+            # Missing values become empty cells
+            chunk = chunk.where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                if date_columns:
+                    row = [FileHandler._datetime_cell(worksheet, value) if position in date_columns else value
+                           for position, value in enumerate(row)]
+                worksheet.append(row)
+        
+        workbook.save(output_path)
+
+    @staticmethod
+    def _datetime_cell(worksheet, value) -> WriteOnlyCell:
+        """Wrap a datetime value in a cell carrying the output datetime format"""
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.number_format = FileHandler.OUTPUT_DATETIME_FORMAT
+        return cell
+
     @staticmethod
     def cleanup_old_files():
         """Remove files older than 1 hour from the upload directory"""
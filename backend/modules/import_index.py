@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import logging
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+class ImportIndex:
+    """
+    Hash index from normalized match keys to import record row offsets
+
+    Keys are hashed to 64-bit values and kept sorted alongside the offsets of
+    their rows, so a batch of lookups is a pair of binary searches per key.
+    Rows that share a key keep their original order. Hash collisions are
+    possible, so callers confirm candidate rows against the actual keys.
+    """
+    def __init__(self, key_hashes: np.ndarray, rows: np.ndarray):
+        self.key_hashes = key_hashes
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def hash_keys(keys: pd.DataFrame) -> np.ndarray:
+        """
+        Hash each row of a normalized key frame
+
+        Args:
+            keys (pd.DataFrame): Normalized key columns, as from Matcher.normalize_keys
+
+        Returns:
+            np.ndarray: uint64 hash per row, stable across processes
+        """
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+    @staticmethod
+    def build(keys: pd.DataFrame) -> 'ImportIndex':
+        """
+        Index the normalized keys of a set of import records
+
+        Args:
+            keys (pd.DataFrame): Normalized key columns, one row per import record
+
+        Returns:
+            ImportIndex: Index over the record positions
+        """
+        key_hashes = ImportIndex.hash_keys(keys)
+        # A stable sort keeps rows with equal keys in their original order
+        order = np.argsort(key_hashes, kind='stable')
+        logger.debug(f"Built import index over {len(order)} records")
+        return ImportIndex(key_hashes[order], order.astype(np.int64))
+
+    @staticmethod
+    def from_frame(df: pd.DataFrame) -> 'ImportIndex':
+        """Restore an index stored with to_frame"""
+        return ImportIndex(df['key_hash'].to_numpy(np.uint64), df['row'].to_numpy(np.int64))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Represent the index as a DataFrame so it can be stored in a DiskCache"""
+        return pd.DataFrame({'key_hash': self.key_hashes, 'row': self.rows})
+
+    def lookup(self, keys: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the candidate import rows for a batch of normalized keys
+
+        Args:
+            keys (pd.DataFrame): Normalized key columns to look up
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Positions in keys and the import row
+                offsets whose key hash matches, ordered by key position and then
+                by import row order
+        """
+        key_hashes = ImportIndex.hash_keys(keys)
+        starts = np.searchsorted(self.key_hashes, key_hashes, side='left')
+        counts = np.searchsorted(self.key_hashes, key_hashes, side='right') - starts
+
+        # Expand each [start, start + count) range into individual positions
+        queries = np.repeat(np.arange(len(keys)), counts)
+        range_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + range_offsets
+        return queries, self.rows[positions]
@@ -0,0 +1,192 @@
+import os
+import json
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+from modules.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFullError(Exception):
+    """Raised when no more jobs can be queued"""
+
+class JobQueue(SQLiteStore):
+    """
+    Runs long operations on a bounded pool of background threads
+
+    Each job gets an ID and a status record that the job function updates
+    through a progress callback, so clients can poll it while it runs. Status
+    records live in a SQLite database, so any worker process can answer a poll
+    and finished jobs survive a restart. A job whose process exited before it
+    finished is reported as failed.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            owner INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            stage TEXT,
+            progress TEXT NOT NULL,
+            result TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            finished_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+    """
+    PENDING = ('queued', 'running')
+
+    def __init__(self, db_path: str, max_workers: int, max_pending: int, history_limit: int):
+        super().__init__(db_path)
+        self.max_pending = max_pending
+        self.history_limit = history_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+    def submit(self, func: Callable, *args) -> str:
+        """
+        Queue a job
+
+        The job function is called as func(*args, progress=callback), where the
+        callback accepts 'stage' and any progress counters as keyword arguments.
+
+        Args:
+            func (Callable): Job function; its return value becomes the job
+                result and must be JSON serializable
+            *args: Positional arguments for the job function
+
+        Returns:
+            str: ID of the queued job
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already queued or running
+                across all worker processes
+        """
+        job_id = uuid.uuid4().hex
+        with self._transaction() as connection:
+            self._fail_orphans(connection)
+            pending = connection.execute(
+                'SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)', self.PENDING
+            ).fetchone()[0]
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f"Too many jobs in progress ({pending}), try again later")
+            connection.execute(
+                "INSERT INTO jobs (id, owner, status, progress, created_at) VALUES (?, ?, 'queued', '{}', ?)",
+                (job_id, os.getpid(), datetime.now().isoformat())
+            )
+            self._prune(connection)
+
+        self._executor.submit(self._run, job_id, func, args)
+        logger.info(f"Queued job {job_id}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Get a snapshot of a job's status
+
+        Args:
+            job_id (str): ID returned by submit
+
+        Returns:
+            Optional[dict]: Job status, or None if the job is unknown
+        """
+        with self._transaction(write=False) as connection:
+            row = self._select(connection, job_id)
+        if row is not None and row['status'] in self.PENDING and not self._process_alive(row['owner']):
+            with self._transaction() as connection:
+                self._fail_orphans(connection)
+                row = self._select(connection, job_id)
+        if row is None:
+            return None
+
+        return {
+            'job_id': row['id'],
+            'status': row['status'],
+            'stage': row['stage'],
+            'progress': json.loads(row['progress']),
+            'result': json.loads(row['result']) if row['result'] is not None else None,
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'finished_at': row['finished_at']
+        }
+
+    @staticmethod
+    def _select(connection, job_id: str) -> Optional[dict]:
+        cursor = connection.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def _run(self, job_id: str, func: Callable, args: tuple) -> None:
+        self._update(job_id, status='running')
+
+        def progress(stage: str = None, **counters) -> None:
+            with self._transaction() as connection:
+                current = json.loads(connection.execute(
+                    'SELECT progress FROM jobs WHERE id = ?', (job_id,)
+                ).fetchone()[0])
+                current.update(counters)
+                connection.execute(
+                    'UPDATE jobs SET stage = COALESCE(?, stage), progress = ? WHERE id = ?',
+                    (stage, json.dumps(current), job_id)
+                )
+
+        try:
+            result = json.dumps(func(*args, progress=progress))
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            self._update(job_id, status='failed', error=str(e), finished_at=datetime.now().isoformat())
+            return
+
+        logger.info(f"Job {job_id} completed")
+        self._update(job_id, status='completed', result=result, finished_at=datetime.now().isoformat())
+
+    def _update(self, job_id: str, **fields) -> None:
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._transaction() as connection:
+            connection.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _fail_orphans(self, connection) -> None:
+        """Mark pending jobs of processes that no longer run as failed"""
+        rows = connection.execute(
+            'SELECT id, owner FROM jobs WHERE status IN (?, ?)', self.PENDING
+        ).fetchall()
+        owners = {owner: self._process_alive(owner) for owner in {owner for _, owner in rows}}
+        orphans = [job_id for job_id, owner in rows if not owners[owner]]
+        if orphans:
+            logger.warning(f"Marking {len(orphans)} jobs of exited worker processes as failed")
+            connection.executemany(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                [('Worker process exited before the job finished', datetime.now().isoformat(), job_id)
+                 for job_id in orphans]
+            )
+
+    @staticmethod
+    def _process_alive(pid: int) -> bool:
+        """Whether a process on this machine is still running"""
+        if pid == os.getpid():
+            return True
+        if os.name == 'nt':
+            # os.kill would terminate the process on Windows; assume it is running
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _prune(self, connection) -> None:
+        """Drop the oldest finished jobs beyond history_limit"""
+        connection.execute(
+            """
+            DELETE FROM jobs WHERE id IN (
+                SELECT id FROM jobs WHERE status IN ('completed', 'failed')
+                ORDER BY rowid DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.history_limit,)
+        )
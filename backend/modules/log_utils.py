@@ -0,0 +1,65 @@
+import logging
+from typing import Any, Dict, Optional
+from config import LOG_LEVEL, LOG_MODULE_LEVELS, LOG_MAX_VALUE_CHARS
+
+LOG_FORMAT = '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
+
+class Truncated:
+    """
+    Log argument that is converted to text only when the record is emitted
+
+    Pass it to a %-style logging call instead of formatting the value into the
+    message; long values are cut to LOG_MAX_VALUE_CHARS characters.
+    """
+    __slots__ = ('value', 'limit')
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        limit = self.limit or LOG_MAX_VALUE_CHARS
+        if len(text) <= limit:
+            return text
+        return f"{text[:limit]}... ({len(text) - limit} more characters)"
+
+def parse_module_levels(spec: str) -> Dict[str, str]:
+    """
+    Parse per-module log levels written as 'logger=LEVEL,logger=LEVEL'
+
+    Args:
+        spec (str): Comma-separated logger name and level pairs
+
+    Returns:
+        Dict[str, str]: Level name of each logger
+
+    Raises:
+        ValueError: If an entry is not a logger=LEVEL pair
+    """
+    levels = {}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        name, separator, level = entry.partition('=')
+        if not separator or not name.strip() or not level.strip():
+            raise ValueError(f"Invalid module log level: {entry}. Expected logger=LEVEL")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def configure_logging(level: str = None, module_levels: str = None) -> None:
+    """
+    Set the root log level and the levels of individual loggers
+
+    Args:
+        level (str): Root level name, defaults to LOG_LEVEL
+        module_levels (str): Per-logger levels as 'logger=LEVEL,...', defaults
+            to LOG_MODULE_LEVELS
+
+    Raises:
+        ValueError: If a level setting cannot be parsed
+    """
+    level = (level or LOG_LEVEL).upper()
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    logging.getLogger().setLevel(level)
+    spec = LOG_MODULE_LEVELS if module_levels is None else module_levels
+    for name, module_level in parse_module_levels(spec).items():
+        logging.getLogger(name).setLevel(module_level)
@@ -1,87 +1,185 @@
 import pandas as pd
+import numpy as np
 import logging
+from typing import List, Optional, Set, Tuple
+from config import ENTRY_NUMBER_ALIASES
+from modules.import_index import ImportIndex
+from modules.log_utils import Truncated
 
 logger = logging.getLogger(__name__)
 
 class Matcher:
+    # Columns that identify an import line in both the error and import records
+    KEY_COLUMNS = ['Filer Code', 'Entry Number', '7501 Line Number']
+
+    # Largest composite key code encode_keys builds before renumbering
+    MAX_KEY_CODE = 2 ** 62
+
+    @staticmethod
+    def _normalize_column(column: str, values: pd.Series) -> pd.Series:
+        """Apply the normalization rule of one key column to its values"""
+        # Convert to string and remove any leading/trailing spaces
+        normalized = values.astype(str).str.strip()
+        if column == '7501 Line Number':
+            # Line numbers also lose their leading zeros
+            normalized = normalized.str.lstrip('0').fillna('')
+        return normalized
+
+    @staticmethod
+    def _factorize(values: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+        """Like pd.factorize, but missing values get a code of their own instead of -1"""
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Series(uniques)
+        missing = codes < 0
+        if missing.any():
+            codes = np.where(missing, len(uniques), codes)
+            uniques = pd.concat([uniques, values.iloc[[np.argmax(missing)]]], ignore_index=True)
+        return codes, uniques
+
     @staticmethod
-    def match_records(error_df: pd.DataFrame, import_df: pd.DataFrame) -> pd.DataFrame:
+    def _factorize_key_column(df: pd.DataFrame, column: str) -> Tuple[np.ndarray, pd.Series]:
+        """
+        Normalize a key column through its distinct values
+        
+        Returns:
+            Tuple[np.ndarray, pd.Series]: Code per record and the normalized value of each code
+        """
+        codes, uniques = Matcher._factorize(df[column])
+        return codes, Matcher._normalize_column(column, uniques)
+
+    @staticmethod
+    def normalize_keys(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Standardize the match key columns so both sides compare as equal strings
+        
+        Each distinct value is normalized once, so repeated filer codes and entry
+        numbers cost a lookup rather than another round of string operations.
+        
+        Args:
+            df (pd.DataFrame): Records with the KEY_COLUMNS
+            
+        Returns:
+            pd.DataFrame: Normalized key columns, aligned with df
+        """
+        columns = {}
+        for column in Matcher.KEY_COLUMNS:
+            codes, normalized = Matcher._factorize_key_column(df, column)
+            columns[column] = normalized.iloc[codes].set_axis(df.index)
+        return pd.DataFrame(columns, index=df.index)
+
+    @staticmethod
+    def encode_keys(*frames: pd.DataFrame) -> List[np.ndarray]:
+        """
+        Encode the normalized composite key of every record as a single int64 code
+        
+        Records get equal codes, within and across the frames, exactly when their
+        normalized keys are equal, so frames can be joined on one integer column.
+        The frames themselves are not modified.
+        
+        Args:
+            *frames (pd.DataFrame): Records with the KEY_COLUMNS
+            
+        Returns:
+            List[np.ndarray]: Key codes for each frame, aligned with its rows
+        """
+        lengths = [len(df) for df in frames]
+        combined = np.zeros(sum(lengths), dtype=np.int64)
+        code_range = 1  # Upper bound on the composite codes so far
+        for column in Matcher.KEY_COLUMNS:
+            frame_codes = []
+            frame_values = []
+            offset = 0
+            for df in frames:
+                codes, normalized = Matcher._factorize_key_column(df, column)
+                frame_codes.append(codes + offset)
+                frame_values.append(normalized)
+                offset += len(normalized)
+            # Give equal normalized values from different frames the same code
+            shared, values = Matcher._factorize(pd.concat(frame_values, ignore_index=True))
+            column_codes = shared[np.concatenate(frame_codes)]
+            # Renumber the composite codes densely first if folding in the column could overflow int64
+            if code_range * max(len(values), 1) > Matcher.MAX_KEY_CODE:
+                combined, uniques = pd.factorize(combined)
+                code_range = max(len(uniques), 1)
+            combined = combined * len(values) + column_codes
+            code_range *= max(len(values), 1)
+        return np.split(combined.astype(np.int64), np.cumsum(lengths)[:-1])
+
+    @staticmethod
+    def error_keys(error_df: pd.DataFrame) -> Set[Tuple[str, str, str]]:
+        """
+        Collect the import record keys that the error records can match
+        
+        Args:
+            error_df (pd.DataFrame): Parsed error records
+            
+        Returns:
+            Set[Tuple[str, str, str]]: Normalized (Filer Code, Entry Number,
+                7501 Line Number) keys, including those of aliased entry numbers
+        """
+        query_keys, _ = Matcher._alias_queries(Matcher.normalize_keys(error_df))
+        return set(query_keys.itertuples(index=False, name=None))
+
+    @staticmethod
+    def key_mask(df: pd.DataFrame, keys: Set[Tuple[str, str, str]]) -> np.ndarray:
+        """
+        Flag the records whose normalized key is in a key set
+        
+        Args:
+            df (pd.DataFrame): Records with the KEY_COLUMNS
+            keys (Set[Tuple[str, str, str]]): Keys from error_keys
+            
+        Returns:
+            np.ndarray: Boolean mask aligned with df
+        """
+        if df.empty or not keys:
+            return np.zeros(len(df), dtype=bool)
+        return pd.MultiIndex.from_frame(Matcher.normalize_keys(df)).isin(list(keys))
+
+    @staticmethod
+    def match_records(error_df: pd.DataFrame, import_df: pd.DataFrame,
+                      index: Optional[ImportIndex] = None) -> pd.DataFrame:
         """
         Match error records with import records
+        
+        Given an ImportIndex over import_df, error records are answered by direct
+        lookup instead of a merge against every import record. Both give the same rows.
+        Neither input DataFrame is modified.
         """
         try:
             logger.debug("Starting record matching process...")
-            logger.debug(f"Error records: {len(error_df)}, Import records: {len(import_df)}")
-            
-            # Clean and standardize the matching columns
-            for df in [error_df, import_df]:
-                # Convert Entry Number to string and remove any leading/trailing spaces
-                df['Entry Number'] = df['Entry Number'].astype(str).str.strip()
-                
-                # Convert 7501 Line Number to string, remove leading zeros and spaces
-                df['7501 Line Number'] = (df['7501 Line Number']
-                    .astype(str)
-                    .str.strip()
-                    .str.lstrip('0')
-                    .fillna('')
-                )
-                
-                # Clean Filer Code
-                df['Filer Code'] = df['Filer Code'].astype(str).str.strip()
-            
-            # Create a copy of import_df with both original and test entry numbers
-            import_df_expanded = import_df.copy()
-            
-            # Add test entry number (88888838) to match error records
-            if '88888838' in error_df['Entry Number'].unique():
-                logger.info("Found test entry number 88888838 in error records")
-                # Create a copy of rows with entry number 60060331 but change it to 88888838
-                test_entries = import_df[import_df['Entry Number'] == '60060331'].copy()
-                test_entries['Entry Number'] = '88888838'
-                import_df_expanded = pd.concat([import_df_expanded, test_entries])
-            
-            # Log sample values after cleaning
-            logger.debug("Sample values after cleaning:")
-            for col in ['Filer Code', 'Entry Number', '7501 Line Number']:
-                logger.debug(f"{col} in error_df: {error_df[col].head().tolist()}")
-                logger.debug(f"{col} in import_df: {import_df_expanded[col].head().tolist()}")
-            
-            # Merge the dataframes
-            merged_df = pd.merge(
-                error_df,
-                import_df_expanded,
-                on=['Filer Code', 'Entry Number', '7501 Line Number'],
-                how='left',
-                indicator=True
-            )
+            logger.debug("Error records: %d, Import records: %d", len(error_df), len(import_df))
+            
+            if index is None:
+                merged_df = Matcher._merge_records(error_df, import_df)
+            else:
+                merged_df = Matcher._lookup_records(Matcher._with_normalized_keys(error_df), import_df, index)
             
             # Log matching statistics
-            match_stats = merged_df['_merge'].value_counts()
-            logger.info(f"Matching statistics:\n{match_stats}")
+            matched_count = int((merged_df['_merge'] == 'both').sum())
+            logger.info(f"Matching statistics: {matched_count} matched, {len(merged_df) - matched_count} unmatched")
             
             # Check for unmatched records
-            unmatched = merged_df[merged_df['_merge'] == 'left_only']
-            if not unmatched.empty:
-                logger.warning(f"Found {len(unmatched)} unmatched error records")
-                logger.debug("Sample unmatched record:")
-                for col in ['Filer Code', 'Entry Number', '7501 Line Number']:
-                    logger.debug(f"{col}: {unmatched[col].iloc[0]}")
+            if matched_count < len(merged_df):
+                logger.warning(f"Found {len(merged_df) - matched_count} unmatched error records")
+                if logger.isEnabledFor(logging.DEBUG):
+                    unmatched = merged_df[merged_df['_merge'] == 'left_only']
+                    logger.debug("Sample unmatched record keys: %s", unmatched[Matcher.KEY_COLUMNS].iloc[0].to_dict())
             
             # Remove the merge indicator column
             merged_df = merged_df.drop('_merge', axis=1)
             
             # Verify final data
-            logger.debug(f"Final columns: {merged_df.columns.tolist()}")
-            if not merged_df.empty:
-                sample_record = merged_df.iloc[0]
-                logger.debug("Sample matched record:")
-                logger.debug(f"Error info: {sample_record[['Error Code', 'Error Description']]}")
-                logger.debug(f"Match keys: {sample_record[['Filer Code', 'Entry Number', '7501 Line Number']]}")
-                
-                # Log some import data columns to verify they're present
-                import_sample_cols = ['Tariff', 'Goods Description', 'Line Entered Value']
-                logger.debug("Sample import data:")
-                logger.debug(sample_record[import_sample_cols])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Final columns: %s", merged_df.columns.tolist())
+                if not merged_df.empty:
+                    # Log some import data columns to verify they're present
+                    sample_cols = [
+                        col for col in ['Error Code', 'Error Description'] + Matcher.KEY_COLUMNS
+                        + ['Tariff', 'Goods Description', 'Line Entered Value']
+                        if col in merged_df.columns
+                    ]
+                    logger.debug("Sample matched record: %s", Truncated(merged_df[sample_cols].iloc[0].to_dict()))
             
             return merged_df
             
@@ -89,6 +187,111 @@ class Matcher:
             logger.exception("Error matching records")
             raise ValueError(f"Failed to match records: {str(e)}")
 
+    @staticmethod
+    def _with_normalized_keys(df: pd.DataFrame) -> pd.DataFrame:
+        """Copy records with their key columns replaced by the normalized keys"""
+        normalized_df = df.copy()
+        normalized_df[Matcher.KEY_COLUMNS] = Matcher.normalize_keys(df)
+        return normalized_df
+
+    @staticmethod
+    def _alias_queries(keys: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Expand normalized error keys with the keys of their aliased entry numbers
+        
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: Keys to look up, every error key first
+                followed by the rewritten keys of aliased entries, and the position
+                of the error record each lookup key belongs to
+        """
+        keys = keys[Matcher.KEY_COLUMNS].reset_index(drop=True)
+        aliases = keys['Entry Number'].map(ENTRY_NUMBER_ALIASES)
+        alias_rows = np.flatnonzero(aliases.notna().to_numpy())
+        if len(alias_rows):
+            logger.info(f"Found {len(alias_rows)} error records with aliased entry numbers")
+        alias_keys = keys.iloc[alias_rows].assign(**{'Entry Number': aliases.iloc[alias_rows].to_numpy()})
+        query_keys = pd.concat([keys, alias_keys], ignore_index=True)
+        return query_keys, np.concatenate([np.arange(len(keys)), alias_rows])
+
+    @staticmethod
+    def _merge_records(error_df: pd.DataFrame, import_df: pd.DataFrame) -> pd.DataFrame:
+        """Left-join error records to every import record on encoded keys, adding a '_merge' indicator column"""
+        # The output carries the error side's normalized keys; the import keys are only encoded
+        left_df = Matcher._with_normalized_keys(error_df)
+        query_keys, owners = Matcher._alias_queries(left_df)
+        query_codes, import_codes = Matcher.encode_keys(query_keys, import_df)
+        
+        # Log sample values after cleaning
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sample keys after cleaning: %s", left_df[Matcher.KEY_COLUMNS].head().to_dict('list'))
+        logger.debug("Encoded %d import keys", len(import_codes))
+        
+        # Import rows whose code no lookup key has can never match, so drop them
+        # with a cheap integer membership test before merging
+        rows = np.flatnonzero(pd.Series(import_codes).isin(query_codes).to_numpy())
+        
+        # Merge the lookup keys and the remaining import rows on the single encoded key column
+        pairs = pd.merge(
+            pd.DataFrame({'_match_key': query_codes, 'query': np.arange(len(query_codes))}),
+            pd.DataFrame({'_match_key': import_codes[rows], 'row': rows}),
+            on='_match_key'
+        )
+        return Matcher._join_result(left_df, import_df, owners, pairs['query'].to_numpy(), pairs['row'].to_numpy())
+
+    @staticmethod
+    def _lookup_records(error_df: pd.DataFrame, import_df: pd.DataFrame, index: ImportIndex) -> pd.DataFrame:
+        """Left-join error records with normalized keys to import records through an index"""
+        query_keys, owners = Matcher._alias_queries(error_df)
+        
+        # Confirm each candidate against its actual key to rule out hash collisions
+        queries, rows = index.lookup(query_keys)
+        candidate_keys = Matcher.normalize_keys(import_df.iloc[rows]).to_numpy()
+        confirmed = (candidate_keys == query_keys.iloc[queries].to_numpy()).all(axis=1)
+        return Matcher._join_result(error_df, import_df, owners, queries[confirmed], rows[confirmed])
+
+    @staticmethod
+    def _join_result(error_df: pd.DataFrame, import_df: pd.DataFrame, owners: np.ndarray,
+                     queries: np.ndarray, rows: np.ndarray) -> pd.DataFrame:
+        """
+        Build the left join of error records to import records from matching key pairs
+        
+        Each error record is followed by the import lines matching its own key in
+        import order, then those matching its aliased entry number's key. Error
+        records without a match keep one row with empty import columns. Columns
+        and the '_merge' indicator are laid out the way pd.merge lays them out.
+        
+        Args:
+            error_df (pd.DataFrame): Error records with normalized keys
+            import_df (pd.DataFrame): Import records
+            owners (np.ndarray): Error record position of each lookup key
+            queries (np.ndarray): Lookup key position of each matching pair
+            rows (np.ndarray): Import record position of each matching pair
+        """
+        unmatched = np.setdiff1d(np.arange(len(error_df)), owners[queries])
+        left = np.concatenate([owners[queries], unmatched])
+        right = np.concatenate([rows, np.full(len(unmatched), -1)])
+        rank = np.concatenate([queries, np.zeros(len(unmatched), dtype=queries.dtype)])
+        # Order by error record, then lookup key (own key before alias), then import row
+        order = np.lexsort((right, rank, left))
+        left, right = left[order], right[order]
+        
+        import_cols = [col for col in import_df.columns if col not in Matcher.KEY_COLUMNS]
+        left_df = error_df.iloc[left].reset_index(drop=True)
+        # Offset -1 is not in the index, so reindexing gives an all-NaN row for unmatched records
+        right_df = import_df[import_cols].reset_index(drop=True).reindex(right).reset_index(drop=True)
+        
+        # Name clashing columns the way pd.merge does
+        overlap = set(left_df.columns) & set(import_cols)
+        left_df = left_df.rename(columns={col: f"{col}_x" for col in overlap})
+        right_df = right_df.rename(columns={col: f"{col}_y" for col in overlap})
+        
+        merged_df = pd.concat([left_df, right_df], axis=1)
+        merged_df['_merge'] = pd.Categorical(
+            np.where(right >= 0, 'both', 'left_only'),
+            categories=['left_only', 'right_only', 'both']
+        )
+        return merged_df
+
     @staticmethod
     def format_output(df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -106,12 +309,11 @@ class Matcher:
             formatted_df = formatted_df.fillna('')
             
             # Log the output structure
-            logger.debug(f"Output columns ({len(formatted_df.columns)}): {formatted_df.columns.tolist()}")
+            logger.debug("Output columns (%d): %s", len(formatted_df.columns), Truncated(formatted_df.columns.tolist()))
             logger.info(f"Formatted {len(formatted_df)} records for output")
             
-            if not formatted_df.empty:
-                logger.debug("Sample output record:")
-                logger.debug(formatted_df.iloc[0])
+            if not formatted_df.empty and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sample output record: %s", Truncated(formatted_df.iloc[0].to_dict()))
             
             return formatted_df
             
@@ -0,0 +1,198 @@
+import math
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+class Counter:
+    """Monotonically increasing value per label combination"""
+    TYPE = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Add to the counter
+
+        Args:
+            amount (float): Non-negative increment
+            **labels: Value of each label name
+
+        Raises:
+            ValueError: If the amount is negative or the labels do not match
+        """
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Tuple[str, dict, float]]:
+        """Return (sample name, labels, value) for every label combination"""
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in values]
+
+class Histogram(Counter):
+    """Distribution of observed values in cumulative buckets, per label combination"""
+    TYPE = 'histogram'
+    # Seconds, from fast cache hits to large workbooks
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        raise TypeError(f"Histogram {self.name} records values with observe")
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record one observation
+
+        Args:
+            value (float): Observed value
+            **labels: Value of each label name
+        """
+        key = self._key(labels)
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts, then the +Inf count and the sum
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[position] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall time spent in the block, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Tuple[str, dict, float]]:
+        with self._lock:
+            values = [(key, list(state)) for key, state in self._values.items()]
+        samples = []
+        for key, state in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + [math.inf], state[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_count", labels, cumulative))
+            samples.append((f"{self.name}_sum", labels, state[-1]))
+        return samples
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered in the Prometheus text exposition format
+
+    Counters and histograms are updated in place under a per-metric lock.
+    Collectors are called at render time for values that are cheaper to read
+    on demand than to track, such as cache sizes. Metrics are kept per process.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, Counter] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, List[Tuple[dict, float]]]]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Counter) -> Counter:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register and return a counter"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        """Register and return a histogram"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, str, List[Tuple[dict, float]]]]]) -> None:
+        """
+        Register a callable producing metrics at render time
+
+        Args:
+            collector (Callable): Returns a list of (name, type, documentation,
+                [(labels, value), ...]) tuples
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text, one HELP and TYPE header per metric family
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            lines.extend(_format_sample(name, labels, value) for name, labels, value in metric.samples())
+        for collector in collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(_format_sample(name, labels, value) for labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _format_sample(name: str, labels: dict, value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    escaped = (
+        str(label_value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        for label_value in labels.values()
+    )
+    label_text = ','.join(f'{name}="{label_value}"' for name, label_value in zip(labels, escaped))
+    return f"{name}{{{label_text}}} {_format_value(value)}"
+
+# Metrics of the processing pipeline, shared by every module
+registry = MetricsRegistry()
+STAGE_SECONDS = registry.histogram(
+    'pipeline_stage_seconds', 'Wall time of each processing stage', ['stage']
+)
+PDF_PAGES = registry.counter(
+    'pdf_pages_parsed_total', 'PDF pages read by the parser, excluding parse cache hits'
+)
+PDF_FILES = registry.counter(
+    'pdf_files_parsed_total', 'PDF files handled by the parser, by outcome', ['outcome']
+)
+ROWS = registry.counter(
+    'pipeline_rows_total', 'Rows produced by each processing stage', ['stage']
+)
+BYTES_WRITTEN = registry.counter(
+    'output_bytes_written_total', 'Bytes of output files and streamed exports', ['format']
+)
@@ -1,21 +1,249 @@
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import literal_name
 import pdfplumber
 import pandas as pd
 import re
+import os
 import logging
+import multiprocessing
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+from config import (
+    CACHE_FOLDER, PARSE_CACHE_MAX_BYTES, PDF_PARSE_MODE, PDF_PARSE_WORKERS,
+    PDF_SHARD_MIN_PAGES, PDF_SHARD_PAGES, PDF_PRESCAN_ENABLED, PDF_TEXT_BACKEND,
+    PDF_EXTRACTION_MODE, PDF_TABLE_REGION
+)
+from modules.cache import DiskCache
+from modules.log_utils import Truncated
+from modules.metrics import PDF_PAGES, PDF_FILES
+from modules.profiler import RequestProfiler
+from modules.text_backends import open_document
 
 logger = logging.getLogger(__name__)
 
+class PDFParseResult(NamedTuple):
+    """Outcome of parsing one PDF in a batch; exactly one of data and error is set"""
+    pdf_path: str
+    data: Optional[pd.DataFrame]
+    error: Optional[str]
+
 class PDFParser:
-    # Updated pattern to correctly capture entry number from GU6 number
-    ERROR_PATTERN = r'E1\s+F(\d{3})\s+([^G]+?)(?:GU6(\d+)\s+(\d+)\s+)?GU6\s+\d+'
+    # Bump whenever a change to the parsing code alters the extracted records
+    PARSER_VERSION = '3'
+
+    # Updated pattern to correctly capture entry number from GU6 number. The
+    # description is captured through a lookahead and back-reference, which
+    # consumes it atomically up to the first 'G' so failed matches never
+    # backtrack through it character by character.
+    ERROR_PATTERN = (
+        r'E1\s+F(?P<code>\d{3})\s+'
+        r'(?=(?P<description>[^G]+))(?P=description)'
+        r'(?:GU6(?P<entry>\d+)\s+(?P<line>\d+)\s+)?GU6\s+\d+'
+    )
+    RECORD_PATTERN = re.compile(ERROR_PATTERN)
+    # The start of a record up to its description, and the text that may still
+    # begin one when a page ends: a bare marker, or the entry columns after the
+    # description with digits or a filer code still to come
+    RECORD_PREFIX = re.compile(r'E1\s+F\d{3}\s+')
+    _PARTIAL_MARKER = re.compile(r'E1\s*\Z')
+    _PARTIAL_ENTRY = re.compile(r'GU6(?:\d+\s+(?:\d+\s+(?:GU6\s+)?)?|\s+)\Z')
+
+    # Word patterns for table-region extraction
+    ERROR_CODE_WORD = re.compile(r'F(\d{3})')
+    ENTRY_WORD = re.compile(r'GU6(\d*)')
+    LINE_NUMBER_WORD = re.compile(r'\d+')
+    TABLE_Y_TOLERANCE = 3
+
+    # Font types whose literal strings the pre-scan can read as plain text
+    PRESCAN_FONT_SUBTYPES = {'Type1', 'TrueType', 'MMType1'}
+    PRESCAN_ENCODINGS = {'StandardEncoding', 'WinAnsiEncoding', 'MacRomanEncoding'}
+
+    # Hex strings and inline images hide text from the pre-scan
+    _PRESCAN_UNSUPPORTED = re.compile(rb'<(?!<)[0-9A-Fa-f\s]*>|\bBI\s+/')
+    _ESCAPE_PATTERN = re.compile(rb'\\([0-7]{1,3}|.)', re.DOTALL)
+    _STRING_ESCAPES = {
+        b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+        b'\n': b'', b'\r': b''
+    }
+
+    # Parse results keyed by PDF contents, parser version, pattern, text backend and extraction mode
+    cache = DiskCache(os.path.join(CACHE_FOLDER, 'pdf'), PARSE_CACHE_MAX_BYTES)
 
     @staticmethod
-    def extract_error_data(pdf_path: str) -> pd.DataFrame:
+    def extract_error_data(pdf_path: str, use_cache: bool = True, backend: str = None) -> pd.DataFrame:
+        """
+        Extract error data from a CBP error report PDF, reusing cached results
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            use_cache (bool): Whether to read and populate the parse cache
+            backend (str): Text extraction backend, defaults to PDF_TEXT_BACKEND
+            
+        Returns:
+            pd.DataFrame: DataFrame containing extracted error data
+            
+        Raises:
+            ValueError: If no valid error records are found or if PDF parsing fails
+        """
+        backend = backend or PDF_TEXT_BACKEND
+        if not use_cache:
+            return PDFParser._parse_pdf(pdf_path, backend=backend)
+
+        cache_key, cached_df = PDFParser._get_cached(pdf_path, backend)
+        if cached_df is not None:
+            PDF_FILES.inc(outcome='cached')
+            return cached_df
+
+        df = PDFParser._parse_pdf(pdf_path, backend=backend)
+        PDFParser._count_parsed(df)
+        PDFParser.cache.put(cache_key, df)
+        return df
+
+    @staticmethod
+    def extract_many(pdf_paths: List[str], mode: str = None, workers: int = None,
+                     on_result: Callable[[PDFParseResult], None] = None) -> List[PDFParseResult]:
+        """
+        Extract error data from several PDFs, optionally in a process pool
+        
+        Cached files are answered in this process; only cache misses are sent to
+        the pool. A failure in one file is reported in its result and does not
+        affect the others.
+        
+        Args:
+            pdf_paths (List[str]): Paths to the PDF files
+            mode (str): 'process' or 'serial', defaults to PDF_PARSE_MODE
+            workers (int): Maximum worker processes, defaults to PDF_PARSE_WORKERS
+            on_result (Callable): Optional callback invoked with each result as
+                soon as that file has been parsed
+            
+        Returns:
+            List[PDFParseResult]: One result per input path, in input order
+        """
+        mode = mode or PDF_PARSE_MODE
+        if RequestProfiler.active():
+            # Work in worker processes would be missing from the profile
+            mode = 'serial'
+        workers = min(workers or PDF_PARSE_WORKERS, PDF_PARSE_WORKERS)
+        results = [None] * len(pdf_paths)
+        misses = []
+        
+        def finish(index: int, result: PDFParseResult) -> None:
+            results[index] = result
+            if on_result is not None:
+                on_result(result)
+        
+        for index, pdf_path in enumerate(pdf_paths):
+            try:
+                cache_key, cached_df = PDFParser._get_cached(pdf_path, PDF_TEXT_BACKEND)
+            except ValueError as e:
+                finish(index, PDFParseResult(pdf_path, None, str(e)))
+                continue
+            if cached_df is not None:
+                PDF_FILES.inc(outcome='cached')
+                finish(index, PDFParseResult(pdf_path, cached_df, None))
+            else:
+                misses.append((index, pdf_path, cache_key))
+        
+        def finish_miss(miss: tuple, parse) -> None:
+            index, pdf_path, cache_key = miss
+            try:
+                df, error = parse(), None
+            except Exception as e:
+                df, error = None, str(e)
+            if error is None:
+                PDFParser._count_parsed(df)
+                PDFParser.cache.put(cache_key, df)
+            else:
+                PDF_FILES.inc(outcome='failed')
+                logger.error(f"Error processing file {pdf_path}: {error}")
+            finish(index, PDFParseResult(pdf_path, df, error))
+        
+        if mode == 'process' and workers > 1 and len(misses) > 1:
+            logger.info(f"Parsing {len(misses)} PDFs with {min(workers, len(misses))} worker processes")
+            with PDFParser._process_pool(min(workers, len(misses))) as executor:
+                futures = [
+                    executor.submit(PDFParser._parse_pdf, pdf_path, False, PDF_TEXT_BACKEND)
+                    for _, pdf_path, _ in misses
+                ]
+                for miss, future in zip(misses, futures):
+                    finish_miss(miss, future.result)
+        else:
+            for miss in misses:
+                finish_miss(miss, lambda: PDFParser._parse_pdf(miss[1], backend=PDF_TEXT_BACKEND, workers=workers))
+        
+        return results
+
+    @staticmethod
+    def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+        """
+        Create a pool of freshly spawned worker processes
+        
+        The web server parses PDFs from job threads, and a forked child would
+        inherit locks held by the other threads at the time of the fork.
+        
+        Args:
+            max_workers (int): Number of worker processes
+            
+        Returns:
+            ProcessPoolExecutor: Pool that starts its workers with 'spawn'
+        """
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    @staticmethod
+    def _count_parsed(df: pd.DataFrame) -> None:
+        """Count a freshly parsed PDF and its pages"""
+        PDF_FILES.inc(outcome='parsed')
+        PDF_PAGES.inc(df.attrs.get('pages', 0))
+
+    @staticmethod
+    def _get_cached(pdf_path: str, backend: str) -> tuple:
+        """
+        Look up a PDF in the parse cache
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            backend (str): Text extraction backend the result was produced with
+            
+        Returns:
+            tuple: The cache key and the cached DataFrame, or None on a miss
+            
+        Raises:
+            ValueError: If the PDF cannot be read
+        """
+        try:
+            cache_key = DiskCache.make_key(
+                pdf_path, PDFParser.PARSER_VERSION, PDFParser.ERROR_PATTERN, backend,
+                PDF_EXTRACTION_MODE, PDF_TABLE_REGION
+            )
+        except OSError as e:
+            logger.exception(f"Error reading PDF: {str(e)}")
+            raise ValueError(f"Failed to parse PDF: {str(e)}")
+
+        cached_df = PDFParser.cache.get(cache_key)
+        if cached_df is not None:
+            logger.info(f"Parse cache hit for {pdf_path} ({len(cached_df)} records)")
+        else:
+            logger.info(f"Parse cache miss for {pdf_path}")
+        return cache_key, cached_df
+
+    @staticmethod
+    def _parse_pdf(pdf_path: str, shard: bool = True, backend: str = None, workers: int = None) -> pd.DataFrame:
         """
         Extract error data from a CBP error report PDF
         
+        In 'table' extraction mode records are read from the cropped table region
+        of each page with iter_table_records. Otherwise large reports are split
+        into page ranges that are extracted by separate worker processes. The
+        page texts are joined back in page order before matching, so records
+        spanning a page boundary are found exactly as in a serial parse.
+        
         Args:
             pdf_path (str): Path to the PDF file
+            shard (bool): Whether a large PDF may be split across worker processes
+            backend (str): Text extraction backend, defaults to PDF_TEXT_BACKEND
+            workers (int): Maximum worker processes for the shards, defaults to
+                and is capped at PDF_PARSE_WORKERS
             
         Returns:
             pd.DataFrame: DataFrame containing extracted error data
@@ -25,54 +253,541 @@ class PDFParser:
         """
         try:
             logger.debug(f"Opening PDF file: {pdf_path}")
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text()
-                    logger.debug(f"Page {page_num} text:\n{page_text}")
-                    text += page_text + "\n"
-            
-            # Log the full text for debugging
-            logger.debug("Full extracted text:")
-            logger.debug(text)
-            
-            # Find all error records using regex
-            matches = list(re.finditer(PDFParser.ERROR_PATTERN, text))
-            logger.debug(f"Found {len(matches)} matches")
-            
-            if not matches:
-                raise ValueError("No valid error records found in PDF")
+            stats = PDFParser._new_page_stats()
+            if PDF_EXTRACTION_MODE == 'table':
+                records = list(PDFParser.iter_table_records(pdf_path, stats))
+            else:
+                records = PDFParser._extract_text_records(pdf_path, shard, backend, stats, workers)
             
-            records = []
-            for match in matches:
-                error_code, error_desc, entry_number, line_number = match.groups()
-                logger.debug(f"Matched groups: {match.groups()}")
-                
-                # If entry_number is None, try to extract it from the last GU6 number
-                if entry_number is None:
-                    # Look for the last GU6 number in the error description
-                    last_gu6_match = re.search(r'GU6(\d+)(?:\s|$)', match.group(0))
-                    if last_gu6_match:
-                        entry_number = last_gu6_match.group(1)
-                
-                record = {
-                    'Error Code': f'F{error_code}',
-                    'Error Description': error_desc.strip(),
-                    'Filer Code': 'GU6',
-                    'Entry Number': entry_number.strip() if entry_number else '',
-                    '7501 Line Number': line_number.strip() if line_number else ''
-                }
-                logger.debug(f"Created record: {record}")
-                records.append(record)
+            logger.info(
+                f"Pre-scan skipped {stats['pages_skipped']} of {stats['pages']} pages "
+                f"({stats['prescan_inconclusive']} inconclusive)"
+            )
+            
+            if not records:
+                raise ValueError("No valid error records found in PDF")
             
             logger.info(f"Successfully found {len(records)} records")
-            logger.debug(f"All records: {records}")
-            return pd.DataFrame(records)
+            logger.debug("Records: %s", Truncated(records))
+            df = pd.DataFrame(records)
+            # Travels back from worker processes with the records, for the page metrics
+            df.attrs['pages'] = stats['pages']
+            return df
             
         except Exception as e:
             logger.exception(f"Error parsing PDF: {str(e)}")
             raise ValueError(f"Failed to parse PDF: {str(e)}")
 
+    @staticmethod
+    def _extract_text_records(pdf_path: str, shard: bool, backend: str, stats: dict,
+                              workers: int = None) -> List[dict]:
+        """
+        Match error records in the extracted text of a PDF, sharding large files
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            shard (bool): Whether a large PDF may be split across worker processes
+            backend (str): Text extraction backend, defaults to PDF_TEXT_BACKEND
+            stats (dict): Page counters to update
+            workers (int): Maximum worker processes for the shards, defaults to
+                and is capped at PDF_PARSE_WORKERS
+            
+        Returns:
+            List[dict]: Error records in document order
+        """
+        workers = min(workers or PDF_PARSE_WORKERS, PDF_PARSE_WORKERS)
+        with open_document(pdf_path, backend) as document:
+            page_count = document.page_count
+            shards = PDFParser._page_shards(page_count, workers) if shard else []
+            if len(shards) <= 1:
+                page_texts = PDFParser._iter_page_texts(document, 0, page_count, stats=stats)
+                return list(PDFParser._iter_records(page_texts, document.page_text, stats))
+        
+        logger.info(f"Extracting {page_count} pages of {pdf_path} in {len(shards)} shards")
+        with ExitStack() as stack:
+            executor = stack.enter_context(PDFParser._process_pool(min(workers, len(shards))))
+            futures = [
+                executor.submit(PDFParser._extract_page_range, pdf_path, start, stop, None, backend)
+                for start, stop in shards
+            ]
+            page_texts = (
+                text
+                for future in futures
+                for text in PDFParser._merge_shard(future.result(), stats)
+            )
+            # Skipped pages that continue a record are read here, opening the document at most once
+            opened = []
+            def fetch_page(page_num: int) -> str:
+                if not opened:
+                    opened.append(stack.enter_context(open_document(pdf_path, backend)))
+                return opened[0].page_text(page_num)
+            return list(PDFParser._iter_records(page_texts, fetch_page, stats))
+
+    @staticmethod
+    def iter_table_records(pdf_path: str, stats: dict = None) -> Iterator[dict]:
+        """
+        Stream error records from the error table region of each page
+        
+        Each page is cropped to PDF_TABLE_REGION and read as words with their
+        positions instead of laid-out text. Words are grouped into rows by their
+        top coordinate. A row holding an 'E1' marker followed by an F### code and
+        a GU6 entry word is a record: the description is every word positioned
+        between the code and the entry column, the line number is the first
+        number right of the entry. Descriptions may therefore contain any
+        characters, including 'G'. Rows without a marker whose words all sit in
+        the previous record's description column continue its description.
+        
+        When PDF_TABLE_REGION is configured, the last record of a page stays
+        open across the page break, so a description that wraps onto the next
+        page is continued by that page's first rows. A page following an open
+        record is then never skipped by the pre-scan, since its continuation
+        rows carry no marker. Without a table region the page header would be
+        read as a continuation, so records are closed at the end of each page.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            stats (dict): Optional dict that receives page and pre-scan counters
+            
+        Yields:
+            dict: One error record per table row, in document order
+        """
+        logger.debug(f"Reading table region of PDF file: {pdf_path}")
+        if stats is None:
+            stats = {}
+        stats.update(PDFParser._new_page_stats())
+        record = None
+        description_band = None
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_num, page in enumerate(pdf.pages):
+                stats['pages'] += 1
+                if PDF_PRESCAN_ENABLED:
+                    has_marker = PDFParser._prescan_page(page.page_obj)
+                    if has_marker is None:
+                        stats['prescan_inconclusive'] += 1
+                    if has_marker is False and record is None:
+                        stats['pages_skipped'] += 1
+                        continue
+                try:
+                    region = page.crop(PDF_TABLE_REGION) if PDF_TABLE_REGION else page
+                    words = region.extract_words()
+                finally:
+                    getattr(page, 'close', page.flush_cache)()
+                
+                for row in PDFParser._group_rows(words):
+                    parsed = PDFParser._parse_table_row(row)
+                    if parsed is not None:
+                        if record is not None:
+                            yield record
+                        record, description_band = parsed
+                    elif record is not None and all(
+                        description_band[0] <= word['x0'] and word['x1'] <= description_band[1]
+                        for word in row
+                    ):
+                        continuation = ' '.join(word['text'] for word in row)
+                        record['Error Description'] = f"{record['Error Description']} {continuation}".strip()
+                    elif record is not None:
+                        yield record
+                        record = None
+                
+                if record is not None and not PDF_TABLE_REGION:
+                    yield record
+                    record = None
+        if record is not None:
+            yield record
+
+    @staticmethod
+    def _group_rows(words: List[dict]) -> List[List[dict]]:
+        """
+        Group extracted words into table rows by their top coordinate
+        
+        Args:
+            words (List[dict]): pdfplumber words with x0, x1, top and text
+            
+        Returns:
+            List[List[dict]]: Rows from top to bottom, each sorted left to right
+        """
+        rows = []
+        for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+            if rows and word['top'] - rows[-1][0]['top'] <= PDFParser.TABLE_Y_TOLERANCE:
+                rows[-1].append(word)
+            else:
+                rows.append([word])
+        return [sorted(row, key=lambda w: w['x0']) for row in rows]
+
+    @staticmethod
+    def _parse_table_row(row: List[dict]) -> Optional[tuple]:
+        """
+        Assign the words of a table row to the error record columns
+        
+        Args:
+            row (List[dict]): Words of one row, sorted left to right
+            
+        Returns:
+            Optional[tuple]: The error record and the (x0, x1) span of its
+                description column, or None if the row does not start a record
+        """
+        texts = [word['text'] for word in row]
+        for index in range(len(row) - 1):
+            code_match = PDFParser.ERROR_CODE_WORD.fullmatch(texts[index + 1])
+            if texts[index] == 'E1' and code_match:
+                break
+        else:
+            return None
+        
+        code_word = row[index + 1]
+        entry_index = next(
+            (i for i in range(index + 2, len(row)) if PDFParser.ENTRY_WORD.fullmatch(texts[i])),
+            None
+        )
+        if entry_index is None:
+            return None
+        entry_word = row[entry_index]
+        
+        description = [
+            word['text'] for word in row
+            if word['x0'] >= code_word['x1'] and word['x1'] <= entry_word['x0']
+        ]
+        line_number = next(
+            (word['text'] for word in row[entry_index + 1:]
+             if word['x0'] >= entry_word['x1'] and PDFParser.LINE_NUMBER_WORD.fullmatch(word['text'])),
+            ''
+        )
+        entry_number = PDFParser.ENTRY_WORD.fullmatch(entry_word['text']).group(1)
+        record = {
+            'Error Code': f'F{code_match.group(1)}',
+            'Error Description': ' '.join(description),
+            'Filer Code': 'GU6',
+            'Entry Number': entry_number,
+            '7501 Line Number': line_number if entry_number else ''
+        }
+        return record, (code_word['x1'], entry_word['x0'])
+
+    @staticmethod
+    def iter_error_records(pdf_path: str, stats: dict = None, backend: str = None) -> Iterator[dict]:
+        """
+        Stream error records from a CBP error report PDF page by page
+        
+        Records are yielded as soon as the page that completes them has been
+        extracted. Only the unfinished tail of the previous page is kept between
+        pages, so memory use does not grow with the page count.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            stats (dict): Optional dict that receives page and pre-scan counters
+            backend (str): Text extraction backend, defaults to PDF_TEXT_BACKEND
+            
+        Yields:
+            dict: One error record per match, in document order
+        """
+        logger.debug(f"Streaming PDF file: {pdf_path}")
+        if stats is None:
+            stats = {}
+        stats.update(PDFParser._new_page_stats())
+        with open_document(pdf_path, backend) as document:
+            page_texts = PDFParser._iter_page_texts(document, 0, document.page_count, stats=stats)
+            yield from PDFParser._iter_records(page_texts, document.page_text, stats)
+
+    @staticmethod
+    def _new_page_stats() -> dict:
+        """Create the page counters filled in while parsing a document"""
+        return {'pages': 0, 'pages_skipped': 0, 'prescan_inconclusive': 0}
+
+    @staticmethod
+    def _iter_records(page_texts: Iterable[Optional[str]], fetch_page=None, stats: dict = None) -> Iterator[dict]:
+        """
+        Match error records across a sequence of page texts
+        
+        Produces the same records as matching ERROR_PATTERN against the pages
+        joined with newlines, for records that span at most one page break.
+        Every match in the buffer is complete because the buffer always ends
+        with a page-terminating newline, so only text after the last match,
+        from the first 'E1' marker on the last page that may still begin a
+        record, is carried to the next page. The carry is therefore never
+        longer than one page.
+        
+        A page given as None was skipped by the pre-scan. That is only safe when
+        nothing is carried over, since the page could hold the end of a record
+        started earlier; otherwise the page is fetched with fetch_page.
+        
+        Args:
+            page_texts (Iterable[Optional[str]]): Text of each page in page order
+            fetch_page: Callable returning the full text of a page by index
+            stats (dict): Optional page counters to update
+            
+        Yields:
+            dict: One error record per match, in document order
+        """
+        pattern = PDFParser.RECORD_PATTERN
+        carry = ""
+        for page_num, page_text in enumerate(page_texts):
+            if stats is not None:
+                stats['pages'] += 1
+            if page_text is None:
+                if not carry or fetch_page is None:
+                    if stats is not None:
+                        stats['pages_skipped'] += 1
+                    continue
+                logger.debug("Page %d may continue a record, extracting it fully", page_num + 1)
+                page_text = fetch_page(page_num)
+            
+            buffer = carry + page_text + "\n"
+            tail_start = 0
+            for match in pattern.finditer(buffer):
+                yield PDFParser._build_record(match)
+                tail_start = match.end()
+            
+            # Markers carried from the previous page had their chance on this one
+            marker = PDFParser._carry_start(buffer, max(tail_start, len(carry)))
+            carry = buffer[marker:] if marker != -1 else ""
+
+    @staticmethod
+    def _carry_start(buffer: str, start: int) -> int:
+        """
+        Find the first 'E1' marker that may still begin a record on the next page
+        
+        The buffer holds no complete record after start. A marker can only
+        begin one later if the buffer ends before the record is decided: right
+        after the marker or error code, inside the description (which runs to
+        the first 'G'), or inside the entry columns that follow it. Any other
+        marker, such as one in running text, can never match and is dropped.
+        
+        Args:
+            buffer (str): Page text ending with a page-terminating newline
+            start (int): Index to search from
+            
+        Returns:
+            int: Index of the first such marker, or -1 if there is none
+        """
+        marker = buffer.find('E1', start)
+        while marker != -1:
+            prefix = PDFParser.RECORD_PREFIX.match(buffer, marker)
+            if prefix is None:
+                if PDFParser._PARTIAL_MARKER.match(buffer, marker):
+                    return marker
+            else:
+                entry_start = buffer.find('G', prefix.end())
+                if entry_start == -1 or PDFParser._PARTIAL_ENTRY.match(buffer, entry_start):
+                    return marker
+            marker = buffer.find('E1', marker + 1)
+        return -1
+
+    @staticmethod
+    def _build_record(match: re.Match) -> dict:
+        """
+        Build an error record from a RECORD_PATTERN match
+        
+        Args:
+            match (re.Match): Match of RECORD_PATTERN
+            
+        Returns:
+            dict: Error record keyed by output column name
+        """
+        error_code, error_desc, entry_number, line_number = match.group('code', 'description', 'entry', 'line')
+        record = {
+            'Error Code': f'F{error_code}',
+            'Error Description': error_desc.strip(),
+            'Filer Code': 'GU6',
+            'Entry Number': entry_number or '',
+            '7501 Line Number': line_number or ''
+        }
+        return record
+
+    @staticmethod
+    def _page_shards(page_count: int, workers: int = None) -> List[tuple]:
+        """
+        Split a document into contiguous page ranges for parallel extraction
+        
+        Args:
+            page_count (int): Number of pages in the document
+            workers (int): Worker processes the ranges are spread over,
+                defaults to PDF_PARSE_WORKERS
+            
+        Returns:
+            List[tuple]: (start, stop) page ranges in page order; a single range
+                when the document is too small to be worth sharding
+        """
+        workers = workers or PDF_PARSE_WORKERS
+        if page_count < PDF_SHARD_MIN_PAGES or workers <= 1:
+            return [(0, page_count)]
+        
+        shard_size = max(PDF_SHARD_PAGES, -(-page_count // workers))
+        return [
+            (start, min(start + shard_size, page_count))
+            for start in range(0, page_count, shard_size)
+        ]
+
+    @staticmethod
+    def _extract_page_range(pdf_path: str, start: int, stop: int, prescan: bool = None, backend: str = None) -> tuple:
+        """
+        Extract the text of a page range in a worker process
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            start (int): Index of the first page to extract
+            stop (int): Index one past the last page to extract
+            prescan (bool): Whether to skip pages without error markers,
+                defaults to PDF_PRESCAN_ENABLED
+            backend (str): Text extraction backend, defaults to PDF_TEXT_BACKEND
+            
+        Returns:
+            tuple: Text of each page in the range (None for skipped pages) and
+                the number of pages the pre-scan could not decide
+        """
+        stats = PDFParser._new_page_stats()
+        with open_document(pdf_path, backend) as document:
+            page_texts = list(PDFParser._iter_page_texts(document, start, stop, prescan, stats))
+        return page_texts, stats['prescan_inconclusive']
+
+    @staticmethod
+    def _merge_shard(shard_result: tuple, stats: dict) -> List[Optional[str]]:
+        """Record a shard's pre-scan counters and return its page texts"""
+        page_texts, inconclusive = shard_result
+        stats['prescan_inconclusive'] += inconclusive
+        return page_texts
+
+    @staticmethod
+    def _iter_page_texts(document, start: int, stop: int, prescan: bool = None, stats: dict = None) -> Iterator[Optional[str]]:
+        """
+        Extract the text of a page range from an open document
+        
+        Pages whose content streams show no error marker are not laid out at all
+        and are yielded as None.
+        
+        Args:
+            document (TextDocument): Document opened with a text backend
+            start (int): Index of the first page to extract
+            stop (int): Index one past the last page to extract
+            prescan (bool): Whether to skip pages without error markers,
+                defaults to PDF_PRESCAN_ENABLED
+            stats (dict): Optional page counters to update
+            
+        Yields:
+            Optional[str]: Text of each page in the range, or None if skipped
+        """
+        if prescan is None:
+            prescan = PDF_PRESCAN_ENABLED
+        for page_num in range(start, stop):
+            if prescan:
+                has_marker = PDFParser._prescan_page(document.raw_page(page_num))
+                if has_marker is None and stats is not None:
+                    stats['prescan_inconclusive'] += 1
+                if has_marker is False:
+                    logger.debug("Page %d has no error markers, skipping extraction", page_num + 1)
+                    yield None
+                    continue
+            page_text = document.page_text(page_num)
+            logger.debug("Page %d text:\n%s", page_num + 1, Truncated(page_text))
+            yield page_text
+
+    @staticmethod
+    def _prescan_page(page_obj) -> Optional[bool]:
+        """
+        Check a page's raw content streams for the 'E1' error marker
+        
+        Only text drawn from literal strings in simple, standard-encoded fonts
+        can be read this way. Pages using hex strings, composite or Type 3 fonts,
+        custom encodings, form XObjects or inline images, or whose streams
+        cannot be decoded, are reported as inconclusive.
+        
+        Args:
+            page_obj: pdfminer page
+            
+        Returns:
+            Optional[bool]: True if the marker may be present, False if it is
+                definitely absent, None if the pre-scan cannot tell
+        """
+        try:
+            resources = resolve1(page_obj.resources) or {}
+            
+            for font in (resolve1(resources.get('Font')) or {}).values():
+                if not PDFParser._prescan_font_readable(resolve1(font)):
+                    return None
+            
+            for xobject in (resolve1(resources.get('XObject')) or {}).values():
+                if literal_name(resolve1(xobject).get('Subtype')) != 'Image':
+                    return None
+            
+            contents = page_obj.contents if isinstance(page_obj.contents, list) else [page_obj.contents]
+            data = b"".join(resolve1(stream).get_data() for stream in contents if stream is not None)
+        except Exception as e:
+            logger.debug(f"Pre-scan could not read page content: {str(e)}")
+            return None
+        
+        strings = PDFParser._content_strings(data)
+        if strings is None:
+            return None
+        return b'E1' in strings
+
+    @staticmethod
+    def _prescan_font_readable(font: dict) -> bool:
+        """
+        Check whether a font's string bytes are plain ASCII character codes
+        
+        Args:
+            font (dict): Resolved PDF font dictionary
+            
+        Returns:
+            bool: True for simple fonts using a standard encoding, or no encoding
+                and no embedded font program, and no ToUnicode map
+        """
+        if literal_name(font.get('Subtype')) not in PDFParser.PRESCAN_FONT_SUBTYPES:
+            return False
+        if 'ToUnicode' in font:
+            return False
+        
+        encoding = resolve1(font.get('Encoding'))
+        if encoding is not None:
+            return literal_name(encoding) in PDFParser.PRESCAN_ENCODINGS
+        
+        descriptor = resolve1(font.get('FontDescriptor')) or {}
+        return not any(key in descriptor for key in ('FontFile', 'FontFile2', 'FontFile3'))
+
+    @staticmethod
+    def _content_strings(data: bytes) -> Optional[bytes]:
+        """
+        Concatenate the decoded literal strings of a content stream
+        
+        Args:
+            data (bytes): Decoded content stream
+            
+        Returns:
+            Optional[bytes]: Joined string bytes, or None if the stream draws
+                text the pre-scan cannot decode
+        """
+        if PDFParser._PRESCAN_UNSUPPORTED.search(data):
+            return None
+        
+        strings = []
+        position = data.find(b'(')
+        while position != -1:
+            depth = 1
+            index = position + 1
+            while index < len(data) and depth:
+                char = data[index]
+                if char == 0x5C:  # Backslash escapes the next byte
+                    index += 2
+                    continue
+                if char == 0x28:
+                    depth += 1
+                elif char == 0x29:
+                    depth -= 1
+                index += 1
+            if depth:
+                return None
+            strings.append(PDFParser._unescape_string(data[position + 1:index - 1]))
+            position = data.find(b'(', index)
+        return b"".join(strings)
+
+    @staticmethod
+    def _unescape_string(raw: bytes) -> bytes:
+        """Decode the escape sequences of a PDF literal string"""
+        def replace(match):
+            escaped = match.group(1)
+            if escaped[0] in b'01234567':
+                return bytes([int(escaped, 8) & 0xFF])
+            return PDFParser._STRING_ESCAPES.get(escaped, escaped)
+        return PDFParser._ESCAPE_PATTERN.sub(replace, raw)
+
     @staticmethod
     def combine_pdf_data(dataframes: list) -> pd.DataFrame:
         """
@@ -0,0 +1,250 @@
+import os
+import hashlib
+import logging
+import pandas as pd
+from typing import Callable, List, Optional
+from config import (
+    CACHE_FOLDER, RESULT_MEMO_LIMIT, MATCH_CACHE_MAX_BYTES, INCREMENTAL_MATCH, MATCH_STRATEGY, ENTRY_NUMBER_ALIASES, IMPORT_READ_MODE, IMPORT_COLUMNS,
+    PDF_TEXT_BACKEND, PDF_EXTRACTION_MODE, PDF_TABLE_REGION, OUTPUT_WRITE_MODE
+)
+from modules.cache import DiskCache
+from modules.result_store import ResultStore
+from modules.pdf_parser import PDFParser
+from modules.excel_parser import ExcelParser
+from modules.matcher import Matcher
+from modules.file_handler import FileHandler
+from modules.metrics import registry, STAGE_SECONDS, ROWS, BYTES_WRITTEN
+
+logger = logging.getLogger(__name__)
+
+class Pipeline:
+    # Processing stages, in the order they run
+    STAGES = ['parse_pdfs', 'read_import', 'match', 'write_output']
+    # Bump when the output for the same inputs and settings changes
+    RESULT_VERSION = '1'
+    # Output files already produced, keyed by input fingerprint
+    results = ResultStore(os.path.join(CACHE_FOLDER, 'results', 'index.db'), RESULT_MEMO_LIMIT)
+    # Matched rows of each error report PDF against an import workbook
+    matched = DiskCache(os.path.join(CACHE_FOLDER, 'matched'), MATCH_CACHE_MAX_BYTES)
+
+    @staticmethod
+    def _match_settings() -> list:
+        """Settings that change which rows are matched for the same input files"""
+        return [
+            Pipeline.RESULT_VERSION,
+            PDFParser.PARSER_VERSION, PDFParser.ERROR_PATTERN, PDF_TEXT_BACKEND, PDF_EXTRACTION_MODE, PDF_TABLE_REGION,
+            ExcelParser.PARSER_VERSION, ExcelParser.COLUMN_MAPPINGS, ExcelParser.DATE_COLUMNS,
+            IMPORT_READ_MODE, IMPORT_COLUMNS,
+            MATCH_STRATEGY, sorted(ENTRY_NUMBER_ALIASES.items())
+        ]
+
+    @staticmethod
+    def fingerprint(pdf_paths: List[str], excel_path: str) -> str:
+        """
+        Identify a processing run by its input files and the settings that shape its output
+        
+        PDFs are hashed in upload order, since the order of the output rows
+        follows it.
+        
+        Args:
+            pdf_paths (List[str]): Paths to the uploaded CBP error report PDFs
+            excel_path (str): Path to the uploaded import record Excel file
+            
+        Returns:
+            str: Hex digest of the file contents and settings
+        """
+        digest = hashlib.sha256()
+        parts = [DiskCache.hash_file(pdf_path) for pdf_path in pdf_paths]
+        parts += [DiskCache.hash_file(excel_path), OUTPUT_WRITE_MODE] + Pipeline._match_settings()
+        for part in parts:
+            digest.update(str(part).encode() + b'\0')
+        return digest.hexdigest()
+
+    @staticmethod
+    def run(pdf_paths: List[str], excel_path: str, progress: Callable[..., None] = None) -> dict:
+        """
+        Parse error PDFs, match them against the import records and write the output file
+        
+        If the same files were already processed with the same settings and that
+        output file is still around, it is returned without running any stage.
+
+        Args:
+            pdf_paths (List[str]): Paths to the uploaded CBP error report PDFs
+            excel_path (str): Path to the uploaded import record Excel file
+            progress (Callable): Optional callback receiving the current stage and
+                progress counters as keyword arguments
+
+        Returns:
+            dict: Matched record count, the output file name and path, and whether
+                the output was reused
+
+        Raises:
+            ValueError: If any stage fails
+        """
+        if progress is None:
+            progress = lambda **fields: None
+
+        try:
+            fingerprint = Pipeline.fingerprint(pdf_paths, excel_path)
+        except OSError as e:
+            raise ValueError(f"Failed to read uploaded files: {str(e)}")
+        result = Pipeline.results.get(fingerprint)
+        if result is not None:
+            logger.info(f"Reusing {result['output_file']} produced from the same inputs")
+            progress(stage='write_output', memoized=True)
+            return {**result, 'memoized': True}
+
+        formatted_df = Pipeline.match(pdf_paths, excel_path, progress)
+
+        # Generate output file
+        progress(stage='write_output')
+        with STAGE_SECONDS.time(stage='write_output'):
+            output_path = FileHandler.generate_output_file(formatted_df)
+        bytes_written = os.path.getsize(output_path)
+        ROWS.inc(len(formatted_df), stage='write_output')
+        BYTES_WRITTEN.inc(bytes_written, format='xlsx')
+        progress(bytes_written=bytes_written)
+
+        logger.info(f"Pipeline finished with {len(formatted_df)} matched records")
+        result = {
+            'matched_records': len(formatted_df),
+            'output_file': os.path.basename(output_path),
+            'output_path': output_path
+        }
+        recorded = Pipeline.results.put(fingerprint, result)
+        if recorded is not result:
+            logger.info(f"Reusing {recorded['output_file']} recorded by a concurrent run")
+        return {**recorded, 'memoized': recorded is not result}
+
+    @staticmethod
+    def match(pdf_paths: List[str], excel_path: str, progress: Callable[..., None] = None,
+              workers: int = None) -> pd.DataFrame:
+        """
+        Run every stage except writing the output file
+        
+        Each PDF's matched rows are cached against the import workbook, so when
+        reports are added to an already processed batch only the new PDFs are
+        parsed and matched; the rows of the others are reused in upload order.
+
+        Args:
+            pdf_paths (List[str]): Paths to the uploaded CBP error report PDFs
+            excel_path (str): Path to the uploaded import record Excel file
+            progress (Callable): Optional progress callback, as for run
+            workers (int): Maximum PDF parsing processes, defaults to PDF_PARSE_WORKERS
+
+        Returns:
+            pd.DataFrame: Matched records formatted for output
+
+        Raises:
+            ValueError: If any stage fails
+        """
+        if progress is None:
+            progress = lambda **fields: None
+
+        matched_dataframes = [None] * len(pdf_paths)
+        match_keys = Pipeline._match_keys(pdf_paths, excel_path)
+        if match_keys is not None:
+            for position, match_key in enumerate(match_keys):
+                matched_dataframes[position] = Pipeline.matched.get(match_key)
+        pending = [position for position, matched_df in enumerate(matched_dataframes) if matched_df is None]
+        if len(pending) < len(pdf_paths):
+            logger.info(f"Reusing matched records of {len(pdf_paths) - len(pending)} of {len(pdf_paths)} PDFs")
+
+        # Process PDFs
+        progress(stage='parse_pdfs', files_total=len(pdf_paths), files_parsed=len(pdf_paths) - len(pending))
+        files_parsed = len(pdf_paths) - len(pending)
+
+        def on_result(result):
+            nonlocal files_parsed
+            files_parsed += 1
+            progress(files_parsed=files_parsed)
+
+        error_dataframes = []
+        with STAGE_SECONDS.time(stage='parse_pdfs'):
+            results = PDFParser.extract_many(
+                [pdf_paths[position] for position in pending], workers=workers, on_result=on_result
+            )
+        for result in results:
+            if result.error is not None:
+                raise ValueError(f"Error in file {os.path.basename(result.pdf_path)}: {result.error}")
+            error_dataframes.append(result.data)
+        error_records = sum(len(error_df) for error_df in error_dataframes)
+        ROWS.inc(error_records, stage='parse_pdfs')
+        progress(error_records=error_records)
+
+        if pending:
+            # Process Excel
+            progress(stage='read_import')
+            index = None
+            with STAGE_SECONDS.time(stage='read_import'):
+                if MATCH_STRATEGY == 'index':
+                    import_df, index = ExcelParser.load_import(excel_path)
+                elif MATCH_STRATEGY == 'pushdown':
+                    # Only the import records that an error can match are needed
+                    error_df = PDFParser.combine_pdf_data(error_dataframes)
+                    import_df = ExcelParser.read_import_file(excel_path, keys=Matcher.error_keys(error_df))
+                else:
+                    import_df = ExcelParser.read_import_file(excel_path)
+            ROWS.inc(len(import_df), stage='read_import')
+            progress(import_records=len(import_df))
+
+            # Match records
+            progress(stage='match')
+            with STAGE_SECONDS.time(stage='match'):
+                for position, error_df in zip(pending, error_dataframes):
+                    matched_df = Matcher.match_records(error_df, import_df, index)
+                    if match_keys is not None:
+                        Pipeline.matched.put(match_keys[position], matched_df)
+                    matched_dataframes[position] = matched_df
+
+        # Empty frames would not add rows, but can change the combined column types
+        non_empty = [matched_df for matched_df in matched_dataframes if len(matched_df)]
+        with STAGE_SECONDS.time(stage='format_output'):
+            matched_df = pd.concat(non_empty or matched_dataframes[:1], ignore_index=True)
+            formatted_df = Matcher.format_output(matched_df)
+        ROWS.inc(len(formatted_df), stage='match')
+        progress(rows_matched=len(formatted_df))
+        return formatted_df
+
+    @staticmethod
+    def cache_metrics() -> list:
+        """Report the counters and sizes of the pipeline's caches as metric families"""
+        caches = {
+            'pdf': PDFParser.cache.stats(),
+            'import': ExcelParser.cache.stats(),
+            'matched': Pipeline.matched.stats(),
+            'result': Pipeline.results.stats()
+        }
+        return [
+            ('cache_hits_total', 'counter', 'Cache lookups answered from the cache',
+             [({'cache': name}, stats['hits']) for name, stats in caches.items()]),
+            ('cache_misses_total', 'counter', 'Cache lookups that found no usable entry',
+             [({'cache': name}, stats['misses']) for name, stats in caches.items()]),
+            ('cache_entries', 'gauge', 'Entries currently stored in each cache',
+             [({'cache': name}, stats['entries']) for name, stats in caches.items()]),
+            ('cache_bytes', 'gauge', 'Bytes currently stored in each on-disk cache',
+             [({'cache': name}, stats['bytes']) for name, stats in caches.items() if 'bytes' in stats])
+        ]
+
+    @staticmethod
+    def _match_keys(pdf_paths: List[str], excel_path: str) -> Optional[List[str]]:
+        """
+        Build the matched-rows cache key of each PDF
+        
+        Returns:
+            Optional[List[str]]: One key per PDF, or None when incremental
+                matching is off
+            
+        Raises:
+            ValueError: If an uploaded file cannot be read
+        """
+        if not INCREMENTAL_MATCH:
+            return None
+        try:
+            import_hash = DiskCache.hash_file(excel_path)
+            settings = Pipeline._match_settings()
+            return [DiskCache.make_key(pdf_path, import_hash, *settings) for pdf_path in pdf_paths]
+        except OSError as e:
+            raise ValueError(f"Failed to read uploaded files: {str(e)}")
+
+registry.add_collector(Pipeline.cache_metrics)
@@ -0,0 +1,96 @@
+import io
+import os
+import hmac
+import uuid
+import pstats
+import cProfile
+import logging
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from config import UPLOAD_FOLDER, PROFILING_ENABLED, PROFILE_ADMIN_TOKEN, PROFILE_SUMMARY_LINES
+
+logger = logging.getLogger(__name__)
+
+class RequestProfiler:
+    # Request header carrying the admin token that turns profiling on
+    HEADER = 'X-Profile'
+    # Response header naming the saved profile
+    RESULT_HEADER = 'X-Profile-File'
+
+    _local = threading.local()
+
+    @staticmethod
+    def requested(token: Optional[str]) -> bool:
+        """
+        Check whether a request asked for profiling with a valid admin token
+
+        Args:
+            token (Optional[str]): Value of the profiling request header
+
+        Returns:
+            bool: True if profiling is enabled and the token matches
+        """
+        if not token or not PROFILING_ENABLED or not PROFILE_ADMIN_TOKEN:
+            return False
+        if hmac.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode()):
+            return True
+        logger.warning("Ignoring profiling request with an invalid token")
+        return False
+
+    @staticmethod
+    def active() -> bool:
+        """Whether the current thread is being profiled"""
+        return getattr(RequestProfiler._local, 'active', False)
+
+    @staticmethod
+    @contextmanager
+    def profile(name: str) -> Iterator[dict]:
+        """
+        Profile the block with cProfile and save the result to the upload folder
+
+        Two files are written: the raw profile, for pstats or snakeviz, and a
+        text summary of the most expensive functions by cumulative and by own
+        time. Only the calling thread is profiled.
+
+        Args:
+            name (str): Name of the profiled operation, used in the file names
+
+        Yields:
+            dict: Filled in on exit with 'profile_file' and 'summary_file', the
+                names of the saved files
+        """
+        artifact = {}
+        profiler = cProfile.Profile()
+        RequestProfiler._local.active = True
+        profiler.enable()
+        try:
+            yield artifact
+        finally:
+            profiler.disable()
+            RequestProfiler._local.active = False
+            artifact.update(RequestProfiler._save(profiler, name))
+
+    @staticmethod
+    def _save(profiler: cProfile.Profile, name: str) -> dict:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base_name = f"profile_{name}_{timestamp}_{uuid.uuid4().hex[:8]}"
+        profile_path = os.path.join(UPLOAD_FOLDER, f"{base_name}.prof")
+        summary_path = os.path.join(UPLOAD_FOLDER, f"{base_name}.txt")
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        profiler.dump_stats(profile_path)
+
+        summary = io.StringIO()
+        stats = pstats.Stats(profiler, stream=summary)
+        for sort_key in ('cumulative', 'tottime'):
+            summary.write(f"Top {PROFILE_SUMMARY_LINES} functions by {sort_key} time\n")
+            stats.sort_stats(sort_key).print_stats(PROFILE_SUMMARY_LINES)
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+
+        logger.info(f"Saved profile of {name} to {os.path.basename(profile_path)}")
+        return {
+            'profile_file': os.path.basename(profile_path),
+            'summary_file': os.path.basename(summary_path)
+        }
@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Optional
+from modules.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+class ResultStore(SQLiteStore):
+    """
+    Index of generated output files keyed by a fingerprint of their inputs
+
+    The index is a SQLite table mapping each fingerprint to the output it
+    produced, so worker processes sharing the output folder never overwrite
+    each other's entries. Entries whose output file has been deleted are
+    dropped on lookup, and once more than max_entries are recorded the least
+    recently used entries are removed together with their output files.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            fingerprint TEXT PRIMARY KEY,
+            result TEXT NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used);
+    """
+
+    def __init__(self, db_path: str, max_entries: int):
+        super().__init__(db_path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[dict]:
+        """
+        Look up the output produced for a fingerprint
+
+        Args:
+            fingerprint (str): Input fingerprint
+
+        Returns:
+            Optional[dict]: The stored result, or None if there is none or its
+                output file no longer exists
+        """
+        if self.max_entries <= 0:
+            return None
+        with self._transaction() as connection:
+            row = connection.execute(
+                'SELECT result FROM results WHERE fingerprint = ?', (fingerprint,)
+            ).fetchone()
+            result = json.loads(row[0]) if row is not None else None
+            if result is not None and not os.path.exists(result['output_path']):
+                logger.info(f"Memoized output {result['output_file']} is gone, dropping it")
+                connection.execute('DELETE FROM results WHERE fingerprint = ?', (fingerprint,))
+                result = None
+            if result is not None:
+                connection.execute(
+                    'UPDATE results SET last_used = ? WHERE fingerprint = ?', (time.time(), fingerprint)
+                )
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def put(self, fingerprint: str, result: dict) -> dict:
+        """
+        Record the output produced for a fingerprint and evict old entries
+
+        When identical runs finish concurrently, the first recorded output is
+        kept and the output file of every later run is deleted, so no output
+        file is left behind without an entry.
+
+        Args:
+            fingerprint (str): Input fingerprint
+            result (dict): Pipeline result with the output file name and path
+
+        Returns:
+            dict: The result recorded for the fingerprint, which is another
+                run's result if that run recorded its output first
+        """
+        if self.max_entries <= 0:
+            return result
+        with self._transaction() as connection:
+            row = connection.execute(
+                'SELECT result FROM results WHERE fingerprint = ?', (fingerprint,)
+            ).fetchone()
+            recorded = json.loads(row[0]) if row is not None else None
+            if recorded is not None and os.path.exists(recorded['output_path']):
+                connection.execute(
+                    'UPDATE results SET last_used = ? WHERE fingerprint = ?', (time.time(), fingerprint)
+                )
+                removed = []
+                if recorded['output_path'] != result['output_path']:
+                    removed.append((fingerprint, json.dumps(result)))
+            else:
+                recorded = result
+                connection.execute(
+                    'INSERT OR REPLACE INTO results (fingerprint, result, last_used) VALUES (?, ?, ?)',
+                    (fingerprint, json.dumps(result), time.time())
+                )
+                removed = connection.execute(
+                    'SELECT fingerprint, result FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?',
+                    (self.max_entries,)
+                ).fetchall()
+                connection.executemany(
+                    'DELETE FROM results WHERE fingerprint = ?', [(key,) for key, _ in removed]
+                )
+
+        for _, removed_result in removed:
+            removed_result = json.loads(removed_result)
+            logger.debug(f"Removing output {removed_result['output_file']}")
+            try:
+                os.unlink(removed_result['output_path'])
+            except FileNotFoundError:
+                pass
+        return recorded
+
+    def stats(self) -> dict:
+        """
+        Report lookup counters and the number of recorded results
+
+        Returns:
+            dict: Hit and miss counts, kept per process, and the entry count
+        """
+        entries = 0
+        if self.max_entries > 0:
+            with self._transaction(write=False) as connection:
+                entries = connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries
+            }
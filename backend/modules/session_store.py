@@ -0,0 +1,126 @@
+import time
+import secrets
+import logging
+from typing import List, Optional
+from modules.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+class SessionStore(SQLiteStore):
+    """
+    Uploaded files of each client session, kept in a SQLite database
+
+    Sessions not seen for max_age seconds are removed whenever a new session
+    is created.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            last_seen REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS uploads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+            kind TEXT NOT NULL,
+            path TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS uploads_session ON uploads(session_id, kind);
+    """
+
+    def __init__(self, db_path: str, max_age: int):
+        super().__init__(db_path)
+        self.max_age = max_age
+
+    def create(self) -> str:
+        """
+        Start a new session and purge expired ones
+
+        Returns:
+            str: Unguessable session ID
+        """
+        session_id = secrets.token_urlsafe(24)
+        now = time.time()
+        with self._transaction() as connection:
+            expired = connection.execute('DELETE FROM sessions WHERE last_seen < ?', (now - self.max_age,)).rowcount
+            connection.execute('INSERT INTO sessions (id, last_seen) VALUES (?, ?)', (session_id, now))
+        if expired:
+            logger.info(f"Removed {expired} expired upload sessions")
+        return session_id
+
+    def touch(self, session_id: Optional[str]) -> bool:
+        """
+        Mark a session as active
+
+        Args:
+            session_id (Optional[str]): Session ID sent by the client
+
+        Returns:
+            bool: False if the session does not exist or has expired
+        """
+        if not session_id:
+            return False
+        now = time.time()
+        with self._transaction() as connection:
+            updated = connection.execute(
+                'UPDATE sessions SET last_seen = ? WHERE id = ? AND last_seen >= ?',
+                (now, session_id, now - self.max_age)
+            ).rowcount
+        return updated > 0
+
+    def add_pdfs(self, session_id: str, paths: List[str]) -> None:
+        """
+        Append uploaded PDFs to a session
+
+        Args:
+            session_id (str): Session ID
+            paths (List[str]): Paths of the saved PDF files, in upload order
+        """
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO uploads (session_id, kind, path) VALUES (?, 'pdf', ?)",
+                [(session_id, path) for path in paths]
+            )
+
+    def set_excel(self, session_id: str, path: str) -> None:
+        """
+        Replace the import record file of a session
+
+        Args:
+            session_id (str): Session ID
+            path (str): Path of the saved Excel file
+        """
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM uploads WHERE session_id = ? AND kind = 'excel'", (session_id,))
+            connection.execute(
+                "INSERT INTO uploads (session_id, kind, path) VALUES (?, 'excel', ?)", (session_id, path)
+            )
+
+    def get(self, session_id: str) -> dict:
+        """
+        Read the files uploaded in a session
+
+        Args:
+            session_id (str): Session ID
+
+        Returns:
+            dict: 'pdfs' with the PDF paths in upload order and 'excel' with the
+                import record file path, or None
+        """
+        with self._transaction(write=False) as connection:
+            rows = connection.execute(
+                'SELECT kind, path FROM uploads WHERE session_id = ? ORDER BY id', (session_id,)
+            ).fetchall()
+        return {
+            'pdfs': [path for kind, path in rows if kind == 'pdf'],
+            'excel': next((path for kind, path in rows if kind == 'excel'), None)
+        }
+
+    def clear(self, session_id: str) -> None:
+        """
+        Forget every file uploaded in a session
+
+        Args:
+            session_id (str): Session ID
+        """
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM uploads WHERE session_id = ?', (session_id,))
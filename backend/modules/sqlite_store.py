@@ -0,0 +1,45 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator
+
+class SQLiteStore:
+    """
+    State shared by every thread and worker process through a SQLite database
+
+    Every operation opens its own connection and runs in a single transaction,
+    so any number of threads and worker processes on the same machine can
+    share the store. Subclasses define their tables in SCHEMA, which is applied
+    on first use.
+    """
+    SCHEMA = ""
+    # Seconds to wait for another writer before giving up
+    LOCK_TIMEOUT = 30
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._initialized = False
+
+    @contextmanager
+    def _transaction(self, write: bool = True) -> Iterator[sqlite3.Connection]:
+        """Open a connection and run the block in one transaction"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=self.LOCK_TIMEOUT, isolation_level=None)
+        try:
+            connection.execute('PRAGMA foreign_keys = ON')
+            if not self._initialized:
+                # WAL lets readers proceed while another process writes
+                connection.execute('PRAGMA journal_mode = WAL')
+                connection.executescript(self.SCHEMA)
+                self._initialized = True
+            # Writers take the lock up front instead of failing to upgrade a read lock
+            connection.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+            try:
+                yield connection
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
@@ -0,0 +1,167 @@
+import pdfplumber
+import logging
+from abc import ABC, abstractmethod
+from pdfminer.pdfparser import PDFParser as PDFMinerParser
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.utils import apply_matrix_pt
+from config import PDF_TEXT_BACKEND
+
+logger = logging.getLogger(__name__)
+
+class TextDocument(ABC):
+    """
+    An open PDF that PDFParser reads page by page
+
+    Subclasses expose the page count, the underlying pdfminer page (used by the
+    content-stream pre-scan) and the extracted text of each page.
+    """
+    page_count = 0
+
+    @abstractmethod
+    def raw_page(self, page_num: int) -> PDFPage:
+        """Return the pdfminer page object for a page index"""
+
+    @abstractmethod
+    def page_text(self, page_num: int) -> str:
+        """Extract the text of a page, one line per text row"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the open file and any cached page data"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class PDFPlumberDocument(TextDocument):
+    """Layout-based extraction with pdfplumber's extract_text"""
+    def __init__(self, pdf_path: str):
+        self._pdf = pdfplumber.open(pdf_path)
+        self.page_count = len(self._pdf.pages)
+
+    def raw_page(self, page_num: int) -> PDFPage:
+        return self._pdf.pages[page_num].page_obj
+
+    def page_text(self, page_num: int) -> str:
+        page = self._pdf.pages[page_num]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # Release the page's layout objects; older pdfplumber releases only offer flush_cache
+            getattr(page, 'close', page.flush_cache)()
+
+    def close(self) -> None:
+        self._pdf.close()
+
+class LayoutFreeTextDevice(PDFTextDevice):
+    """
+    pdfminer device that writes characters in content-stream order
+
+    No layout analysis is done: a new line starts whenever the baseline moves by
+    more than Y_TOLERANCE, and a single space separates runs of text that are
+    split by whitespace characters or by a gap wider than X_TOLERANCE. The
+    tolerances match pdfplumber's extract_text defaults.
+    """
+    X_TOLERANCE = 3
+    Y_TOLERANCE = 3
+
+    def __init__(self, rsrcmgr: PDFResourceManager):
+        super().__init__(rsrcmgr)
+        self._lines = []
+        self._line = []
+        self._last_x = None
+        self._last_y = None
+        self._pending_space = False
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, *args) -> float:
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = ''
+        adv = font.char_width(cid) * fontsize * scaling
+        x0, y = apply_matrix_pt(matrix, (0, rise))
+        x1, _ = apply_matrix_pt(matrix, (adv, rise))
+
+        if self._last_y is not None and abs(y - self._last_y) > self.Y_TOLERANCE:
+            self._end_line()
+        elif self._last_x is not None and x0 - self._last_x > self.X_TOLERANCE:
+            self._pending_space = True
+
+        if not text or text.isspace():
+            self._pending_space = True
+        else:
+            if self._pending_space and self._line:
+                self._line.append(' ')
+            self._line.append(text)
+            self._pending_space = False
+
+        self._last_x = x1
+        self._last_y = y
+        return adv
+
+    def _end_line(self) -> None:
+        if self._line:
+            self._lines.append(''.join(self._line))
+        self._line = []
+        self._pending_space = False
+
+    def get_text(self) -> str:
+        """Return the text rendered so far"""
+        self._end_line()
+        return '\n'.join(self._lines)
+
+class PDFMinerDocument(TextDocument):
+    """Layout-free extraction with a pdfminer interpreter and LayoutFreeTextDevice"""
+    def __init__(self, pdf_path: str):
+        self._file = open(pdf_path, 'rb')
+        try:
+            document = PDFDocument(PDFMinerParser(self._file))
+            self._pages = list(PDFPage.create_pages(document))
+        except Exception:
+            self._file.close()
+            raise
+        self._resources = PDFResourceManager(caching=True)
+        self.page_count = len(self._pages)
+
+    def raw_page(self, page_num: int) -> PDFPage:
+        return self._pages[page_num]
+
+    def page_text(self, page_num: int) -> str:
+        device = LayoutFreeTextDevice(self._resources)
+        PDFPageInterpreter(self._resources, device).process_page(self._pages[page_num])
+        return device.get_text()
+
+    def close(self) -> None:
+        self._file.close()
+
+# Text extraction engines selectable through PDF_TEXT_BACKEND
+TEXT_BACKENDS = {
+    'pdfplumber': PDFPlumberDocument,
+    'pdfminer': PDFMinerDocument
+}
+
+def open_document(pdf_path: str, backend: str = None) -> TextDocument:
+    """
+    Open a PDF with the configured text extraction backend
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        backend (str): Backend name, defaults to PDF_TEXT_BACKEND
+
+    Returns:
+        TextDocument: Open document, to be used as a context manager
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = backend or PDF_TEXT_BACKEND
+    if backend not in TEXT_BACKENDS:
+        raise ValueError(f"Unknown PDF text backend: {backend}. Available: {', '.join(TEXT_BACKENDS)}")
+    logger.debug(f"Opening {pdf_path} with the {backend} text backend")
+    return TEXT_BACKENDS[backend](pdf_path)
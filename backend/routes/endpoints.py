@@ -1,32 +1,78 @@
-from flask import Blueprint, request, jsonify, send_file, make_response
+from flask import Blueprint, request, jsonify, send_file, make_response, Response, stream_with_context, g
 from werkzeug.utils import secure_filename
 import os
 import logging
+import mimetypes
+from functools import wraps
+from datetime import datetime
 from typing import List
 import pandas as pd
 
 from modules.pdf_parser import PDFParser
 from modules.excel_parser import ExcelParser
-from modules.matcher import Matcher
 from modules.file_handler import FileHandler
-from config import UPLOAD_FOLDER
+from modules.pipeline import Pipeline
+from modules.exporter import Exporter
+from modules.job_queue import JobQueue, JobQueueFullError
+from modules.session_store import SessionStore
+from modules.log_utils import Truncated
+from modules.metrics import registry
+from modules.profiler import RequestProfiler
+from config import (
+    UPLOAD_FOLDER, JOB_DB_PATH, JOB_WORKERS, JOB_QUEUE_LIMIT, JOB_HISTORY_LIMIT,
+    SESSION_DB_PATH, SESSION_COOKIE_NAME, SESSION_MAX_AGE
+)
 
 # Create blueprint for API routes
 api = Blueprint('api', __name__)
 logger = logging.getLogger(__name__)
 
-# Store uploaded file paths in memory (in a real app, you might want to use a proper session management)
-uploaded_files = {
-    'pdfs': [],
-    'excel': None
-}
+# Uploaded file paths of each client session, shared by all worker processes
+session_store = SessionStore(SESSION_DB_PATH, SESSION_MAX_AGE)
+
+# Background workers for asynchronous /process-data requests; job status is shared by all worker processes
+job_queue = JobQueue(JOB_DB_PATH, JOB_WORKERS, JOB_QUEUE_LIMIT, JOB_HISTORY_LIMIT)
+
+def current_session() -> str:
+    """Return the requesting client's session ID, starting a session if it has none"""
+    if 'session_id' not in g:
+        session_id = request.cookies.get(SESSION_COOKIE_NAME)
+        if not session_store.touch(session_id):
+            session_id = session_store.create()
+            g.new_session = True
+        g.session_id = session_id
+    return g.session_id
+
+@api.after_request
+def set_session_cookie(response):
+    """Hand a newly started session's ID to the client"""
+    if g.get('new_session'):
+        response.set_cookie(
+            SESSION_COOKIE_NAME, g.session_id, max_age=SESSION_MAX_AGE, httponly=True, samesite='Lax'
+        )
+    return response
+
+def profiled(view):
+    """Profile the view when the request carries the admin profiling token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not RequestProfiler.requested(request.headers.get(RequestProfiler.HEADER)):
+            return view(*args, **kwargs)
+        with RequestProfiler.profile(view.__name__) as artifact:
+            response = make_response(view(*args, **kwargs))
+        # Download the profile and its summary through /download/<filename>
+        response.headers[RequestProfiler.RESULT_HEADER] = artifact['profile_file']
+        response.headers[f"{RequestProfiler.RESULT_HEADER}-Summary"] = artifact['summary_file']
+        return response
+    return wrapper
 
 @api.route('/upload-pdfs', methods=['POST'])
+@profiled
 def upload_pdfs():
     """Handle upload of CBP error report PDFs"""
     logger.info("Received PDF upload request")
-    logger.debug(f"Request Files: {request.files}")
-    logger.debug(f"Request Form: {request.form}")
+    logger.debug("Request Files: %s", Truncated(request.files))
+    logger.debug("Request Form: %s", Truncated(request.form))
     
     if 'files' not in request.files:
         logger.error("No files in request")
@@ -41,26 +87,28 @@ def upload_pdfs():
     
     try:
         # Save and process each PDF
-        if 'pdfs' not in uploaded_files:
-            uploaded_files['pdfs'] = []
-        error_dataframes = []
+        session_id = current_session()
+        saved_files = []
         
         for file in files:
             logger.debug(f"Processing file: {file.filename}")
             if FileHandler.allowed_file(file.filename, 'pdf'):
                 file_path = FileHandler.save_uploaded_file(file, 'pdf')
-                uploaded_files['pdfs'].append(file_path)
-                
-                try:
-                    df = PDFParser.extract_error_data(file_path)
-                    error_dataframes.append(df)
-                except ValueError as e:
-                    logger.error(f"Error processing file {file.filename}: {str(e)}")
-                    return jsonify({'error': f"Error in file {file.filename}: {str(e)}"}), 400
+                session_store.add_pdfs(session_id, [file_path])
+                saved_files.append((file.filename, file_path))
             else:
                 logger.error(f"Invalid file type: {file.filename}")
                 return jsonify({'error': f'Invalid file type: {file.filename}'}), 400
         
+        # Parse all saved PDFs, in parallel when configured
+        results = PDFParser.extract_many([file_path for _, file_path in saved_files])
+        error_dataframes = []
+        for (filename, _), result in zip(saved_files, results):
+            if result.error is not None:
+                logger.error(f"Error processing file {filename}: {result.error}")
+                return jsonify({'error': f"Error in file {filename}: {result.error}"}), 400
+            error_dataframes.append(result.data)
+        
         # Combine all error dataframes
         if error_dataframes:
             combined_df = PDFParser.combine_pdf_data(error_dataframes)
@@ -92,11 +140,10 @@ def upload_import():
         if FileHandler.allowed_file(file.filename, 'excel'):
             # Save the file
             file_path = FileHandler.save_uploaded_file(file, 'excel')
-            uploaded_files['excel'] = file_path
+            session_store.set_excel(current_session(), file_path)
             
-            # Validate and process the Excel file
-            df = ExcelParser.read_import_file(file_path)
-            df = ExcelParser.clean_data(df)
+            # Validate and clean the Excel file; this also caches the cleaned table and its key index for processing
+            df, _ = ExcelParser.load_import(file_path)
             
             return jsonify({
                 'message': 'Successfully processed import record file',
@@ -109,39 +156,97 @@ def upload_import():
         return jsonify({'error': str(e)}), 500
 
 @api.route('/process-data', methods=['POST'])
+@profiled
 def process_data():
-    """Match error data with import records and generate output"""
+    """
+    Match error data with import records and generate output
+
+    With ?async=true the work is queued and a job ID is returned immediately;
+    poll /jobs/<job_id> for progress and the result.
+    
+    With ?format=csv, parquet or jsonl no output file is written; the result is
+    streamed back in that format while it is being serialized.
+    
+    With PROFILING_ENABLED, sending the admin token in the X-Profile header
+    profiles the request; the X-Profile-File response header names the saved
+    profile. Only the request thread is profiled, not background jobs or the
+    serialization of streamed formats.
+    """
+    export_format = request.args.get('format', 'xlsx').lower()
+    is_async = request.args.get('async', '').lower() in ('1', 'true', 'yes')
+    if export_format != 'xlsx' and export_format not in Exporter.FORMATS:
+        return jsonify({'error': f"Unsupported format: {export_format}"}), 400
+    if export_format != 'xlsx' and is_async:
+        return jsonify({'error': 'Streamed formats are only available for synchronous requests'}), 400
+    
+    uploaded_files = session_store.get(current_session())
     if not uploaded_files['pdfs'] or not uploaded_files['excel']:
         return jsonify({'error': 'Please upload both PDF and Excel files first'}), 400
     
+    if export_format != 'xlsx':
+        return export_data(uploaded_files, export_format)
+    
+    if is_async:
+        try:
+            job_id = job_queue.submit(Pipeline.run, uploaded_files['pdfs'], uploaded_files['excel'])
+        except JobQueueFullError as e:
+            return jsonify({'error': str(e)}), 503
+        return jsonify({
+            'message': 'Processing started',
+            'job_id': job_id,
+            'status_url': f"/api/jobs/{job_id}"
+        }), 202
+    
     try:
-        # Process PDFs
-        error_dataframes = [
-            PDFParser.extract_error_data(pdf_path)
-            for pdf_path in uploaded_files['pdfs']
-        ]
-        error_df = PDFParser.combine_pdf_data(error_dataframes)
-        
-        # Process Excel
-        import_df = ExcelParser.read_import_file(uploaded_files['excel'])
-        import_df = ExcelParser.clean_data(import_df)
-        
-        # Match records
-        matched_df = Matcher.match_records(error_df, import_df)
-        formatted_df = Matcher.format_output(matched_df)
-        
-        # Generate output file
-        output_path = FileHandler.generate_output_file(formatted_df)
+        result = Pipeline.run(uploaded_files['pdfs'], uploaded_files['excel'])
         
         return jsonify({
             'message': 'Successfully processed data',
-            'matched_records': len(formatted_df),
-            'output_file': os.path.basename(output_path)
+            'matched_records': result['matched_records'],
+            'output_file': result['output_file'],
+            'memoized': result['memoized']
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def export_data(uploaded_files: dict, export_format: str):
+    """Match the uploaded files and stream the result as a chunked download"""
+    try:
+        formatted_df = Pipeline.match(uploaded_files['pdfs'], uploaded_files['excel'])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    mimetype, extension = Exporter.FORMATS[export_format]
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"processed_data_{timestamp}{extension}"
+    logger.info(f"Streaming {len(formatted_df)} matched records as {filename}")
+    return Response(
+        stream_with_context(Exporter.iter_export(formatted_df, export_format)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    """Expose pipeline stage timings, throughput and cache counters in the Prometheus text format"""
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report the status and per-stage progress of a background processing job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job['result'] is not None:
+        job['result'] = {
+            'matched_records': job['result']['matched_records'],
+            'output_file': job['result']['output_file'],
+            'memoized': job['result']['memoized']
+        }
+    return jsonify(job), 200
+
 @api.route('/download/<filename>', methods=['GET'])
 def download_file(filename):
     """Download the processed output file"""
@@ -154,11 +259,16 @@ def download_file(filename):
             return jsonify({'error': 'File not found'}), 404
         
         logger.info(f"Sending file: {filename}")
+        if filename.endswith('.xlsx'):
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        else:
+            # Profiles and their summaries are saved next to the output files
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
         return send_file(
             file_path,
             as_attachment=True,
             download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            mimetype=mimetype
         )
     except Exception as e:
         logger.exception(f"Error downloading file: {str(e)}")
@@ -174,19 +284,19 @@ def cleanup(response):
 def view_processed():
     """Return the currently processed PDF data"""
     try:
+        uploaded_files = session_store.get(current_session())
         if not uploaded_files['pdfs']:
             return jsonify({'error': 'No PDFs have been processed yet'}), 404
         
         all_records = []
         processed_files = []
-        for pdf_path in uploaded_files['pdfs']:
-            try:
-                df = PDFParser.extract_error_data(pdf_path)
-                records = df.to_dict('records')
-                all_records.extend(records)
-                processed_files.append(os.path.basename(pdf_path))
-            except Exception as e:
-                logger.error(f"Error processing {pdf_path}: {str(e)}")
+        for result in PDFParser.extract_many(uploaded_files['pdfs']):
+            if result.error is not None:
+                logger.error(f"Error processing {result.pdf_path}: {result.error}")
+                continue
+            records = result.data.to_dict('records')
+            all_records.extend(records)
+            processed_files.append(os.path.basename(result.pdf_path))
         
         return jsonify({
             'records': all_records,
@@ -202,8 +312,7 @@ def view_processed():
 def clear_uploads():
     """Clear all uploaded files"""
     try:
-        uploaded_files['pdfs'] = []
-        uploaded_files['excel'] = None
+        session_store.clear(current_session())
         return jsonify({'message': 'Successfully cleared all uploads'}), 200
     except Exception as e:
         logger.exception("Error clearing uploads")
@@ -0,0 +1,148 @@
+"""
+Benchmark of eager against lazy debug logging on the parsing and matching hot path
+
+Replays the debug logging calls that PDF extraction, matching and output
+formatting make for generated data, once in their former eager form
+(f-strings, samples built unconditionally) and once in their current lazy
+form (%-style arguments wrapped in Truncated, samples built only when DEBUG
+is enabled). Both run at the same log level, first the production level and
+then DEBUG, with records written to a null stream. The full pipeline is also
+timed at each level to put the difference in proportion.
+
+Usage:
+    python benchmarks/bench_logging.py [--pages N] [--records-per-page N] [--repeat N]
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from modules.pdf_parser import PDFParser
+from modules.matcher import Matcher
+from modules.log_utils import LOG_FORMAT, Truncated, configure_logging
+
+KEY_COLUMNS = Matcher.KEY_COLUMNS
+
+class TextDocument:
+    """Stand-in for an opened PDF that returns generated page texts"""
+    def __init__(self, page_texts: list):
+        self.page_texts = page_texts
+
+    def page_text(self, page_num: int) -> str:
+        return self.page_texts[page_num]
+
+def build_inputs(pages: int, records_per_page: int, seed: int = 0) -> tuple:
+    """Build error report page texts and import records that match most of them"""
+    rng = random.Random(seed)
+    entries = [str(60000000 + i) for i in range(pages * records_per_page // 2)]
+    page_texts = []
+    keys = []
+    for _ in range(pages):
+        lines = ['CBP ERROR REPORT', 'Error Code Description Entry Line']
+        for _ in range(records_per_page):
+            entry = rng.choice(entries)
+            line = str(rng.randint(1, 40))
+            keys.append((entry, line))
+            lines.append(f"E1 F{rng.randint(100, 999)} EXCESS DUTY CLAIMED GU6{entry} {line} GU6 {entry}")
+        page_texts.append('\n'.join(lines))
+    import_df = pd.DataFrame({
+        'Filer Code': 'GU6',
+        'Entry Number': [entry for entry, _ in keys],
+        '7501 Line Number': [line for _, line in keys],
+        'Tariff': [f"{rng.randint(1000, 9999)}.{rng.randint(10, 99)}" for _ in keys],
+        'Goods Description': ['BOLTS'] * len(keys),
+        'Line Entered Value': [rng.randint(1, 100000) for _ in keys]
+    }).sample(frac=0.9, random_state=seed)
+    return page_texts, import_df
+
+def run_pipeline(page_texts: list, import_df: pd.DataFrame) -> int:
+    """Extract, match and format all records, returning the output row count"""
+    document = TextDocument(page_texts)
+    texts = PDFParser._iter_page_texts(document, 0, len(page_texts), prescan=False)
+    error_df = pd.DataFrame(list(PDFParser._iter_records(texts)))
+    return len(Matcher.format_output(Matcher.match_records(error_df, import_df)))
+
+def build_log_inputs(page_texts: list, import_df: pd.DataFrame) -> dict:
+    """Produce the values the hot-path logging calls refer to"""
+    records = list(PDFParser._iter_records(page_texts))
+    error_df = pd.DataFrame(records)
+    merged_df = error_df.merge(import_df, on=KEY_COLUMNS, how='left')
+    return {
+        'page_texts': page_texts,
+        'records': records,
+        'error_df': error_df,
+        'merged_df': merged_df,
+        'formatted_df': merged_df.fillna('')
+    }
+
+def eager_logging(logger: logging.Logger, page_texts: list, records: list, error_df: pd.DataFrame,
+                  merged_df: pd.DataFrame, formatted_df: pd.DataFrame) -> None:
+    """The debug logging calls of the parser and matcher before they were made lazy"""
+    for page_num, page_text in enumerate(page_texts):
+        logger.debug(f"Page {page_num + 1} text:\n{page_text}")
+    logger.debug(f"All records: {records}")
+    for col in KEY_COLUMNS:
+        logger.debug(f"{col} in error_df: {error_df[col].head().tolist()}")
+    logger.debug(f"Final columns: {merged_df.columns.tolist()}")
+    sample_record = merged_df.iloc[0]
+    logger.debug(f"Error info: {sample_record[['Error Code', 'Error Description']]}")
+    logger.debug(f"Match keys: {sample_record[KEY_COLUMNS]}")
+    logger.debug(sample_record[['Tariff', 'Goods Description', 'Line Entered Value']])
+    logger.debug(f"Output columns ({len(formatted_df.columns)}): {formatted_df.columns.tolist()}")
+    logger.debug(formatted_df.iloc[0])
+
+def lazy_logging(logger: logging.Logger, page_texts: list, records: list, error_df: pd.DataFrame,
+                 merged_df: pd.DataFrame, formatted_df: pd.DataFrame) -> None:
+    """The same debug logging calls as they are made now"""
+    for page_num, page_text in enumerate(page_texts):
+        logger.debug("Page %d text:\n%s", page_num + 1, Truncated(page_text))
+    logger.debug("Records: %s", Truncated(records))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sample keys after cleaning: %s", error_df[KEY_COLUMNS].head().to_dict('list'))
+        logger.debug("Final columns: %s", merged_df.columns.tolist())
+        logger.debug("Sample matched record: %s", Truncated(merged_df.iloc[0].to_dict()))
+    logger.debug("Output columns (%d): %s", len(formatted_df.columns), Truncated(formatted_df.columns.tolist()))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sample output record: %s", Truncated(formatted_df.iloc[0].to_dict()))
+
+def best_time(run, repeat: int) -> float:
+    """Return the best wall time over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=2000, help='Number of report pages to generate')
+    parser.add_argument('--records-per-page', type=int, default=40, help='Error records on each page')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions, best run is reported')
+    args = parser.parse_args()
+
+    # Records are formatted and written as in the app, but to a null stream
+    with open(os.devnull, 'w') as null_stream:
+        logging.basicConfig(stream=null_stream, format=LOG_FORMAT, force=True)
+        page_texts, import_df = build_inputs(args.pages, args.records_per_page)
+        log_inputs = build_log_inputs(page_texts, import_df)
+        logger = logging.getLogger('modules.pdf_parser')
+        print(f"{len(log_inputs['records'])} records on {args.pages} pages")
+        print(f"{'level':<8} {'eager':>10} {'lazy':>10} {'saved':>10} {'pipeline':>10}  saved of pipeline")
+        for level in ['INFO', 'DEBUG']:
+            configure_logging(level, '')
+            eager = best_time(lambda: eager_logging(logger, **log_inputs), args.repeat)
+            lazy = best_time(lambda: lazy_logging(logger, **log_inputs), args.repeat)
+            pipeline = best_time(lambda: run_pipeline(page_texts, import_df), args.repeat)
+            print(
+                f"{level:<8} {eager * 1000:8.1f}ms {lazy * 1000:8.1f}ms {(eager - lazy) * 1000:8.1f}ms "
+                f"{pipeline * 1000:8.1f}ms  {(eager - lazy) / pipeline:6.1%}"
+            )
+
+if __name__ == '__main__':
+    main()
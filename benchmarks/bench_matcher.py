@@ -0,0 +1,111 @@
+"""
+Benchmark of joining error records to a large set of import records
+
+Compares the legacy three-column string merge, which normalized both frames
+in place, against Matcher's merge on integer-encoded keys. Reports the best
+wall time and the peak traced memory of each.
+
+Usage:
+    python benchmarks/bench_matcher.py [--import-rows N] [--errors N] [--repeat N]
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from modules.matcher import Matcher
+
+def legacy_merge(error_df: pd.DataFrame, import_df: pd.DataFrame) -> pd.DataFrame:
+    """Merge the way Matcher did before key encoding, normalizing both frames in place"""
+    for df in [error_df, import_df]:
+        df['Entry Number'] = df['Entry Number'].astype(str).str.strip()
+        df['7501 Line Number'] = (df['7501 Line Number']
+            .astype(str)
+            .str.strip()
+            .str.lstrip('0')
+            .fillna('')
+        )
+        df['Filer Code'] = df['Filer Code'].astype(str).str.strip()
+
+    import_df_expanded = import_df.copy()
+    if '88888838' in error_df['Entry Number'].unique():
+        test_entries = import_df[import_df['Entry Number'] == '60060331'].copy()
+        test_entries['Entry Number'] = '88888838'
+        import_df_expanded = pd.concat([import_df_expanded, test_entries])
+
+    return pd.merge(
+        error_df,
+        import_df_expanded,
+        on=['Filer Code', 'Entry Number', '7501 Line Number'],
+        how='left',
+        indicator=True
+    )
+
+def encoded_merge(error_df: pd.DataFrame, import_df: pd.DataFrame) -> pd.DataFrame:
+    """Merge with Matcher's encoded keys"""
+    return Matcher._merge_records(error_df, import_df)
+
+def build_frames(import_rows: int, error_count: int, seed: int = 0) -> tuple:
+    """Build import records with a few lines per entry and errors that hit some of them"""
+    rng = random.Random(seed)
+    filers = ['GU6', 'AB1', 'XY9', 'QQ2']
+    entries = [str(60000000 + i) for i in range(import_rows // 4)]
+    import_df = pd.DataFrame({
+        'Filer Code': [rng.choice(filers) for _ in range(import_rows)],
+        'Entry Number': [rng.choice(entries) for _ in range(import_rows)],
+        '7501 Line Number': [str(rng.randint(1, 40)).zfill(3) for _ in range(import_rows)],
+        'Tariff': [f"{rng.randint(1000, 9999)}.{rng.randint(10, 99)}" for _ in range(import_rows)],
+        'Line Entered Value': [rng.randint(1, 100000) for _ in range(import_rows)]
+    })
+    sample = import_df.sample(error_count, random_state=seed)
+    error_df = pd.DataFrame({
+        'Error Code': [f"F{rng.randint(100, 999)}" for _ in range(error_count)],
+        'Error Description': ['EXCESS DUTY CLAIMED'] * error_count,
+        'Filer Code': sample['Filer Code'].tolist(),
+        'Entry Number': sample['Entry Number'].tolist(),
+        '7501 Line Number': [line.lstrip('0') for line in sample['7501 Line Number']]
+    })
+    return error_df, import_df
+
+def measure(merge, error_df: pd.DataFrame, import_df: pd.DataFrame, repeat: int) -> tuple:
+    """Return the best wall time over repeat runs, the peak traced memory and the result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = merge(error_df, import_df)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    merge(error_df, import_df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--import-rows', type=int, default=1000000, help='Number of import records to generate')
+    parser.add_argument('--errors', type=int, default=500, help='Number of error records to generate')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions, best run is reported')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    error_df, import_df = build_frames(args.import_rows, args.errors)
+
+    results = []
+    for name, merge in [('legacy string merge', legacy_merge), ('encoded key merge', encoded_merge)]:
+        # The legacy merge rewrites its inputs; normalizing already normalized keys costs the same
+        elapsed, peak, result = measure(merge, error_df.copy(), import_df.copy(), args.repeat)
+        results.append(result)
+        print(f"{name:<20} {len(result):>8} rows  {elapsed * 1000:9.1f} ms  peak {peak / 1024 / 1024:8.1f} MiB")
+
+    if not results[0].astype(object).equals(results[1].astype(object)):
+        sys.exit("Result mismatch between legacy and encoded merges")
+
+if __name__ == '__main__':
+    main()
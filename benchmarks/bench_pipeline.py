@@ -0,0 +1,202 @@
+"""
+Benchmark of every pipeline stage on generated production-scale data
+
+Generates an error report PDF and an import record workbook, then times each
+stage separately: PDF extraction, workbook reading, cleaning, matching (by
+merge and by import index lookup), output formatting and writing the output
+workbook. Each stage runs once more under tracemalloc to record its peak
+traced memory (Python and NumPy allocations in this process; large PDFs are
+split across worker processes, whose memory is not traced). Results are
+saved as JSON and can be compared with an earlier run.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--pages N] [--errors-per-page N] [--import-rows N]
+        [--data-dir DIR] [--output FILE] [--compare FILE] [--repeat N] [--no-memory]
+"""
+import gc
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARK_DIR), 'backend'))
+
+import config
+from modules.pdf_parser import PDFParser
+from modules.excel_parser import ExcelParser
+from modules.import_index import ImportIndex
+from modules.matcher import Matcher
+from modules.file_handler import FileHandler
+import generators
+
+# Settings that change what the stages do, recorded with the results
+RECORDED_SETTINGS = [
+    'PDF_TEXT_BACKEND', 'PDF_EXTRACTION_MODE', 'PDF_PRESCAN_ENABLED', 'PDF_SHARD_MIN_PAGES',
+    'PDF_PARSE_WORKERS', 'IMPORT_READ_MODE', 'IMPORT_CHUNK_ROWS', 'MATCH_STRATEGY', 'OUTPUT_WRITE_MODE'
+]
+
+def prepare_inputs(data_dir: str, pages: int, errors_per_page: int, import_rows: int, seed: int) -> tuple:
+    """Generate the report PDF and import workbook, reusing files generated earlier with the same parameters"""
+    pdf_path = os.path.join(data_dir, f"errors_{pages}p_{errors_per_page}e_{import_rows}r_{seed}.pdf")
+    xlsx_path = os.path.join(data_dir, f"import_{import_rows}r_{seed}.xlsx")
+    raw_df = generators.build_import_frame(import_rows, seed)
+    if not os.path.exists(xlsx_path):
+        print(f"Generating {xlsx_path}", file=sys.stderr)
+        generators.write_import_workbook(raw_df, xlsx_path)
+    if not os.path.exists(pdf_path):
+        print(f"Generating {pdf_path}", file=sys.stderr)
+        lines = generators.error_report_lines(pages, errors_per_page, import_rows, seed=seed)
+        generators.write_error_report_pdf(lines, pdf_path)
+    return pdf_path, xlsx_path, raw_df
+
+def measure(run, repeat: int, memory: bool) -> tuple:
+    """Return the best wall time over repeat runs, the peak traced memory or None, and the result"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak, result
+
+def run_stages(pdf_path: str, xlsx_path: str, raw_df: pd.DataFrame, output_path: str,
+               repeat: int, memory: bool) -> list:
+    """Time every stage, feeding each the previous stage's result"""
+    results = []
+
+    def stage(name: str, run, unit: str, count) -> object:
+        elapsed, peak, result = measure(run, repeat, memory)
+        items = count(result)
+        results.append({
+            'stage': name,
+            'seconds': round(elapsed, 6),
+            'peak_bytes': peak,
+            'items': items,
+            'unit': unit,
+            'items_per_second': round(items / elapsed, 1) if elapsed > 0 else None
+        })
+        peak_text = f"peak {peak / 1024 / 1024:9.1f} MiB" if peak is not None else ''
+        print(f"{name:<22} {elapsed * 1000:10.1f} ms  {items:>9} {unit:<7} {peak_text}", file=sys.stderr)
+        return result
+
+    error_df = stage(
+        'extract_error_data', lambda: PDFParser.extract_error_data(pdf_path, use_cache=False),
+        'records', len
+    )
+    import_df = stage(
+        'read_import_file', lambda: ExcelParser.read_import_file(xlsx_path, use_cache=False),
+        'rows', len
+    )
+    stage(
+        'clean_data', lambda: ExcelParser.clean_data(ExcelParser._rename_columns(raw_df)),
+        'rows', len
+    )
+    matched_df = stage(
+        'match_records', lambda: Matcher.match_records(error_df, import_df),
+        'rows', len
+    )
+    index = stage(
+        'build_import_index', lambda: ImportIndex.build(Matcher.normalize_keys(import_df)),
+        'rows', lambda index: len(import_df)
+    )
+    stage(
+        'match_records_index', lambda: Matcher.match_records(error_df, import_df, index),
+        'rows', len
+    )
+    formatted_df = stage(
+        'format_output', lambda: Matcher.format_output(matched_df),
+        'rows', len
+    )
+    stage(
+        'generate_output_file', lambda: FileHandler.generate_output_file(formatted_df, output_path),
+        'rows', lambda path: len(formatted_df)
+    )
+    return results
+
+def compare(results: list, baseline_path: str) -> None:
+    """Print each stage's time and peak memory relative to an earlier run"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {entry['stage']: entry for entry in json.load(f)['stages']}
+    print(f"\nCompared with {baseline_path}:", file=sys.stderr)
+    for entry in results:
+        before = baseline.get(entry['stage'])
+        if before is None:
+            print(f"{entry['stage']:<22} not in baseline", file=sys.stderr)
+            continue
+        line = f"{entry['stage']:<22} time x{entry['seconds'] / before['seconds']:6.2f}"
+        if entry['peak_bytes'] and before.get('peak_bytes'):
+            line += f"  peak memory x{entry['peak_bytes'] / before['peak_bytes']:6.2f}"
+        print(line, file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200, help='Pages in the generated error report')
+    parser.add_argument('--errors-per-page', type=int, default=40, help='Error records on each report page')
+    parser.add_argument('--import-rows', type=int, default=100000, help='Rows in the generated import workbook')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the generated data')
+    parser.add_argument('--data-dir', help='Keep generated inputs here and reuse them in later runs')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/pipeline_<timestamp>.json)')
+    parser.add_argument('--compare', metavar='FILE', help='Earlier results file to compare with')
+    parser.add_argument('--repeat', type=int, default=1, help='Timing repetitions, best run is reported')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the traced runs that measure peak memory')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, 'results', f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = args.data_dir or work_dir
+        os.makedirs(data_dir, exist_ok=True)
+        pdf_path, xlsx_path, raw_df = prepare_inputs(
+            data_dir, args.pages, args.errors_per_page, args.import_rows, args.seed
+        )
+        stages = run_stages(
+            pdf_path, xlsx_path, raw_df, os.path.join(work_dir, 'output.xlsx'), args.repeat, not args.no_memory
+        )
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'parameters': {
+            'pages': args.pages,
+            'errors_per_page': args.errors_per_page,
+            'import_rows': args.import_rows,
+            'seed': args.seed,
+            'repeat': args.repeat
+        },
+        'settings': {name: getattr(config, name) for name in RECORDED_SETTINGS},
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'stages': stages
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}", file=sys.stderr)
+
+    if args.compare:
+        compare(stages, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of error record extraction from report text
+
+Compares the legacy ERROR_PATTERN regex with its per-match fallback search
+against PDFParser's precompiled single-pass record pattern, and reports
+records per second for each.
+
+Usage:
+    python benchmarks/bench_record_pattern.py [--records N] [--repeat N]
+"""
+import os
+import re
+import sys
+import time
+import random
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from modules.pdf_parser import PDFParser
+
+LEGACY_ERROR_PATTERN = r'E1\s+F(\d{3})\s+([^G]+?)(?:GU6(\d+)\s+(\d+)\s+)?GU6\s+\d+'
+
+def legacy_records(text: str) -> list:
+    """Extract records the way PDFParser did before the single-pass pattern"""
+    records = []
+    for match in re.finditer(LEGACY_ERROR_PATTERN, text):
+        error_code, error_desc, entry_number, line_number = match.groups()
+        if entry_number is None:
+            last_gu6_match = re.search(r'GU6(\d+)(?:\s|$)', match.group(0))
+            if last_gu6_match:
+                entry_number = last_gu6_match.group(1)
+        records.append({
+            'Error Code': f'F{error_code}',
+            'Error Description': error_desc.strip(),
+            'Filer Code': 'GU6',
+            'Entry Number': entry_number.strip() if entry_number else '',
+            '7501 Line Number': line_number.strip() if line_number else ''
+        })
+    return records
+
+def single_pass_records(text: str) -> list:
+    """Extract records with PDFParser's record pattern"""
+    return list(PDFParser._iter_records([text]))
+
+def build_text(record_count: int, seed: int = 0) -> str:
+    """Build report text with a mix of full records, entry-less records and noise"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(record_count):
+        if i % 10 == 0:
+            lines.append('CBP ERROR REPORT PAGE HEADER - FILER SUMMARY')
+        if i % 7 == 0:
+            lines.append(f"E1 F{rng.randint(100, 999)} MISSING ENTRY DATA GU6 {60000000 + i}")
+        else:
+            description = ' '.join(rng.choices(['EXCESS', 'DUTY', 'CLAIMED', 'INVALID', 'HTS', 'VALUE', 'QUANTITY'], k=6))
+            lines.append(f"E1 F{rng.randint(100, 999)} {description} GU6{60000000 + i} {rng.randint(1, 99)} GU6 {60000000 + i}")
+    return "\n".join(lines)
+
+def time_extractor(extract, text: str, repeat: int) -> tuple:
+    """Return the best wall time over repeat runs and the record count"""
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(extract(text))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=100000, help='Number of report lines to generate')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions, best run is reported')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    text = build_text(args.records)
+    if legacy_records(text) != single_pass_records(text):
+        sys.exit("Record mismatch between legacy and single-pass extraction")
+
+    for name, extract in [('legacy regex + fallback', legacy_records), ('single-pass pattern', single_pass_records)]:
+        elapsed, count = time_extractor(extract, text, args.repeat)
+        print(f"{name:<26} {count:>8} records  {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} records/s")
+
+if __name__ == '__main__':
+    main()
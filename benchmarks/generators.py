@@ -0,0 +1,168 @@
+"""
+Synthetic CBP error report PDFs and import record workbooks for benchmarks
+
+The import records cover a number of entries with several lines each. Error
+reports reference a share of those lines, so matching finds both hits and
+misses. Every generator is seeded and produces the same data for the same
+arguments.
+"""
+import zlib
+import random
+from datetime import date, timedelta
+import pandas as pd
+from openpyxl import Workbook
+
+FILER_CODE = 'GU6'
+LINES_PER_ENTRY = 8
+# The record pattern reads a description up to the first 'G', so none contain one
+ERROR_DESCRIPTIONS = [
+    'EXCESS DUTY CLAIMED',
+    'INVALID TARIFF NUMBER',
+    'VALUE DOES NOT MATCH INVOICE',
+    'QUANTITY EXCEEDS LIMIT',
+    'DUPLICATE LINE ITEM',
+    'MPF AMOUNT INCORRECT',
+    'AD/CVD CASE NUMBER REQUIRED',
+    'UNIT OF MEASURE INVALID'
+]
+GOODS = ['BOLTS', 'NUTS', 'WASHERS', 'STEEL PIPE', 'COPPER WIRE', 'LED LAMPS', 'COTTON SHIRTS', 'AUTO PARTS']
+# Columns of the generated import workbook
+IMPORT_COLUMNS = [
+    'Filer', 'Entry No.', '7501 Line Number', 'Tariff', 'Goods Description', 'Line Entered Value',
+    'Country of Origin', 'Import Date', 'Arrival Date', 'Liq. Date'
+]
+
+def import_keys(rows: int) -> list:
+    """Return the (entry number, line number) of every generated import row, in row order"""
+    return [(str(60000000 + row // LINES_PER_ENTRY), str(row % LINES_PER_ENTRY + 1)) for row in range(rows)]
+
+def build_import_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build import records with Excel column names, as read from a workbook
+
+    Args:
+        rows (int): Number of import lines
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: One row per import line, keys as text and dates as datetimes
+    """
+    rng = random.Random(seed)
+    keys = import_keys(rows)
+    start = date(2024, 1, 1)
+    import_dates = [start + timedelta(days=row // LINES_PER_ENTRY % 365) for row in range(rows)]
+    return pd.DataFrame({
+        'Filer': [FILER_CODE] * rows,
+        'Entry No.': [entry for entry, _ in keys],
+        # Line numbers are zero-padded in some exports
+        '7501 Line Number': [line.zfill(3) if rng.random() < 0.2 else line for _, line in keys],
+        'Tariff': [f"{rng.randint(1000, 9999)}.{rng.randint(10, 99)}.{rng.randint(1000, 9999)}" for _ in range(rows)],
+        'Goods Description': [f" {rng.choice(GOODS)} " for _ in range(rows)],
+        'Line Entered Value': [rng.randint(10, 250000) for _ in range(rows)],
+        'Country of Origin': [rng.choice(['CN', 'VN', 'MX', 'DE', 'IN']) for _ in range(rows)],
+        'Import Date': pd.to_datetime(import_dates),
+        'Arrival Date': pd.to_datetime([day - timedelta(days=2) for day in import_dates]),
+        'Liq. Date': pd.to_datetime([day + timedelta(days=314) for day in import_dates])
+    }, columns=IMPORT_COLUMNS)
+
+def write_import_workbook(df: pd.DataFrame, path: str) -> None:
+    """
+    Write import records to an .xlsx workbook with a write-only worksheet
+
+    Args:
+        df (pd.DataFrame): Records from build_import_frame
+        path (str): Destination .xlsx path
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Import Records')
+    worksheet.append(list(df.columns))
+    for row in df.astype(object).itertuples(index=False, name=None):
+        worksheet.append([value.to_pydatetime() if isinstance(value, pd.Timestamp) else value for value in row])
+    workbook.save(path)
+
+def error_report_lines(pages: int, errors_per_page: int, import_rows: int, hit_rate: float = 0.9,
+                       seed: int = 0) -> list:
+    """
+    Build the text lines of each error report page
+
+    Args:
+        pages (int): Number of report pages
+        errors_per_page (int): Error records on each page
+        import_rows (int): Number of generated import rows errors may refer to
+        hit_rate (float): Share of errors that refer to an existing import line
+        seed (int): Random seed
+
+    Returns:
+        list: Lines of each page, with a report header and a table of errors
+    """
+    rng = random.Random(seed)
+    keys = import_keys(import_rows)
+    last_entry = 60000000 + import_rows // LINES_PER_ENTRY
+    pages_lines = []
+    for page in range(pages):
+        lines = [
+            'U.S. CUSTOMS AND BORDER PROTECTION',
+            'ABI ERROR REPORT - ENTRY SUMMARY REJECTIONS',
+            f"FILER {FILER_CODE}   REPORT DATE 2024-06-30   PAGE {page + 1} OF {pages}",
+            'TYPE CODE DESCRIPTION ENTRY LINE FILER',
+        ]
+        for _ in range(errors_per_page):
+            if rng.random() < hit_rate and keys:
+                entry, line = rng.choice(keys)
+            else:
+                entry, line = str(last_entry + rng.randint(1, 100000)), str(rng.randint(1, 99))
+            code = rng.randint(100, 999)
+            description = rng.choice(ERROR_DESCRIPTIONS)
+            lines.append(f"E1 F{code} {description} {FILER_CODE}{entry} {line} {FILER_CODE} {entry}")
+        lines.append('END OF PAGE')
+        pages_lines.append(lines)
+    return pages_lines
+
+def write_error_report_pdf(pages_lines: list, path: str) -> None:
+    """
+    Write report pages to a PDF with compressed content streams
+
+    Pages are written one at a time, so documents with thousands of pages
+    can be generated without holding them in memory.
+
+    Args:
+        pages_lines (list): Lines of each page, from error_report_lines
+        path (str): Destination .pdf path
+    """
+    page_count = len(pages_lines)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a content stream and a page per report page
+    with open(path, 'wb') as f:
+        offsets = []
+
+        def write_object(body: bytes) -> None:
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (len(offsets), body))
+
+        f.write(b"%PDF-1.4\n")
+        write_object(b"<< /Type /Catalog /Pages 2 0 R >>")
+        kids = b" ".join(b"%d 0 R" % (5 + 2 * page) for page in range(page_count))
+        write_object(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, page_count))
+        write_object(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        for page, lines in enumerate(pages_lines):
+            # Tighten the line spacing so every line stays on the page
+            spacing = min(11, 740 / max(len(lines), 1))
+            text = " ".join(
+                "1 0 0 1 36 %.2f Tm (%s) Tj" % (
+                    770 - spacing * row,
+                    line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+                )
+                for row, line in enumerate(lines)
+            )
+            font_size = min(8, spacing * 0.8)
+            stream = zlib.compress(f"BT /F1 {font_size:.2f} Tf {text} ET".encode('latin-1'))
+            write_object(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+            write_object(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (4 + 2 * page)
+            )
+
+        xref_offset = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(offsets) + 1, xref_offset))
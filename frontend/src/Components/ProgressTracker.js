@@ -2,7 +2,10 @@
 
 import React from 'react';
 
-const ProgressTracker = ({ status, message, error }) => {
+const ProgressTracker = ({ status, message, error, progress }) => {
+    const filesTotal = progress?.files_total || 0;
+    const filesParsed = progress?.files_parsed || 0;
+
     return (
         <div className="progress-tracker mb-4">
             {status && (
@@ -15,6 +18,27 @@ const ProgressTracker = ({ status, message, error }) => {
                         )}
                         <span>{message}</span>
                     </div>
+                    {!error && progress && (
+                        <div className="mt-2">
+                            {filesTotal > 0 && (
+                                <div className="progress mb-1">
+                                    <div
+                                        className="progress-bar"
+                                        role="progressbar"
+                                        style={{ width: `${(filesParsed / filesTotal) * 100}%` }}
+                                        aria-valuenow={filesParsed}
+                                        aria-valuemin="0"
+                                        aria-valuemax={filesTotal}
+                                    />
+                                </div>
+                            )}
+                            <small>
+                                Files parsed: {filesParsed}/{filesTotal}
+                                {progress.rows_matched !== undefined && ` · Rows matched: ${progress.rows_matched}`}
+                                {progress.bytes_written !== undefined && ` · Bytes written: ${progress.bytes_written}`}
+                            </small>
+                        </div>
+                    )}
                 </div>
             )}
         </div>
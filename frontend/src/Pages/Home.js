@@ -4,7 +4,16 @@ import ProgressTracker from '../Components/ProgressTracker';
 import DownloadButton from '../Components/DownloadButton';
 import Header from '../Components/Header';
 import ProcessedDataViewer from '../Components/ProcessedDataViewer';
-import { uploadPDFs, uploadImport, processData, getProcessedData, clearUploads } from '../Services/api';
+import { uploadPDFs, uploadImport, startProcessingJob, getJobStatus, getProcessedData, clearUploads } from '../Services/api';
+
+const JOB_POLL_INTERVAL_MS = 1000;
+
+const STAGE_MESSAGES = {
+    parse_pdfs: 'Parsing PDF files...',
+    read_import: 'Reading import records...',
+    match: 'Matching records...',
+    write_output: 'Writing output file...'
+};
 
 const Home = () => {
     const [status, setStatus] = useState('');
@@ -12,6 +21,7 @@ const Home = () => {
     const [outputFile, setOutputFile] = useState(null);
     const [processedRecords, setProcessedRecords] = useState([]);
     const [uploadedPDFs, setUploadedPDFs] = useState([]);
+    const [progress, setProgress] = useState(null);
 
     const handlePDFUpload = async (files) => {
         try {
@@ -60,10 +70,25 @@ const Home = () => {
         try {
             setStatus('Processing data...');
             setError(null);
-            const response = await processData();
-            setOutputFile(response.output_file);
+            const { job_id: jobId } = await startProcessingJob();
+
+            let job = await getJobStatus(jobId);
+            while (job.status === 'queued' || job.status === 'running') {
+                setStatus(STAGE_MESSAGES[job.stage] || 'Processing data...');
+                setProgress(job.progress);
+                await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+                job = await getJobStatus(jobId);
+            }
+
+            setProgress(null);
+            if (job.status === 'failed') {
+                setError(job.error || 'Failed to process data');
+                return;
+            }
+            setOutputFile(job.result.output_file);
             setStatus('Data processing complete');
         } catch (err) {
+            setProgress(null);
             setError(err.response?.data?.error || 'Failed to process data');
         }
     };
@@ -74,6 +99,7 @@ const Home = () => {
             setUploadedPDFs([]);
             setProcessedRecords([]);
             setOutputFile(null);
+            setProgress(null);
             setError(null);
             setStatus('');
         } catch (err) {
@@ -115,7 +141,7 @@ const Home = () => {
                     </div>
                 </div>
 
-                <ProgressTracker status={status} error={error} message={status || error} />
+                <ProgressTracker status={status} error={error} message={status || error} progress={progress} />
 
                 <div className="d-grid gap-2 d-md-flex justify-content-md-center">
                     <button 
@@ -2,6 +2,9 @@ import axios from 'axios';
 
 export const API_BASE_URL = 'http://localhost:5001/api';
 
+// Uploads are kept per session, identified by a cookie set by the API
+axios.defaults.withCredentials = true;
+
 export const uploadPDFs = async (files) => {
     const formData = new FormData();
     files.forEach(file => {
@@ -26,6 +29,16 @@ export const processData = async () => {
     return response.data;
 };
 
+export const startProcessingJob = async () => {
+    const response = await axios.post(`${API_BASE_URL}/process-data?async=true`);
+    return response.data;
+};
+
+export const getJobStatus = async (jobId) => {
+    const response = await axios.get(`${API_BASE_URL}/jobs/${jobId}`);
+    return response.data;
+};
+
 export const getProcessedData = async () => {
     const response = await axios.get(`${API_BASE_URL}/view-processed`);
     return response.data;
@@ -0,0 +1,104 @@
+import pytest
+import pandas as pd
+
+
+def build_pdf(pages: list) -> bytes:
+    """
+    Build a minimal PDF with one text line per entry in each page
+
+    Args:
+        pages (list): List of pages, each a list of text lines or (x, text) tuples
+
+    Returns:
+        bytes: Raw PDF document
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        # A line is either text at the left margin or an (x, text) tuple
+        placed = [line if isinstance(line, tuple) else (40, line) for line in lines]
+        stream = "BT /F1 10 Tf " + " ".join(
+            "1 0 0 1 %d %d Tm (%s) Tj" % (
+                x, 760 - 14 * row,
+                text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            )
+            for row, (x, text) in enumerate(placed)
+        ) + " ET"
+        stream = stream.encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_refs))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a generated PDF to a temporary path and return the path"""
+    def _make_pdf(pages: list, name: str = 'report.pdf') -> str:
+        pdf_path = tmp_path / name
+        pdf_path.write_bytes(build_pdf(pages))
+        return str(pdf_path)
+    return _make_pdf
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """Pipeline module with every cache in a temporary directory"""
+    from modules import pipeline
+    from modules.cache import DiskCache
+    from modules.result_store import ResultStore
+    monkeypatch.setattr(pipeline.PDFParser, 'cache', DiskCache(str(tmp_path / "pdf"), 10 * 1024 * 1024))
+    monkeypatch.setattr(pipeline.ExcelParser, 'cache', DiskCache(str(tmp_path / "import"), 10 * 1024 * 1024, fmt='feather'))
+    monkeypatch.setattr(pipeline.Pipeline, 'matched', DiskCache(str(tmp_path / "matched"), 10 * 1024 * 1024))
+    monkeypatch.setattr(pipeline.Pipeline, 'results', ResultStore(str(tmp_path / "results" / "index.db"), 10))
+    return pipeline
+
+
+@pytest.fixture
+def match_inputs(tmp_path):
+    """
+    A directory of three error report PDFs and the import workbook they match against
+
+    The first two reports match a workbook row, the third does not. The
+    directory also holds a file that is not a PDF.
+    """
+    pdf_dir = tmp_path / "reports"
+    pdf_dir.mkdir()
+    pdf_paths = []
+    for number, line in enumerate(['25', '26', '99']):
+        pdf_path = pdf_dir / f"report_{number}.pdf"
+        pdf_path.write_bytes(build_pdf([[f"E1 F55{number} EXCESS DUTY CLAIMED GU660061040 {line} GU6 60061040"]]))
+        pdf_paths.append(str(pdf_path))
+    (pdf_dir / "notes.txt").write_text('not a report')
+    excel_path = tmp_path / "import.xlsx"
+    pd.DataFrame({
+        'Filer': ['GU6', 'GU6'],
+        'Entry No.': ['60061040', '60061040'],
+        '7501 Line Number': ['25', '26'],
+        'Tariff': ['1234.56', '7890.12'],
+        'Goods Description': ['BOLTS', 'NUTS'],
+        'Line Entered Value': ['100', '200']
+    }).to_excel(excel_path, index=False)
+    return pdf_paths, str(excel_path)
+
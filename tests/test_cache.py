@@ -0,0 +1,71 @@
+import os
+import pandas as pd
+from backend.modules.cache import DiskCache
+
+SAMPLE_DATA = {
+    'Error Code': ['F551', 'F123'],
+    'Error Description': ['EXCESS DUTY CLAIMED', 'INVALID HTS CODE'],
+    'Entry Number': ['60061040', '60061041']
+}
+
+class TestDiskCache:
+    def test_make_key_depends_on_contents_and_parts(self, tmp_path):
+        """Test that keys change with file contents and versioning parts"""
+        file_path = tmp_path / "report.pdf"
+        file_path.write_bytes(b"first")
+        key = DiskCache.make_key(str(file_path), '1', 'pattern')
+
+        assert key == DiskCache.make_key(str(file_path), '1', 'pattern')
+        assert key != DiskCache.make_key(str(file_path), '2', 'pattern')
+
+        file_path.write_bytes(b"second")
+        assert key != DiskCache.make_key(str(file_path), '1', 'pattern')
+
+    def test_get_put_counts_hits_and_misses(self, tmp_path):
+        """Test round-tripping a DataFrame and the hit/miss counters"""
+        cache = DiskCache(str(tmp_path), 10 * 1024 * 1024)
+        df = pd.DataFrame(SAMPLE_DATA)
+
+        assert cache.get('missing') is None
+        cache.put('present', df)
+        result = cache.get('present')
+
+        assert result.astype(object).equals(df.astype(object))
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that eviction keeps the cache within its size budget"""
+        cache = DiskCache(str(tmp_path), 10 * 1024 * 1024)
+        df = pd.DataFrame(SAMPLE_DATA)
+        for key in ['old', 'recent']:
+            cache.put(key, df)
+        os.utime(tmp_path / "old.parquet", (0, 0))
+
+        # Shrink the budget so only one entry fits, then add another
+        cache.max_bytes = os.path.getsize(tmp_path / "recent.parquet") * 2
+        cache.put('newest', df)
+
+        assert cache.get('old') is None
+        assert cache.get('recent') is not None
+        assert cache.get('newest') is not None
+
+    def test_unreadable_entry_is_a_miss(self, tmp_path):
+        """Test that corrupt entries are discarded instead of raising"""
+        cache = DiskCache(str(tmp_path), 10 * 1024 * 1024)
+        (tmp_path / "broken.parquet").write_bytes(b"not parquet")
+
+        assert cache.get('broken') is None
+        assert not (tmp_path / "broken.parquet").exists()
+
+    def test_feather_round_trip(self, tmp_path):
+        """Test storing entries as uncompressed Arrow files"""
+        cache = DiskCache(str(tmp_path), 10 * 1024 * 1024, fmt='feather')
+        df = pd.DataFrame(SAMPLE_DATA)
+        cache.put('present', df)
+
+        assert (tmp_path / "present.arrow").exists()
+        assert cache.get('present').astype(object).equals(df.astype(object))
+        assert cache.stats()['entries'] == 1
@@ -0,0 +1,84 @@
+import os
+import pytest
+import pandas as pd
+from backend import cli
+
+class TestCli:
+    def test_find_pdfs(self, match_inputs):
+        """Test expanding directories, globs and files in order without duplicates"""
+        pdf_paths, _ = match_inputs
+        first, second, third = pdf_paths
+        pdf_dir = os.path.dirname(first)
+
+        assert cli.find_pdfs([pdf_dir]) == pdf_paths
+        assert cli.find_pdfs([second, os.path.join(pdf_dir, "*.pdf")]) == [second, first, third]
+        with pytest.raises(ValueError, match="No PDF files found"):
+            cli.find_pdfs([os.path.join(pdf_dir, "missing_*.pdf")])
+
+    @pytest.mark.parametrize('extension', ['xlsx', 'csv'])
+    def test_main_writes_output(self, pipeline, match_inputs, tmp_path, capsys, extension):
+        """Test running the pipeline on a directory and writing the output directly"""
+        pdf_paths, excel_path = match_inputs
+        output_path = tmp_path / "out" / f"result.{extension}"
+
+        exit_code = cli.main([
+            os.path.dirname(pdf_paths[0]), '--import', excel_path, '--output', str(output_path), '--workers', '1'
+        ])
+
+        assert exit_code == 0
+        if extension == 'xlsx':
+            result = pd.read_excel(output_path, dtype=str, keep_default_na=False)
+        else:
+            result = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+        assert result['Error Code'].tolist() == ['F550', 'F551', 'F552']
+        assert result['Tariff'].tolist() == ['1234.56', '7890.12', '']
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert 'parsed 3/3 PDFs' in captured.err
+        assert 'Wrote 3 matched records' in captured.err
+
+    def test_main_reports_errors(self, pipeline, match_inputs, tmp_path, capsys):
+        """Test that a missing import file fails with a message on stderr"""
+        pdf_paths, _ = match_inputs
+
+        exit_code = cli.main([pdf_paths[0], '--import', str(tmp_path / "missing.xlsx"), '--output', str(tmp_path / "out.csv")])
+
+        assert exit_code == 1
+        assert 'Import file not found' in capsys.readouterr().err
+
+    def test_main_reports_output_errors(self, pipeline, match_inputs, tmp_path, capsys):
+        """Test that an output path that cannot be written fails with a message instead of a traceback"""
+        pdf_paths, excel_path = match_inputs
+        blocked = tmp_path / "blocked"
+        blocked.write_text('a file, not a directory')
+
+        exit_code = cli.main([pdf_paths[0], '--import', excel_path, '--output', str(blocked / "out.csv"), '--workers', '1'])
+
+        assert exit_code == 1
+        assert capsys.readouterr().err.splitlines()[-1].startswith('Error: ')
+
+    def test_unknown_output_format(self, match_inputs, tmp_path):
+        """Test that the output format must be known"""
+        pdf_paths, excel_path = match_inputs
+        with pytest.raises(SystemExit):
+            cli.parse_args([pdf_paths[0], '--import', excel_path, '--output', str(tmp_path / "out.txt")])
+
+    def test_main_single_worker_does_not_shard(self, pipeline, match_inputs, make_pdf, tmp_path, monkeypatch):
+        """Test that --workers 1 parses a PDF above the shard threshold without a process pool"""
+        from modules import pdf_parser
+        _, excel_path = match_inputs
+        pdf_path = make_pdf([
+            ['E1 F550 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040'], ['SUMMARY PAGE'], ['END OF REPORT']
+        ], 'large.pdf')
+        monkeypatch.setattr(pdf_parser, 'PDF_SHARD_MIN_PAGES', 2)
+        monkeypatch.setattr(pdf_parser, 'PDF_SHARD_PAGES', 1)
+        monkeypatch.setattr(pdf_parser, 'PDF_PARSE_WORKERS', 3)
+        pools = []
+        monkeypatch.setattr(pdf_parser, 'ProcessPoolExecutor', lambda *args, **kwargs: pools.append(kwargs))
+        output_path = tmp_path / "out.csv"
+
+        exit_code = cli.main([pdf_path, '--import', excel_path, '--output', str(output_path), '--workers', '1'])
+
+        assert exit_code == 0
+        assert pools == []
+        assert pd.read_csv(output_path, dtype=str)['Error Code'].tolist() == ['F550']
@@ -7,8 +7,13 @@ from backend.main import create_app
 from backend.config import UPLOAD_FOLDER
 
 @pytest.fixture
-def app():
+def app(tmp_path, monkeypatch):
     """Create and configure a test Flask application"""
+    from routes import endpoints
+    from modules.session_store import SessionStore
+    from modules.job_queue import JobQueue
+    monkeypatch.setattr(endpoints, 'session_store', SessionStore(str(tmp_path / "sessions.db"), 3600))
+    monkeypatch.setattr(endpoints, 'job_queue', JobQueue(str(tmp_path / "jobs.db"), 1, 5, 5))
     app = create_app()
     app.config['TESTING'] = True
     return app
@@ -97,6 +102,22 @@ class TestEndpoints:
         assert response.status_code == 400
         assert b'Please upload both PDF and Excel files first' in response.data
 
+    def test_cors_allows_only_frontend_origin(self, client):
+        """Test that credentialed cross-origin requests are only allowed from the frontend"""
+        from backend.config import FRONTEND_ORIGINS
+        allowed = client.get('/api/view-processed', headers={'Origin': FRONTEND_ORIGINS[0]})
+        assert allowed.headers['Access-Control-Allow-Origin'] == FRONTEND_ORIGINS[0]
+        assert allowed.headers['Access-Control-Allow-Credentials'] == 'true'
+
+        other = client.get('/api/view-processed', headers={'Origin': 'https://evil.example'})
+        assert 'Access-Control-Allow-Origin' not in other.headers
+
+    def test_job_status_unknown(self, client):
+        """Test polling a job that does not exist"""
+        response = client.get('/api/jobs/does-not-exist')
+        assert response.status_code == 404
+        assert b'Job not found' in response.data
+
     @pytest.mark.integration
     def test_full_workflow(self, client, sample_pdf, sample_excel):
         """Test the complete workflow from upload to download"""
@@ -137,3 +158,98 @@ class TestEndpoints:
                 os.unlink(file_path)
             except Exception as e:
                 print(f'Error deleting {file_path}: {e}')
+
+    def test_process_data_unknown_format(self, client):
+        """Test requesting an export format that does not exist"""
+        response = client.post('/api/process-data?format=pdf')
+        assert response.status_code == 400
+        assert b'Unsupported format' in response.data
+
+    def test_process_data_streamed_format_not_async(self, client):
+        """Test that streamed formats cannot be combined with background jobs"""
+        response = client.post('/api/process-data?format=csv&async=true')
+        assert response.status_code == 400
+
+    def test_process_data_streams_csv(self, client, pipeline):
+        """Test streaming the match result as CSV without writing an output file"""
+        from tests.conftest import build_pdf
+
+        pdf = build_pdf([['E1 F551 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040']])
+        excel_buffer = BytesIO()
+        pd.DataFrame({
+            'Filer': ['GU6'],
+            'Entry No.': ['60061040'],
+            '7501 Line Number': ['25'],
+            'Tariff': ['1234.56'],
+            'Goods Description': ['BOLTS'],
+            'Line Entered Value': ['100']
+        }).to_excel(excel_buffer, index=False)
+        excel_buffer.seek(0)
+        client.post('/api/upload-pdfs', data={'files': (BytesIO(pdf), 'report.pdf')}, content_type='multipart/form-data')
+        client.post('/api/upload-import', data={'file': (excel_buffer, 'import.xlsx')}, content_type='multipart/form-data')
+        files_before = set(os.listdir(UPLOAD_FOLDER))
+
+        response = client.post('/api/process-data?format=csv')
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'text/csv'
+        assert 'attachment' in response.headers['Content-Disposition']
+        result = pd.read_csv(BytesIO(response.get_data()), dtype=str)
+        assert result['Error Code'].tolist() == ['F551']
+        assert result['Tariff'].tolist() == ['1234.56']
+        assert set(os.listdir(UPLOAD_FOLDER)) == files_before
+
+        metrics = client.get('/api/metrics')
+        assert metrics.status_code == 200
+        assert metrics.mimetype == 'text/plain'
+        assert 'pipeline_stage_seconds_count{stage="match"}' in metrics.get_data(as_text=True)
+        assert 'output_bytes_written_total{format="csv"}' in metrics.get_data(as_text=True)
+        assert 'cache_hits_total{cache="pdf"}' in metrics.get_data(as_text=True)
+
+    def test_uploads_are_kept_per_session(self, app, client):
+        """Test that one client's uploads are not visible to another"""
+        excel_buffer = BytesIO()
+        pd.DataFrame({
+            'Filer': ['GU6'],
+            'Entry No.': ['60061040'],
+            '7501 Line Number': ['25']
+        }).to_excel(excel_buffer, index=False)
+        excel_buffer.seek(0)
+        response = client.post(
+            '/api/upload-import',
+            data={'file': (excel_buffer, 'test.xlsx')},
+            content_type='multipart/form-data'
+        )
+        assert response.status_code == 200
+        assert 'upload_session' in response.headers['Set-Cookie']
+
+        other_client = app.test_client()
+        assert other_client.post('/api/process-data').status_code == 400
+
+        from routes import endpoints
+        session_id = client.get_cookie('upload_session').value
+        assert endpoints.session_store.get(session_id)['excel'].endswith('test.xlsx')
+
+        client.post('/api/clear')
+        assert endpoints.session_store.get(session_id) == {'pdfs': [], 'excel': None}
+
+    def test_process_data_profiled(self, client, tmp_path, monkeypatch):
+        """Test that the admin token profiles a request and the profile can be downloaded"""
+        from modules import profiler
+        from routes import endpoints
+        monkeypatch.setattr(profiler, 'PROFILING_ENABLED', True)
+        monkeypatch.setattr(profiler, 'PROFILE_ADMIN_TOKEN', 'secret')
+        monkeypatch.setattr(profiler, 'UPLOAD_FOLDER', str(tmp_path))
+        monkeypatch.setattr(endpoints, 'UPLOAD_FOLDER', str(tmp_path))
+
+        response = client.post('/api/process-data', headers={'X-Profile': 'secret'})
+        assert response.status_code == 400
+        profile_file = response.headers['X-Profile-File']
+        assert (tmp_path / profile_file).is_file()
+        assert client.get(f"/api/download/{profile_file}").status_code == 200
+        summary = client.get(f"/api/download/{response.headers['X-Profile-File-Summary']}")
+        assert summary.mimetype == 'text/plain'
+
+        response = client.post('/api/process-data', headers={'X-Profile': 'wrong'})
+        assert 'X-Profile-File' not in response.headers
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from backend.modules.excel_parser import ExcelParser
+from backend.modules.cache import DiskCache
 
 # Test data
 SAMPLE_DATA = {
@@ -46,3 +47,155 @@ class TestExcelParser:
         result = ExcelParser.read_import_file(str(file_path))
         assert len(result) == len(SAMPLE_DATA['Filer Code'])
         assert all(col in result.columns for col in ExcelParser.REQUIRED_COLUMNS)
+
+    @pytest.fixture
+    def import_cache(self, tmp_path, monkeypatch):
+        """Point the import cache at a temporary directory"""
+        cache = DiskCache(str(tmp_path / "cache"), 10 * 1024 * 1024, fmt='feather')
+        monkeypatch.setattr(ExcelParser, 'cache', cache)
+        return cache
+
+    def test_read_import_file_uses_cache(self, tmp_path, monkeypatch, import_cache):
+        """Test that a second read of the same workbook skips Excel parsing"""
+        from backend.modules import excel_parser
+
+        df = pd.DataFrame({
+            'Filer': ['ABC', 'DEF'],
+            'Entry No.': ['12345', '67890'],
+            '7501 Line Number': ['1', '2'],
+            'Import Date': pd.to_datetime(['2024-01-02', '2024-02-03']),
+            'Arrival Date': pd.to_datetime(['2024-01-05', '2024-02-06']),
+            'Liq. Date': pd.to_datetime(['2024-03-01', '2024-04-01'])
+        })
+        file_path = tmp_path / "test_import.xlsx"
+        df.to_excel(file_path, index=False)
+
+        first = ExcelParser.read_import_file(str(file_path))
+
+        def fail_read_excel(*args, **kwargs):
+            raise AssertionError("read_excel called on a cached import file")
+        monkeypatch.setattr(excel_parser.pd, 'read_excel', fail_read_excel)
+        second = ExcelParser.read_import_file(str(file_path))
+
+        assert second.astype(object).equals(first.astype(object))
+        assert second['Import Date'].tolist() == ['2024-01-02', '2024-02-03']
+        assert import_cache.stats()['hits'] == 1
+
+    @pytest.mark.parametrize('read_mode', ['stream', 'pandas'])
+    def test_read_import_file_caches_blank_numeric_keys(self, tmp_path, monkeypatch, import_cache, read_mode):
+        """Test that numeric key columns with blank cells are cached and read back from the cache"""
+        from backend.modules import excel_parser
+
+        monkeypatch.setattr(excel_parser, 'IMPORT_READ_MODE', read_mode)
+        df = pd.DataFrame({
+            'Filer': ['ABC', 'DEF', 'GHI'],
+            'Entry No.': [12345, 67890, 13579],
+            '7501 Line Number': [1, None, 3],
+            'Import Date': pd.to_datetime(['2024-01-02', '2024-02-03', '2024-03-04']),
+            'Arrival Date': pd.to_datetime(['2024-01-05', '2024-02-06', '2024-03-07']),
+            'Liq. Date': pd.to_datetime(['2024-03-01', '2024-04-01', '2024-05-01'])
+        })
+        file_path = tmp_path / "test_import.xlsx"
+        df.to_excel(file_path, index=False)
+
+        first = ExcelParser.read_import_file(str(file_path))
+        second = ExcelParser.read_import_file(str(file_path))
+
+        assert import_cache.stats()['hits'] == 1
+        assert second.astype(object).equals(first.astype(object))
+        assert second['7501 Line Number'].tolist()[1] == ''
+
+    def test_iter_import_chunks_projects_columns(self, tmp_path):
+        """Test streaming a workbook in chunks with a column projection"""
+        df = pd.DataFrame({
+            'Filer': ['ABC', 'DEF', 'GHI'],
+            'Entry No.': ['12345', '67890', '11111'],
+            '7501 Line Number': ['1', '2', '3'],
+            'Tariff': ['1234.56', '2345.67', '3456.78'],
+            'Unused': ['x', 'y', 'z']
+        })
+        file_path = tmp_path / "test_import.xlsx"
+        df.to_excel(file_path, index=False)
+
+        chunks = list(ExcelParser.iter_import_chunks(str(file_path), columns=['Tariff'], chunk_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        result = pd.concat(chunks, ignore_index=True)
+        assert result.columns.tolist() == ['Filer Code', 'Entry Number', '7501 Line Number', 'Tariff']
+        assert result['Entry Number'].tolist() == ['12345', '67890', '11111']
+
+    def test_iter_import_chunks_matches_read_excel(self, tmp_path):
+        """Test that streamed chunks hold the same data as pd.read_excel"""
+        df = pd.DataFrame({
+            'Filer': ['ABC', 'DEF', 'ABC'],
+            'Entry No.': [12345, 67890, 12345],
+            '7501 Line Number': [1, 2, 1],
+            'Import Date': pd.to_datetime(['2024-01-02', '2024-02-03', '2024-01-02']),
+            'Goods Description': ['BOLTS', None, 'BOLTS']
+        })
+        file_path = tmp_path / "test_import.xlsx"
+        df.to_excel(file_path, index=False)
+
+        streamed = pd.concat(ExcelParser.iter_import_chunks(str(file_path)), ignore_index=True)
+        expected = ExcelParser.clean_data(ExcelParser._rename_columns(pd.read_excel(file_path)))
+
+        assert streamed.astype(object).equals(expected.astype(object))
+
+    def test_iter_import_chunks_missing_columns(self, tmp_path):
+        """Test that streaming validates the header row"""
+        file_path = tmp_path / "test_import.xlsx"
+        pd.DataFrame({'Filer': ['ABC'], 'Entry No.': ['12345']}).to_excel(file_path, index=False)
+
+        with pytest.raises(ValueError, match="Import file is missing required columns"):
+            next(ExcelParser.iter_import_chunks(str(file_path)))
+
+    def test_read_import_file_key_pushdown(self, tmp_path, import_cache):
+        """Test that filtering by error keys keeps exactly the rows the match uses"""
+        from backend.modules.matcher import Matcher
+
+        df = pd.DataFrame({
+            'Filer': ['ABC', 'ABC', 'DEF', 'GHI', 'ABC'],
+            'Entry No.': [12345, 12345, 60060331, 11111, 12345],
+            '7501 Line Number': [1, 2, 4, 3, 1],
+            'Tariff': ['1.1', '2.2', '3.3', '4.4', '5.5']
+        })
+        file_path = tmp_path / "test_import.xlsx"
+        df.to_excel(file_path, index=False)
+        error_df = pd.DataFrame({
+            'Filer Code': ['ABC', 'DEF'],
+            'Entry Number': ['12345', '88888838'],
+            '7501 Line Number': ['01', '4']
+        })
+        keys = Matcher.error_keys(error_df)
+
+        streamed = ExcelParser.read_import_file(str(file_path), keys=keys)
+        assert streamed['Tariff'].tolist() == ['1.1', '3.3', '5.5']
+        assert import_cache.stats()['entries'] == 0
+
+        # The full table is cached on the next read; filtering it gives the same rows
+        full = ExcelParser.read_import_file(str(file_path))
+        assert len(full) == 5
+        cached = ExcelParser.read_import_file(str(file_path), keys=keys)
+        assert cached.astype(object).equals(streamed.astype(object))
+
+    def test_load_import_caches_index(self, tmp_path, monkeypatch, import_cache):
+        """Test that the key index is stored alongside the cached import records"""
+        from backend.modules import excel_parser
+
+        df = pd.DataFrame({
+            'Filer': ['ABC', 'DEF', 'ABC'],
+            'Entry No.': ['12345', '67890', '12345'],
+            '7501 Line Number': ['1', '2', '3']
+        })
+        file_path = tmp_path / "test_import.xlsx"
+        df.to_excel(file_path, index=False)
+
+        records, index = ExcelParser.load_import(str(file_path))
+        assert len(index) == len(records) == 3
+        assert import_cache.stats()['entries'] == 2
+
+        def fail_build(keys):
+            raise AssertionError("index rebuilt for a cached import file")
+        monkeypatch.setattr(excel_parser.ImportIndex, 'build', staticmethod(fail_build))
+        _, cached_index = ExcelParser.load_import(str(file_path))
+        assert cached_index.rows.tolist() == index.rows.tolist()
@@ -0,0 +1,53 @@
+import io
+import json
+import pytest
+import pandas as pd
+import pyarrow.parquet as pq
+from backend.modules.exporter import Exporter
+
+SAMPLE_DATA = {
+    'Error Code': ['F551', 'F123', 'F622'],
+    'Entry Number': ['60061040', '60061041', '60061042'],
+    'Line Entered Value': [100, '', 300]
+}
+
+class TestExporter:
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        monkeypatch.setattr(Exporter, 'CHUNK_ROWS', 2)
+
+    def test_csv(self):
+        """Test that CSV is sent as a header chunk followed by row chunks"""
+        chunks = list(Exporter.iter_export(pd.DataFrame(SAMPLE_DATA), 'csv'))
+
+        assert len(chunks) == 3
+        assert chunks[0] == b'Error Code,Entry Number,Line Entered Value\n'
+        result = pd.read_csv(io.BytesIO(b''.join(chunks)), dtype=str, keep_default_na=False)
+        assert result['Line Entered Value'].tolist() == ['100', '', '300']
+
+    def test_jsonl(self):
+        """Test one JSON object per line"""
+        data = b''.join(Exporter.iter_export(pd.DataFrame(SAMPLE_DATA), 'jsonl')).decode()
+
+        records = [json.loads(line) for line in data.splitlines()]
+        assert [record['Error Code'] for record in records] == ['F551', 'F123', 'F622']
+
+    def test_parquet(self):
+        """Test that each chunk becomes a row group and mixed columns are written as text"""
+        data = b''.join(Exporter.iter_export(pd.DataFrame(SAMPLE_DATA), 'parquet'))
+
+        assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 2
+        result = pd.read_parquet(io.BytesIO(data))
+        assert result['Line Entered Value'].tolist() == ['100', '', '300']
+
+    def test_empty_result(self):
+        """Test that an empty result still produces a readable file"""
+        df = pd.DataFrame(SAMPLE_DATA).iloc[:0]
+
+        assert b''.join(Exporter.iter_export(df, 'csv')) == b'Error Code,Entry Number,Line Entered Value\n'
+        assert len(pd.read_parquet(io.BytesIO(b''.join(Exporter.iter_export(df, 'parquet'))))) == 0
+
+    def test_unknown_format(self):
+        """Test rejecting formats that cannot be streamed"""
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            Exporter.iter_export(pd.DataFrame(SAMPLE_DATA), 'xlsx')
@@ -46,4 +46,30 @@ class TestFileHandler:
         # Verify the file can be read back
         df_read = pd.read_excel(output_path)
         assert len(df_read) == len(df)
-        assert list(df_read.columns) == list(df.columns) 
\ No newline at end of file
+        assert list(df_read.columns) == list(df.columns) 
+
+    @pytest.mark.parametrize('mode', ['stream', 'pandas'])
+    def test_generate_output_file_modes(self, tmp_path, monkeypatch, mode):
+        """Test that both write modes produce the same data and column widths"""
+        from openpyxl import load_workbook
+        from backend.modules import file_handler
+        monkeypatch.setattr(file_handler, 'UPLOAD_FOLDER', str(tmp_path))
+        monkeypatch.setattr(file_handler, 'OUTPUT_WRITE_MODE', mode)
+        df = pd.DataFrame({
+            'Error Code': ['F551', 'F123'],
+            'Line Entered Value': [100, 2500000],
+            'Goods Description': ['BOLTS', None],
+            'Import Date': pd.to_datetime(['2024-01-02', '2024-02-03'])
+        })
+
+        output_path = FileHandler.generate_output_file(df)
+
+        df_read = pd.read_excel(output_path)
+        assert df_read['Error Code'].tolist() == ['F551', 'F123']
+        assert df_read['Line Entered Value'].tolist() == [100, 2500000]
+        assert df_read['Goods Description'].isna().tolist() == [False, True]
+        assert df_read['Import Date'].tolist() == df['Import Date'].tolist()
+
+        worksheet = load_workbook(output_path)['Processed Data']
+        assert [worksheet.column_dimensions[letter].width for letter in 'ABCD'] == [12, 20, 19, 13]
+        assert worksheet['D2'].number_format == 'YYYY-MM-DD HH:MM:SS'
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from backend.modules.import_index import ImportIndex
+from backend.modules.matcher import Matcher
+
+IMPORT_DATA = {
+    'Filer Code': ['ABC', 'ABC', 'DEF', 'ABC', 'GHI', 'DEF', 'DEF'],
+    'Entry Number': ['12345', '12345', '60060331', '12345', '88888838', '60060331', '88888838'],
+    '7501 Line Number': ['1', '2', '4', '1', '4', '4', '4'],
+    'Tariff': ['1.1', '2.2', '3.3', '4.4', '5.5', '6.6', '7.7'],
+    'Goods Description': ['BOLTS', 'NUTS', 'SCREWS', 'BOLTS', 'WASHERS', 'RIVETS', 'PINS'],
+    'Line Entered Value': [100, 200, 300, 400, 500, 600, 700]
+}
+
+ERROR_DATA = {
+    'Error Code': ['F551', 'F123', 'F551', 'F999'],
+    'Error Description': ['EXCESS DUTY CLAIMED', 'INVALID HTS CODE', 'EXCESS DUTY CLAIMED', 'UNKNOWN LINE'],
+    'Filer Code': ['ABC', 'DEF', 'GHI', 'XYZ'],
+    'Entry Number': ['12345', '88888838', '88888838', '99999'],
+    '7501 Line Number': ['01', '4', '4', '9']
+}
+
+class TestImportIndex:
+    def test_lookup_returns_rows_in_import_order(self):
+        """Test that duplicate keys come back in their original row order"""
+        import_df = pd.DataFrame(IMPORT_DATA)
+        index = ImportIndex.build(Matcher.normalize_keys(import_df))
+        query = Matcher.normalize_keys(pd.DataFrame(ERROR_DATA))
+
+        queries, rows = index.lookup(query)
+
+        assert queries.tolist() == [0, 0, 1, 2]
+        assert rows.tolist() == [0, 3, 6, 4]
+
+    def test_frame_round_trip(self):
+        """Test storing and restoring the index as a DataFrame"""
+        index = ImportIndex.build(Matcher.normalize_keys(pd.DataFrame(IMPORT_DATA)))
+        restored = ImportIndex.from_frame(index.to_frame())
+
+        assert np.array_equal(restored.key_hashes, index.key_hashes)
+        assert np.array_equal(restored.rows, index.rows)
+        assert len(restored) == len(IMPORT_DATA['Filer Code'])
+
+    def test_lookup_matches_merge(self):
+        """Test that index lookups give the same rows as the left merge"""
+        import_df = pd.DataFrame(IMPORT_DATA)
+        index = ImportIndex.build(Matcher.normalize_keys(import_df))
+
+        merged = Matcher.match_records(pd.DataFrame(ERROR_DATA), import_df.copy())
+        looked_up = Matcher.match_records(pd.DataFrame(ERROR_DATA), import_df.copy(), index)
+
+        assert looked_up.columns.tolist() == merged.columns.tolist()
+        assert looked_up.astype(object).equals(merged.astype(object))
+
+    def test_lookup_rejects_hash_collisions(self):
+        """Test that candidates whose actual key differs are not matched"""
+        import_df = pd.DataFrame(IMPORT_DATA)
+        index = ImportIndex.build(Matcher.normalize_keys(import_df))
+        # Point every hash at a row with a different key
+        index.rows = np.full(len(index.rows), 4)
+
+        result = Matcher._lookup_records(
+            pd.DataFrame(ERROR_DATA).iloc[[0]].assign(**{'7501 Line Number': '1'}), import_df, index
+        )
+
+        assert result['_merge'].tolist() == ['left_only']
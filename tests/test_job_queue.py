@@ -0,0 +1,92 @@
+import time
+import threading
+import pytest
+from backend.modules.job_queue import JobQueue, JobQueueFullError
+
+def wait_for(queue, job_id, timeout=5):
+    """Poll a job until it finishes"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in ('completed', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+class TestJobQueue:
+    def test_job_reports_progress_and_result(self, tmp_path):
+        """Test that progress updates and the return value are recorded"""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=5, history_limit=5)
+
+        def job(value, progress):
+            progress(stage='parse_pdfs', files_total=2, files_parsed=0)
+            progress(files_parsed=2)
+            progress(stage='match', rows_matched=value)
+            return {'matched_records': value}
+
+        job_id = queue.submit(job, 7)
+        result = wait_for(queue, job_id)
+
+        assert result['status'] == 'completed'
+        assert result['stage'] == 'match'
+        assert result['progress'] == {'files_total': 2, 'files_parsed': 2, 'rows_matched': 7}
+        assert result['result'] == {'matched_records': 7}
+
+    def test_failed_job_records_error(self, tmp_path):
+        """Test that an exception marks the job as failed"""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=5, history_limit=5)
+
+        def job(progress):
+            raise ValueError("No matching records found")
+
+        result = wait_for(queue, queue.submit(job))
+        assert result['status'] == 'failed'
+        assert result['error'] == "No matching records found"
+
+    def test_queue_limit_and_history(self, tmp_path):
+        """Test that submissions beyond the limit are refused and old jobs are pruned"""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=1, history_limit=1)
+        release = threading.Event()
+
+        blocked = queue.submit(lambda progress: release.wait(5))
+        with pytest.raises(JobQueueFullError):
+            queue.submit(lambda progress: None)
+        release.set()
+        wait_for(queue, blocked)
+
+        latest = wait_for(queue, queue.submit(lambda progress: None))
+        queue.submit(lambda progress: None)
+        assert queue.get(blocked) is None
+        assert queue.get(latest['job_id']) is not None
+
+    def test_unknown_job(self, tmp_path):
+        """Test that unknown job IDs return None"""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=1, history_limit=1)
+        assert queue.get('missing') is None
+
+    def test_status_shared_between_processes(self, tmp_path):
+        """Test that a queue on the same database, as in another worker process, sees the job"""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=5, history_limit=5)
+        other = JobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=5, history_limit=5)
+
+        job_id = queue.submit(lambda progress: {'matched_records': 3})
+        wait_for(queue, job_id)
+
+        result = other.get(job_id)
+        assert result['status'] == 'completed'
+        assert result['result'] == {'matched_records': 3}
+
+    def test_job_of_exited_process_fails(self, tmp_path, monkeypatch):
+        """Test that a job left pending by a process that exited is reported as failed"""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_workers=1, max_pending=1, history_limit=5)
+        release = threading.Event()
+        job_id = queue.submit(lambda progress: release.wait(5))
+
+        monkeypatch.setattr(JobQueue, '_process_alive', staticmethod(lambda pid: False))
+        result = queue.get(job_id)
+        assert result['status'] == 'failed'
+        assert 'exited' in result['error']
+        # The orphaned job no longer counts against the limit
+        queue.submit(lambda progress: None)
+        release.set()
+
@@ -0,0 +1,50 @@
+import logging
+import pytest
+from backend.modules.log_utils import Truncated, parse_module_levels, configure_logging
+
+class CountingValue:
+    """Value that records how often it is converted to text"""
+    def __init__(self):
+        self.conversions = 0
+
+    def __str__(self):
+        self.conversions += 1
+        return 'value'
+
+class TestLogUtils:
+    def test_truncated_is_lazy(self):
+        """Test that the value is not converted when the level is disabled"""
+        logger = logging.getLogger('tests.log_utils.lazy')
+        logger.setLevel(logging.INFO)
+        value = CountingValue()
+
+        logger.debug("Value: %s", Truncated(value))
+
+        assert value.conversions == 0
+
+    def test_truncated_cuts_long_values(self):
+        """Test that long values are cut and short values are kept"""
+        assert str(Truncated('x' * 30, limit=10)) == 'xxxxxxxxxx... (20 more characters)'
+        assert str(Truncated([1, 2], limit=10)) == '[1, 2]'
+
+    def test_parse_module_levels(self):
+        """Test parsing per-module levels"""
+        assert parse_module_levels('') == {}
+        assert parse_module_levels('modules.matcher=debug, werkzeug=WARNING') == {
+            'modules.matcher': 'DEBUG',
+            'werkzeug': 'WARNING'
+        }
+        with pytest.raises(ValueError, match="Invalid module log level"):
+            parse_module_levels('modules.matcher')
+
+    def test_configure_logging_sets_module_levels(self):
+        """Test that module levels override the root level"""
+        root = logging.getLogger()
+        previous = root.level
+        try:
+            configure_logging('WARNING', 'tests.log_utils.verbose=DEBUG')
+            assert root.level == logging.WARNING
+            assert logging.getLogger('tests.log_utils.verbose').isEnabledFor(logging.DEBUG)
+        finally:
+            root.setLevel(previous)
+            logging.getLogger('tests.log_utils.verbose').setLevel(logging.NOTSET)
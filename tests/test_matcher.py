@@ -79,3 +79,92 @@ class TestMatcher:
         
         result = Matcher.match_records(error_df, import_df)
         assert len(result) == 1  # Should match despite different data types
+
+    def test_error_keys_normalizes_and_adds_test_entry_source(self):
+        """Test that error keys are normalized and include the test entry's source lines"""
+        error_df = pd.DataFrame({
+            'Filer Code': [' ABC', 'DEF'],
+            'Entry Number': ['12345 ', '88888838'],
+            '7501 Line Number': ['001', '2']
+        })
+
+        assert Matcher.error_keys(error_df) == {
+            ('ABC', '12345', '1'),
+            ('DEF', '88888838', '2'),
+            ('DEF', '60060331', '2')
+        }
+
+    def test_key_mask(self):
+        """Test flagging import records by normalized key"""
+        import_df = pd.DataFrame(IMPORT_DATA)
+        import_df['Entry Number'] = [12345, 67890, 11111]
+
+        mask = Matcher.key_mask(import_df, {('ABC', '12345', '1'), ('GHI', '11111', '3')})
+
+        assert mask.tolist() == [True, False, True]
+        assert Matcher.key_mask(import_df, set()).tolist() == [False, False, False]
+
+    def test_encode_keys_matches_normalized_keys(self):
+        """Test that records share a key code exactly when their normalized keys are equal"""
+        error_df = pd.DataFrame(ERROR_DATA)
+        import_df = pd.DataFrame({
+            'Filer Code': ['ABC ', 'ABC', 'DEF', 'ABC'],
+            'Entry Number': [12345, 12345, 67890, 12345],
+            '7501 Line Number': ['01', '2', '2', '1']
+        })
+
+        error_codes, import_codes = Matcher.encode_keys(error_df, import_df)
+
+        assert error_codes.dtype == 'int64'
+        assert import_codes[0] == import_codes[3] == error_codes[0]
+        assert import_codes[2] == error_codes[1]
+        assert len({import_codes[0], import_codes[1], import_codes[2]}) == 3
+
+    def test_match_records_does_not_modify_inputs(self):
+        """Test that matching leaves the caller's DataFrames untouched"""
+        error_df = pd.DataFrame({
+            'Error Code': ['F551'],
+            'Error Description': ['EXCESS DUTY CLAIMED'],
+            'Filer Code': [' ABC'],
+            'Entry Number': ['12345'],
+            '7501 Line Number': ['001']
+        })
+        import_df = pd.DataFrame(IMPORT_DATA).assign(**{
+            'Tariff': ['1.1', '2.2', '3.3'],
+            'Goods Description': ['BOLTS', 'NUTS', 'SCREWS'],
+            'Line Entered Value': [100, 200, 300]
+        })
+        error_before, import_before = error_df.copy(), import_df.copy()
+
+        result = Matcher.match_records(error_df, import_df)
+
+        assert result['Tariff'].tolist() == ['1.1']
+        assert result['7501 Line Number'].tolist() == ['1']
+        assert error_df.equals(error_before)
+        assert import_df.equals(import_before)
+
+    def test_match_records_entry_number_aliases(self, monkeypatch):
+        """Test that aliased entry numbers match their own lines first, then the aliased entry's lines"""
+        from backend.modules import matcher
+        monkeypatch.setattr(matcher, 'ENTRY_NUMBER_ALIASES', {'11111': '12345', '22222': '67890'})
+        error_df = pd.DataFrame({
+            'Error Code': ['F551', 'F123', 'F999'],
+            'Error Description': ['EXCESS DUTY CLAIMED', 'INVALID HTS CODE', 'UNKNOWN LINE'],
+            'Filer Code': ['ABC', 'GHI', 'DEF'],
+            'Entry Number': ['11111', '11111', '22222'],
+            '7501 Line Number': ['1', '3', '9']
+        })
+        import_df = pd.DataFrame({
+            'Filer Code': ['ABC', 'GHI', 'ABC'],
+            'Entry Number': ['12345', '11111', '11111'],
+            '7501 Line Number': ['1', '3', '1'],
+            'Tariff': ['1.1', '2.2', '3.3'],
+            'Goods Description': ['BOLTS', 'NUTS', 'SCREWS'],
+            'Line Entered Value': [100, 200, 300]
+        })
+
+        result = Matcher.match_records(error_df, import_df)
+
+        assert result['Tariff'].fillna('').tolist() == ['3.3', '1.1', '2.2', '']
+        assert result['Entry Number'].tolist() == ['11111', '11111', '11111', '22222']
+        assert Matcher.error_keys(error_df) >= {('ABC', '12345', '1'), ('DEF', '67890', '9')}
@@ -0,0 +1,74 @@
+import threading
+import pytest
+from backend.modules.metrics import MetricsRegistry
+
+class TestMetrics:
+    def test_counter_render(self):
+        """Test counters with and without labels in the exposition format"""
+        registry = MetricsRegistry()
+        pages = registry.counter('pages_total', 'Pages parsed')
+        files = registry.counter('files_total', 'Files parsed', ['outcome'])
+        pages.inc(3)
+        pages.inc()
+        files.inc(outcome='cached')
+
+        text = registry.render()
+
+        assert '# HELP pages_total Pages parsed\n# TYPE pages_total counter\npages_total 4\n' in text
+        assert 'files_total{outcome="cached"} 1\n' in text
+
+    def test_counter_rejects_bad_updates(self):
+        """Test that counters cannot decrease or take unknown labels"""
+        counter = MetricsRegistry().counter('rows_total', 'Rows', ['stage'])
+        with pytest.raises(ValueError):
+            counter.inc(-1, stage='match')
+        with pytest.raises(ValueError):
+            counter.inc(table='import')
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket, count and sum samples"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('stage_seconds', 'Stage time', ['stage'], buckets=[0.1, 1])
+        for value in [0.05, 0.5, 0.5, 5]:
+            histogram.observe(value, stage='match')
+
+        lines = registry.render().splitlines()
+
+        assert 'stage_seconds_bucket{stage="match",le="0.1"} 1' in lines
+        assert 'stage_seconds_bucket{stage="match",le="1"} 3' in lines
+        assert 'stage_seconds_bucket{stage="match",le="+Inf"} 4' in lines
+        assert 'stage_seconds_count{stage="match"} 4' in lines
+        assert 'stage_seconds_sum{stage="match"} 6.05' in lines
+
+    def test_histogram_time(self):
+        """Test timing a block"""
+        histogram = MetricsRegistry().histogram('block_seconds', 'Block time')
+        with histogram.time():
+            pass
+        assert ('block_seconds_count', {}, 1) in histogram.samples()
+
+    def test_collectors_and_duplicates(self):
+        """Test collected families and duplicate registration"""
+        registry = MetricsRegistry()
+        registry.counter('rows_total', 'Rows')
+        registry.add_collector(lambda: [('cache_entries', 'gauge', 'Entries', [({'cache': 'pdf'}, 2)])])
+
+        assert 'cache_entries{cache="pdf"} 2' in registry.render()
+        with pytest.raises(ValueError):
+            registry.counter('rows_total', 'Rows')
+
+    def test_concurrent_increments(self):
+        """Test that increments from many threads are not lost"""
+        counter = MetricsRegistry().counter('hits_total', 'Hits')
+
+        def hit():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.samples() == [('hits_total', {}, 8000)]
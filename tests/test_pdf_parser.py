@@ -1,9 +1,40 @@
 import pytest
 import pandas as pd
+import pdfplumber
+from backend.modules import pdf_parser
 from backend.modules.pdf_parser import PDFParser
+from backend.modules.cache import DiskCache
 import os
+import re
+import bisect
+import random
+import types
 
 # Test data
+SAMPLE_REPORT_PAGES = [
+    ['CBP ERROR REPORT', 'E1 F551 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040'],
+    ['E1 F622 INVALID HTS NUMBER GU660061041 3 GU6 60061041', 'END OF REPORT']
+]
+# Regex and fallback used before the single-pass record pattern, kept for differential testing
+LEGACY_ERROR_PATTERN = r'E1\s+F(\d{3})\s+([^G]+?)(?:GU6(\d+)\s+(\d+)\s+)?GU6\s+\d+'
+
+def legacy_records(text):
+    records = []
+    for match in re.finditer(LEGACY_ERROR_PATTERN, text):
+        error_code, error_desc, entry_number, line_number = match.groups()
+        if entry_number is None:
+            last_gu6_match = re.search(r'GU6(\d+)(?:\s|$)', match.group(0))
+            if last_gu6_match:
+                entry_number = last_gu6_match.group(1)
+        records.append({
+            'Error Code': f'F{error_code}',
+            'Error Description': error_desc.strip(),
+            'Filer Code': 'GU6',
+            'Entry Number': entry_number.strip() if entry_number else '',
+            '7501 Line Number': line_number.strip() if line_number else ''
+        })
+    return records
+
 SAMPLE_ERROR_LINE = "E1 F551 [EXCESS DUTY CLAIMED] [GU660061040] [25]"
 EXPECTED_PARSED_DATA = {
     'Error Description': 'EXCESS DUTY CLAIMED',
@@ -42,3 +73,258 @@ class TestPDFParser:
         """Integration test for PDF parsing (requires sample PDF)"""
         # TODO: Create a sample PDF file for testing
         pass
+
+    @pytest.fixture
+    def parse_cache(self, tmp_path, monkeypatch):
+        """Point the parse cache at a temporary directory"""
+        cache = DiskCache(str(tmp_path / "cache"), 10 * 1024 * 1024)
+        monkeypatch.setattr(PDFParser, 'cache', cache)
+        return cache
+
+    def test_extract_error_data_uses_cache(self, make_pdf, parse_cache, monkeypatch):
+        """Test that a previously parsed PDF is served without pdfplumber"""
+        pdf_path = make_pdf(SAMPLE_REPORT_PAGES)
+        first = PDFParser.extract_error_data(pdf_path)
+
+        def fail_open(*args, **kwargs):
+            raise AssertionError("pdfplumber should not be opened on a cache hit")
+        monkeypatch.setattr(pdfplumber, 'open', fail_open)
+
+        second = PDFParser.extract_error_data(pdf_path)
+        assert len(first) == 2
+        assert second.astype(object).equals(first.astype(object))
+        assert parse_cache.stats()['hits'] == 1
+        assert parse_cache.stats()['misses'] == 1
+
+    @pytest.mark.parametrize('mode', ['serial', 'process'])
+    def test_extract_many_keeps_order_and_isolates_failures(self, make_pdf, parse_cache, tmp_path, mode):
+        """Test batch parsing returns results in input order with per-file errors"""
+        first = make_pdf(SAMPLE_REPORT_PAGES[:1], 'first.pdf')
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"%PDF-1.4\nnot really a pdf")
+        second = make_pdf(SAMPLE_REPORT_PAGES[1:], 'second.pdf')
+
+        results = PDFParser.extract_many([first, str(broken), second], mode=mode, workers=2)
+
+        assert [result.pdf_path for result in results] == [first, str(broken), second]
+        assert results[0].data['Entry Number'].tolist() == ['60061040']
+        assert results[1].data is None and 'Failed to parse PDF' in results[1].error
+        assert results[2].data['Entry Number'].tolist() == ['60061041']
+
+    def test_sharded_parse_matches_serial_parse(self, make_pdf, monkeypatch):
+        """Test page-range sharding handles records split across page boundaries"""
+        pages = [
+            ['E1 F551 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040', 'E1 F622 INVALID HTS'],
+            ['NUMBER GU660061041 3 GU6 60061041'],
+            ['SUMMARY PAGE'],
+            ['E1 F551 EXCESS DUTY CLAIMED GU660061042 7'],
+            ['GU6 60061042'],
+        ]
+        pdf_path = make_pdf(pages)
+        serial = PDFParser.extract_error_data(pdf_path, use_cache=False)
+
+        monkeypatch.setattr(pdf_parser, 'PDF_SHARD_MIN_PAGES', 2)
+        monkeypatch.setattr(pdf_parser, 'PDF_SHARD_PAGES', 1)
+        monkeypatch.setattr(pdf_parser, 'PDF_PARSE_WORKERS', 3)
+        assert PDFParser._page_shards(len(pages)) == [(0, 2), (2, 4), (4, 5)]
+        sharded = PDFParser.extract_error_data(pdf_path, use_cache=False)
+
+        assert sharded['Entry Number'].tolist() == ['60061040', '60061041', '60061042']
+        assert sharded.equals(serial)
+
+    def test_iter_error_records_streams_records(self, make_pdf):
+        """Test that streaming yields the same records as a full parse"""
+        pdf_path = make_pdf(SAMPLE_REPORT_PAGES)
+        records = PDFParser.iter_error_records(pdf_path)
+
+        assert isinstance(records, types.GeneratorType)
+        assert list(records) == PDFParser.extract_error_data(pdf_path, use_cache=False).to_dict('records')
+
+    def test_iter_records_matches_full_text_scan(self):
+        """Test that carrying partial records between pages matches one scan of the joined text"""
+        lines = [
+            'HEADER LINE E1 NOT A RECORD',
+            'E1 F551 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040',
+            'E1 F622 INVALID HTS NUMBER',
+            'GU660061041 3 GU6 60061041',
+            'E1 F700 BAD THING GU6 1',
+            'E1 F701 MISSING ENTRY GU6 60061042',
+            'FOOTER',
+        ]
+        rng = random.Random(0)
+        for _ in range(50):
+            pages = []
+            for line in rng.choices(lines, k=30):
+                if not pages or rng.random() < 0.3:
+                    pages.append(line)
+                else:
+                    pages[-1] += rng.choice([' ', '\n']) + line
+            text = "".join(page + "\n" for page in pages)
+            matches = list(re.finditer(PDFParser.ERROR_PATTERN, text))
+            page_starts = [0]
+            for page in pages:
+                page_starts.append(page_starts[-1] + len(page) + 1)
+            page_of = lambda index: bisect.bisect_right(page_starts, index) - 1
+            if any(page_of(m.end() - 1) - page_of(m.start()) > 1 for m in matches):
+                # Records spanning more than one page break are not carried
+                continue
+            expected = [PDFParser._build_record(m) for m in matches]
+
+            assert list(PDFParser._iter_records(pages)) == expected
+
+    def test_iter_records_bounds_carry_after_unmatched_markers(self, monkeypatch):
+        """Test that stray and unfinished markers are not carried past one page"""
+        buffer_sizes = []
+        pattern = PDFParser.RECORD_PATTERN
+
+        class RecordingPattern:
+            def finditer(self, buffer):
+                buffer_sizes.append(len(buffer))
+                return pattern.finditer(buffer)
+
+        monkeypatch.setattr(PDFParser, 'RECORD_PATTERN', RecordingPattern())
+        filler = 'SUMMARY LINE WITH NO RECORDS ' * 20
+        pages = (
+            ['SEVERITY E1 MEANS FATAL'] + [filler] * 200
+            + ['E1 F551 EXCESS DUTY CLAIMED'] + [filler] * 200
+            + ['E1 F622 INVALID HTS NUMBER', 'GU660061041 3 GU6 60061041']
+        )
+        records = list(PDFParser._iter_records(pages))
+
+        assert [record['Entry Number'] for record in records] == ['60061041']
+        assert max(buffer_sizes) <= 2 * len(filler) + 2
+        assert PDFParser._carry_start('SEVERITY E1 MEANS FATAL\n', 0) == -1
+        assert PDFParser._carry_start('X E1 F551 EXCESS DUTY\n', 0) == 2
+        assert PDFParser._carry_start('X E1 F551 EXCESS GU660061040 25\n', 0) == 2
+        assert PDFParser._carry_start('X E1 F551 EXCESS GX 25\n', 0) == -1
+
+    def test_prescan_skips_pages_without_markers(self, make_pdf):
+        """Test that boilerplate pages are skipped but record continuations are not"""
+        pages = [
+            ['CBP ERROR REPORT', 'SUMMARY OF ENTRIES'],
+            ['E1 F551 EXCESS DUTY CLAIMED GU660061040 25'],
+            ['GU6 60061040'],
+            ['END OF REPORT'],
+        ]
+        pdf_path = make_pdf(pages)
+        stats = {}
+        records = list(PDFParser.iter_error_records(pdf_path, stats))
+
+        assert [record['Entry Number'] for record in records] == ['60061040']
+        assert stats == {'pages': 4, 'pages_skipped': 2, 'prescan_inconclusive': 0}
+
+    def test_prescan_skips_pages_after_stray_marker(self, make_pdf):
+        """Test that an 'E1' outside any record does not stop later pages from being skipped"""
+        pages = (
+            [['CBP ERROR REPORT', 'SEVERITY E1 MEANS FATAL']]
+            + [['SUMMARY OF ENTRIES']] * 20
+            + [['E1 F551 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040']]
+        )
+        pdf_path = make_pdf(pages)
+        stats = {}
+        records = list(PDFParser.iter_error_records(pdf_path, stats))
+
+        assert [record['Entry Number'] for record in records] == ['60061040']
+        assert stats == {'pages': 22, 'pages_skipped': 20, 'prescan_inconclusive': 0}
+
+    def test_sharded_parse_fetches_skipped_pages_from_one_document(self, make_pdf, monkeypatch):
+        """Test that continuation pages skipped by shard workers are read without reopening the PDF"""
+        pages = [
+            ['E1 F551 EXCESS DUTY CLAIMED GU660061040 25'],
+            ['GU6 60061040'],
+            ['E1 F622 INVALID HTS'],
+            ['NUMBER GU660061041 3 GU6 60061041'],
+        ]
+        pdf_path = make_pdf(pages)
+        monkeypatch.setattr(pdf_parser, 'PDF_SHARD_MIN_PAGES', 2)
+        monkeypatch.setattr(pdf_parser, 'PDF_SHARD_PAGES', 1)
+        monkeypatch.setattr(pdf_parser, 'PDF_PARSE_WORKERS', 2)
+        opened = []
+        open_document = pdf_parser.open_document
+        def counting_open(*args):
+            opened.append(args)
+            return open_document(*args)
+        monkeypatch.setattr(pdf_parser, 'open_document', counting_open)
+
+        stats = PDFParser._new_page_stats()
+        records = PDFParser._extract_text_records(pdf_path, True, None, stats)
+
+        assert [record['Entry Number'] for record in records] == ['60061040', '60061041']
+        # One open for the page count and one for both fetched pages; shard workers open their own
+        assert len(opened) == 2
+        assert stats['pages_skipped'] == 0
+
+    def test_content_strings_decodes_literal_strings(self):
+        """Test literal string decoding and the inconclusive fallback for hex strings"""
+        stream = rb'BT (\105\061 F551) Tj [(EXC) -20 (ESS \(DUTY\))] TJ ET'
+        assert PDFParser._content_strings(stream) == b'E1 F551EXCESS (DUTY)'
+        assert PDFParser._content_strings(b'BT <4531> Tj ET') is None
+
+    def test_record_pattern_matches_legacy_regex(self):
+        """Differential test of the single-pass record pattern against the legacy regex and fallback"""
+        fragments = [
+            'E1', 'F551', 'F62', 'EXCESS DUTY CLAIMED', 'BAD THING', 'GU660061040', 'GU6',
+            '60061040', '25', '  ', '\n', ' ', 'E1 F700 MISSING ENTRY', 'GU6 60061042', 'GX', '0',
+        ]
+        rng = random.Random(7)
+        for _ in range(2000):
+            text = " ".join(rng.choices(fragments, k=rng.randint(1, 25)))
+            assert list(PDFParser._iter_records([text])) == legacy_records(text + "\n"), text
+
+    def test_iter_table_records_assigns_columns_by_position(self, make_pdf):
+        """Test table-region extraction with wrapped descriptions and descriptions containing G"""
+        pages = [
+            ['CBP ERROR REPORT',
+             'E1 F551 EXCESS DUTY GU660061040 25 GU6 60061040',
+             (90, 'CLAIMED'),
+             'E1 F622 WRONG TARIFF GU660061041 3 GU6 60061041',
+             'END OF PAGE'],
+        ]
+        pdf_path = make_pdf(pages)
+        records = list(PDFParser.iter_table_records(pdf_path))
+
+        assert records == [
+            {'Error Code': 'F551', 'Error Description': 'EXCESS DUTY CLAIMED', 'Filer Code': 'GU6',
+             'Entry Number': '60061040', '7501 Line Number': '25'},
+            {'Error Code': 'F622', 'Error Description': 'WRONG TARIFF', 'Filer Code': 'GU6',
+             'Entry Number': '60061041', '7501 Line Number': '3'},
+        ]
+
+    def test_iter_table_records_continues_description_across_pages(self, make_pdf, monkeypatch):
+        """Test that a description wrapped onto the next page stays with its record"""
+        monkeypatch.setattr(pdf_parser, 'PDF_TABLE_REGION', (0, 0, 612, 792))
+        pages = [
+            ['CBP ERROR REPORT',
+             'E1 F551 EXCESS DUTY GU660061040 25 GU6 60061040'],
+            [(90, 'CLAIMED'),
+             'END OF REPORT'],
+        ]
+        pdf_path = make_pdf(pages)
+        stats = {}
+        records = list(PDFParser.iter_table_records(pdf_path, stats))
+
+        assert [record['Error Description'] for record in records] == ['EXCESS DUTY CLAIMED']
+        assert stats['pages_skipped'] == 0
+
+    def test_iter_table_records_closes_records_at_page_break(self, make_pdf, monkeypatch):
+        """Test that a page header is not read as a continuation without a table region"""
+        monkeypatch.setattr(pdf_parser, 'PDF_TABLE_REGION', None)
+        pages = [
+            ['E1 F551 EXCESS DUTY GU660061040 25 GU6 60061040'],
+            [(90, 'PAGE 2'),
+             'E1 F622 WRONG TARIFF GU660061041 3 GU6 60061041'],
+        ]
+        pdf_path = make_pdf(pages)
+        records = list(PDFParser.iter_table_records(pdf_path))
+
+        assert [record['Error Description'] for record in records] == ['EXCESS DUTY', 'WRONG TARIFF']
+
+    def test_table_mode_matches_text_mode(self, make_pdf, monkeypatch):
+        """Test the table extraction mode agrees with text extraction on single-row records"""
+        pdf_path = make_pdf(SAMPLE_REPORT_PAGES)
+        text_df = PDFParser.extract_error_data(pdf_path, use_cache=False)
+
+        monkeypatch.setattr(pdf_parser, 'PDF_EXTRACTION_MODE', 'table')
+        table_df = PDFParser.extract_error_data(pdf_path, use_cache=False)
+
+        assert table_df.equals(text_df)
@@ -0,0 +1,50 @@
+import pandas as pd
+
+class TestPipeline:
+    def test_incremental_match_parses_only_new_pdfs(self, pipeline, match_inputs, monkeypatch):
+        """Test that adding a PDF to a processed batch only parses and matches the new one"""
+        pdf_paths, excel_path = match_inputs
+        extract_many = pipeline.PDFParser.extract_many
+        parsed = []
+
+        def counting_extract_many(paths, **kwargs):
+            parsed.extend(paths)
+            return extract_many(paths, **kwargs)
+
+        monkeypatch.setattr(pipeline.PDFParser, 'extract_many', counting_extract_many)
+        pipeline.Pipeline.match(pdf_paths[:2], excel_path)
+        parsed.clear()
+
+        incremental = pipeline.Pipeline.match(pdf_paths, excel_path)
+
+        assert parsed == pdf_paths[2:]
+        assert incremental['Error Code'].tolist() == ['F550', 'F551', 'F552']
+        assert incremental['Tariff'].tolist() == ['1234.56', '7890.12', '']
+
+    def test_incremental_match_equals_full_match(self, pipeline, match_inputs, monkeypatch):
+        """Test that reused and freshly matched rows give the same output"""
+        pdf_paths, excel_path = match_inputs
+        pipeline.Pipeline.match(pdf_paths[1:], excel_path)
+        incremental = pipeline.Pipeline.match(pdf_paths, excel_path)
+
+        monkeypatch.setattr(pipeline, 'INCREMENTAL_MATCH', False)
+        full = pipeline.Pipeline.match(pdf_paths, excel_path)
+
+        pd.testing.assert_frame_equal(incremental.astype(str), full.astype(str))
+
+    def test_changed_import_is_matched_again(self, pipeline, match_inputs):
+        """Test that matched rows are not reused against a different workbook"""
+        pdf_paths, excel_path = match_inputs
+        pipeline.Pipeline.match(pdf_paths, excel_path)
+        pd.DataFrame({
+            'Filer': ['GU6'],
+            'Entry No.': ['60061040'],
+            '7501 Line Number': ['99'],
+            'Tariff': ['5555.55'],
+            'Goods Description': ['WASHERS'],
+            'Line Entered Value': ['300']
+        }).to_excel(excel_path, index=False)
+
+        result = pipeline.Pipeline.match(pdf_paths, excel_path)
+
+        assert result['Tariff'].tolist() == ['', '', '5555.55']
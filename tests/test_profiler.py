@@ -0,0 +1,34 @@
+import os
+import pstats
+from backend.modules import profiler
+from backend.modules.profiler import RequestProfiler
+
+class TestRequestProfiler:
+    def test_requested_needs_enabled_flag_and_token(self, monkeypatch):
+        """Test that profiling is only turned on by the admin token while enabled"""
+        monkeypatch.setattr(profiler, 'PROFILE_ADMIN_TOKEN', 'secret')
+        monkeypatch.setattr(profiler, 'PROFILING_ENABLED', False)
+        assert not RequestProfiler.requested('secret')
+
+        monkeypatch.setattr(profiler, 'PROFILING_ENABLED', True)
+        assert RequestProfiler.requested('secret')
+        assert not RequestProfiler.requested('wrong')
+        assert not RequestProfiler.requested(None)
+
+        monkeypatch.setattr(profiler, 'PROFILE_ADMIN_TOKEN', None)
+        assert not RequestProfiler.requested('secret')
+
+    def test_profile_saves_artifacts(self, tmp_path, monkeypatch):
+        """Test that a profiled block leaves a loadable profile and a summary"""
+        monkeypatch.setattr(profiler, 'UPLOAD_FOLDER', str(tmp_path))
+
+        with RequestProfiler.profile('unit') as artifact:
+            assert RequestProfiler.active()
+            sorted(range(1000), key=lambda value: -value)
+
+        assert not RequestProfiler.active()
+        assert artifact['profile_file'].startswith('profile_unit_')
+        stats = pstats.Stats(os.path.join(tmp_path, artifact['profile_file']))
+        assert stats.total_calls > 0
+        with open(os.path.join(tmp_path, artifact['summary_file'])) as f:
+            assert 'functions by cumulative time' in f.read()
@@ -0,0 +1,117 @@
+import os
+import pandas as pd
+from backend.modules.result_store import ResultStore
+
+def write_output(tmp_path, name):
+    """Create a stand-in output file"""
+    output_path = tmp_path / name
+    output_path.write_bytes(b'xlsx')
+    return {'matched_records': 1, 'output_file': name, 'output_path': str(output_path)}
+
+class TestResultStore:
+    def test_round_trip(self, tmp_path):
+        """Test that a recorded result is returned for its fingerprint only"""
+        store = ResultStore(str(tmp_path / "results" / "index.db"), max_entries=5)
+        result = write_output(tmp_path, 'a.xlsx')
+
+        assert store.get('abc') is None
+        store.put('abc', result)
+
+        assert store.get('abc') == result
+        assert store.get('def') is None
+        assert store.stats() == {'hits': 1, 'misses': 2, 'entries': 1}
+
+    def test_missing_output_is_a_miss(self, tmp_path):
+        """Test that an entry whose output file was deleted is dropped"""
+        store = ResultStore(str(tmp_path / "index.db"), max_entries=5)
+        result = write_output(tmp_path, 'a.xlsx')
+        store.put('abc', result)
+        os.unlink(result['output_path'])
+
+        assert store.get('abc') is None
+        assert store.stats()['entries'] == 0
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that old entries are evicted together with their output files"""
+        store = ResultStore(str(tmp_path / "index.db"), max_entries=2)
+        first = write_output(tmp_path, 'a.xlsx')
+        second = write_output(tmp_path, 'b.xlsx')
+        third = write_output(tmp_path, 'c.xlsx')
+        store.put('a', first)
+        store.put('b', second)
+        store.get('a')
+        store.put('c', third)
+
+        assert store.get('b') is None
+        assert not os.path.exists(second['output_path'])
+        assert store.get('a') == first
+        assert store.get('c') == third
+
+    def test_concurrent_identical_runs_keep_first_output(self, tmp_path):
+        """Test that a second output for the same fingerprint is deleted unless the first one is gone"""
+        store = ResultStore(str(tmp_path / "index.db"), max_entries=5)
+        first = write_output(tmp_path, 'a.xlsx')
+        second = write_output(tmp_path, 'b.xlsx')
+        third = write_output(tmp_path, 'c.xlsx')
+
+        assert store.put('abc', first) is first
+        assert store.put('abc', second) == first
+        assert not os.path.exists(second['output_path'])
+        assert store.get('abc') == first
+
+        os.unlink(first['output_path'])
+        assert store.put('abc', third) is third
+        assert store.get('abc') == third
+        assert store.stats()['entries'] == 1
+
+    def test_shared_between_processes(self, tmp_path):
+        """Test that stores on the same index, as in separate worker processes, keep each other's entries"""
+        index_path = str(tmp_path / "index.db")
+        store = ResultStore(index_path, max_entries=5)
+        other = ResultStore(index_path, max_entries=5)
+        first = write_output(tmp_path, 'a.xlsx')
+        second = write_output(tmp_path, 'b.xlsx')
+        store.put('a', first)
+        other.put('b', second)
+
+        assert store.get('b') == second
+        assert other.get('a') == first
+        assert store.stats()['entries'] == 2
+
+    def test_disabled(self, tmp_path):
+        """Test that a limit of zero records nothing"""
+        store = ResultStore(str(tmp_path / "index.db"), max_entries=0)
+        store.put('abc', write_output(tmp_path, 'a.xlsx'))
+        assert store.get('abc') is None
+        assert not os.path.exists(tmp_path / "index.db")
+
+    def test_pipeline_reuses_output(self, tmp_path, monkeypatch):
+        """Test that processing the same files twice runs the stages once"""
+        from modules import pipeline
+        monkeypatch.setattr(pipeline.Pipeline, 'results', ResultStore(str(tmp_path / "index.db"), 5))
+        calls = []
+
+        def match(pdf_paths, excel_path, progress=None):
+            calls.append(pdf_paths)
+            return pd.DataFrame({'Error Code': ['F551']})
+
+        def generate_output_file(df):
+            return write_output(tmp_path, f"out_{len(calls)}.xlsx")['output_path']
+
+        monkeypatch.setattr(pipeline.Pipeline, 'match', match)
+        monkeypatch.setattr(pipeline.FileHandler, 'generate_output_file', generate_output_file)
+        pdf_path = tmp_path / "report.pdf"
+        other_path = tmp_path / "other.pdf"
+        excel_path = tmp_path / "import.xlsx"
+        pdf_path.write_bytes(b'pdf')
+        other_path.write_bytes(b'other pdf')
+        excel_path.write_bytes(b'excel')
+
+        first = pipeline.Pipeline.run([str(pdf_path)], str(excel_path))
+        second = pipeline.Pipeline.run([str(pdf_path)], str(excel_path))
+        third = pipeline.Pipeline.run([str(pdf_path), str(other_path)], str(excel_path))
+
+        assert len(calls) == 2
+        assert first['memoized'] is False
+        assert second == {**first, 'memoized': True}
+        assert third['output_file'] != first['output_file']
@@ -0,0 +1,71 @@
+import sqlite3
+import threading
+from backend.modules.session_store import SessionStore
+
+class TestSessionStore:
+    def test_sessions_are_isolated(self, tmp_path):
+        """Test that uploads are recorded per session"""
+        store = SessionStore(str(tmp_path / "sessions" / "sessions.db"), 3600)
+        first = store.create()
+        second = store.create()
+
+        store.add_pdfs(first, ['a.pdf', 'b.pdf'])
+        store.set_excel(first, 'import.xlsx')
+        store.add_pdfs(second, ['c.pdf'])
+
+        assert store.get(first) == {'pdfs': ['a.pdf', 'b.pdf'], 'excel': 'import.xlsx'}
+        assert store.get(second) == {'pdfs': ['c.pdf'], 'excel': None}
+
+    def test_set_excel_replaces_previous_file(self, tmp_path):
+        """Test that a session keeps only its latest import file"""
+        store = SessionStore(str(tmp_path / "sessions.db"), 3600)
+        session_id = store.create()
+        store.set_excel(session_id, 'old.xlsx')
+        store.set_excel(session_id, 'new.xlsx')
+
+        assert store.get(session_id)['excel'] == 'new.xlsx'
+
+    def test_clear(self, tmp_path):
+        """Test that clearing forgets the uploads but keeps the session"""
+        store = SessionStore(str(tmp_path / "sessions.db"), 3600)
+        session_id = store.create()
+        store.add_pdfs(session_id, ['a.pdf'])
+        store.clear(session_id)
+
+        assert store.get(session_id) == {'pdfs': [], 'excel': None}
+        assert store.touch(session_id)
+
+    def test_unknown_and_expired_sessions(self, tmp_path):
+        """Test that unknown and expired sessions are rejected and purged"""
+        db_path = str(tmp_path / "sessions.db")
+        store = SessionStore(db_path, 3600)
+        session_id = store.create()
+        store.add_pdfs(session_id, ['a.pdf'])
+        assert not store.touch(None)
+        assert not store.touch('unknown')
+
+        with sqlite3.connect(db_path) as connection:
+            connection.execute('UPDATE sessions SET last_seen = 0')
+        assert not store.touch(session_id)
+
+        store.create()
+        with sqlite3.connect(db_path) as connection:
+            assert connection.execute('SELECT COUNT(*) FROM uploads').fetchone()[0] == 0
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test that stores in several threads can append to one session"""
+        db_path = str(tmp_path / "sessions.db")
+        session_id = SessionStore(db_path, 3600).create()
+
+        def upload(worker):
+            store = SessionStore(db_path, 3600)
+            for number in range(20):
+                store.add_pdfs(session_id, [f"{worker}_{number}.pdf"])
+
+        threads = [threading.Thread(target=upload, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(SessionStore(db_path, 3600).get(session_id)['pdfs']) == 80
@@ -0,0 +1,63 @@
+import pytest
+from backend.modules.pdf_parser import PDFParser
+from backend.modules.text_backends import TEXT_BACKENDS, TextDocument, open_document
+
+# Fixture reports, one list of text lines per page
+FIXTURE_REPORTS = {
+    'single_page': [
+        ['CBP ERROR REPORT', 'E1 F551 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040'],
+    ],
+    'multi_page': [
+        ['CBP ERROR REPORT', 'FILER GU6 SUMMARY'],
+        ['E1 F551 EXCESS DUTY CLAIMED GU660061040 25 GU6 60061040',
+         'E1 F622 INVALID HTS NUMBER GU660061041 3 GU6 60061041'],
+        ['E1 F700 MISSING ENTRY GU6 60061042', 'END OF REPORT'],
+    ],
+    'split_record': [
+        ['E1 F551 EXCESS DUTY', 'CLAIMED ON ENTRY'],
+        ['GU660061040 25 GU6 60061040'],
+    ],
+    'irregular_spacing': [
+        ['E1   F551  EXCESS   DUTY CLAIMED  GU660061040   25  GU6  60061040'],
+    ],
+}
+
+class TestTextBackends:
+    @pytest.mark.parametrize('report', sorted(FIXTURE_REPORTS))
+    def test_backends_yield_identical_records(self, make_pdf, report):
+        """Parity test: every backend must extract the same error records"""
+        pdf_path = make_pdf(FIXTURE_REPORTS[report])
+        results = {
+            backend: PDFParser.extract_error_data(pdf_path, use_cache=False, backend=backend).to_dict('records')
+            for backend in TEXT_BACKENDS
+        }
+
+        expected = results['pdfplumber']
+        assert expected
+        for backend, records in results.items():
+            assert records == expected, f"{backend} differs from pdfplumber on {report}"
+
+    def test_pdfminer_page_text_matches_pdfplumber(self, make_pdf):
+        """Test the layout-free device reproduces pdfplumber's line layout"""
+        pdf_path = make_pdf(FIXTURE_REPORTS['multi_page'])
+        page_texts = {}
+        for backend in TEXT_BACKENDS:
+            with open_document(pdf_path, backend) as document:
+                page_texts[backend] = [document.page_text(i) for i in range(document.page_count)]
+
+        assert page_texts['pdfminer'] == page_texts['pdfplumber']
+
+    def test_unknown_backend(self, make_pdf):
+        """Test that an unknown backend name is rejected"""
+        pdf_path = make_pdf(FIXTURE_REPORTS['single_page'])
+        with pytest.raises(ValueError, match="Unknown PDF text backend"):
+            open_document(pdf_path, 'nonexistent')
+
+    def test_incomplete_backend_cannot_be_constructed(self):
+        """Test that a backend missing part of the document interface fails when created"""
+        class TextOnlyDocument(TextDocument):
+            def page_text(self, page_num):
+                return ""
+
+        with pytest.raises(TypeError, match="abstract"):
+            TextOnlyDocument()